@@ -1,17 +1,24 @@
+import io
 import os
 import signal
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, Optional, List
-
-from utils.data_utils import decoding_file_name, filter_zero_energy_rows, get_csv_files, load_csv_data, preprocess_time_columns, save_analysis_results
+from dotenv import load_dotenv
+from typing import Callable, Dict, Optional, List, Tuple
+
+from utils.data_utils import decoding_file_name, drop_duplicate_months, filter_zero_energy_rows, get_csv_files, load_csv_data, preprocess_time_columns, save_analysis_results
+from utils import analysis_store, data_utils, energy_cube, schema, trend_stats
+from utils.analysis_cache import code_version, ensure_analysis_cache, get_stale_files, mark_analyzed
+from utils.analysis_store import stored_kapt_codes, to_analysis_frame, upsert_analysis_results
+from utils.energy_cube import EnergyCube, cube_exists, get_cube_dir
+from utils.manifest import open_manifest
+from utils.master_diff import CHANGE_REMOVED, affected_codes, load_snapshot_diff, print_diff_summary
+from utils.schema import ENERGY_COLUMNS, ENERGY_DATA_DTYPES
+from utils.trend_stats import ensure_trend_stats, get_complete_files, load_trend_stats
 
 # 상수 정의
-ENERGY_COLUMNS = [
-    'heat', 'hheat', 'waterHot', 'hwaterHot', 'gas',
-    'hgas', 'elect', 'helect', 'waterCool', 'hwaterCool'
-]
-
 ENERGY_NAME_MAPPING = {
     'heat': '난방 사용량',
     'hheat': '난방 사용량',
@@ -25,6 +32,19 @@ ENERGY_NAME_MAPPING = {
     'hwaterCool': '수도 사용량'
 }
 
+MASTER_FILENAME = '20250328_단지_기본정보_수도권.csv'
+# 단지별 에너지 데이터의 수집 범위와 파일명을 정하는 단지 기본정보 컬럼
+MASTER_SNAPSHOT_COLUMNS = ['단지명', '사용승인일']
+
+load_dotenv()
+
+# 분석 작업 프로세스 수 (1: 현재 프로세스에서 순서대로, 0: CPU 코어 수)
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "1")) or os.cpu_count()
+# 1이면 입력 파일이 바뀌지 않은 단지도 모두 다시 분석
+ANALYSIS_FORCE = os.getenv("ANALYSIS_FORCE", "0") == "1"
+# 이전 단지 기본정보 스냅샷 파일명. 설정하면 이 스냅샷과 비교해 추가되거나 바뀐 단지만 분석 대상으로 확인
+MASTER_BASE_SNAPSHOT = os.getenv("MASTER_BASE_SNAPSHOT")
+
 terminate_program = False
 
 
@@ -34,151 +54,463 @@ def signal_handler(sig, frame):
     terminate_program = True
 
 
-def analyze_monthly_trend(month_data: pd.DataFrame, column: str) -> Optional[Dict[str, Any]]:
+def analyze_energy_trends(df: pd.DataFrame, keys: Optional[List[str]] = None,
+                          columns: Optional[List[str]] = None) -> pd.DataFrame:
     """
-    특정 월의 특정 에너지 유형에 대한 추세를 분석합니다.
+    모든 (그룹, 에너지 유형)에 대한 추세를 한 번에 분석합니다.
+
+    그룹별 합계(n, Σx, Σy)로 평균을 구한 뒤 평균을 뺀 값의 합계(Σdxdy, Σdx², Σdy²)로
+    상관계수와 회귀 계수를 계산하므로 그룹마다 np.polyfit으로 회귀선을 구한 결과와 같습니다.
 
     Args:
-        month_data: 특정 월의 데이터
-        column: 분석할 에너지 컬럼
+        df: year, 그룹 컬럼과 에너지 컬럼을 가진 데이터 (시간 순서로 정렬)
+        keys: 그룹 컬럼 목록 (기본값: None, ['month'])
+        columns: 분석할 에너지 컬럼 목록 (기본값: None, 전체 에너지 컬럼)
 
     Returns:
-        분석 결과 딕셔너리 또는 None (분석 불가능한 경우)
+        그룹, 에너지 유형 순서의 분석 결과 데이터프레임
+    """
+    keys = keys or ['month']
+    columns = columns or ENERGY_COLUMNS
+    group_keys = keys + ['energy_type']
+    result_columns = group_keys + ['energy_name', 'correlation', 'slope', 'initial_value',
+                                   'annual_growth_rate', 'trend', 'data_points']
+
+    # 에너지 컬럼을 세로로 쌓은 (그룹, 연도, 에너지 유형, 값) 데이터
+    # energy_type은 문자열을 만들지 않고 범주형 코드로 바로 생성
+    row_count = len(df)
+    long_df = df[keys + ['year']].iloc[np.tile(np.arange(row_count), len(columns))].reset_index(drop=True)
+    long_df['energy_type'] = pd.Categorical.from_codes(np.repeat(np.arange(len(columns)), row_count),
+                                                       categories=columns)
+    long_df['value'] = df[columns].to_numpy(dtype=np.float64).ravel(order='F')
+
+    # (그룹, 에너지 유형)별 유효 데이터: 결측값과 0 제외
+    long_df = long_df[long_df['value'].notna() & (long_df['value'] != 0)]
+    if long_df.empty:
+        return pd.DataFrame(columns=result_columns)
+
+    groups = long_df.groupby(group_keys, sort=True, observed=True)
+    stats = groups.agg(n=('value', 'size'), sum_x=('year', 'sum'), sum_y=('value', 'sum'), x0=('year', 'first'))
+
+    # 평균을 뺀 값의 합계 (큰 사용량 값에서도 정밀도 유지)
+    # 그룹 번호로 그룹 평균을 각 행에 펼쳐 그룹 키를 다시 맞추지 않음
+    group_ids = groups.ngroup().to_numpy()
+    n = stats['n'].to_numpy()
+    dx = long_df['year'].to_numpy() - (stats['sum_x'].to_numpy() / n)[group_ids]
+    dy = long_df['value'].to_numpy() - (stats['sum_y'].to_numpy() / n)[group_ids]
+    centered = pd.DataFrame({'sxy': dx * dy, 'sxx': dx * dx, 'syy': dy * dy}).groupby(group_ids).sum()
+    stats[['sxy', 'sxx', 'syy']] = centered.to_numpy()
+
+    stats = stats[stats['n'] >= 2]
+    if stats.empty:
+        return pd.DataFrame(columns=result_columns)
+
+    stats['mean_x'] = stats['sum_x'] / stats['n']
+    stats['mean_y'] = stats['sum_y'] / stats['n']
+    return summarize_trends(stats.reset_index(), keys)
+
+
+def summarize_trends(stats: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
     """
-    # 결측값 제거
-    valid_data = month_data[['year', column]].dropna()
-    valid_data = valid_data[valid_data[column] != 0]
+    그룹별 통계로 추세 지표를 계산합니다.
 
-    if len(valid_data) < 2:
-        return None
+    Args:
+        stats: 그룹 컬럼, energy_type과 n, mean_x, mean_y, sxx, sxy, syy(평균을 뺀 제곱합/곱의 합),
+            x0(첫 연도) 컬럼을 가진 데이터프레임
+        keys: 그룹 컬럼 목록
 
-    # 상관계수 계산
-    correlation = valid_data.corr(method='pearson').iloc[0, 1]
+    연도가 모두 같은 그룹(sxx == 0)은 회귀선이 정해지지 않으므로 기울기 0, 초기값은 평균,
+    상관계수는 결측값인 '유지'로 계산합니다. 어느 분석 경로에서나 같은 규칙을 사용합니다.
 
-    # 선형 회귀 계수 계산
-    x = valid_data['year'].values
-    y = valid_data[column].values
+    Returns:
+        그룹, 에너지 유형 순서의 분석 결과 데이터프레임
+    """
+    group_keys = keys + ['energy_type']
+    result_columns = group_keys + ['energy_name', 'correlation', 'slope', 'initial_value',
+                                   'annual_growth_rate', 'trend', 'data_points']
 
-    slope, intercept = np.polyfit(x, y, 1)
+    n = stats['n'].to_numpy()
+    mean_x = stats['mean_x'].to_numpy()
+    mean_y = stats['mean_y'].to_numpy()
+    sxx, sxy, syy = stats['sxx'].to_numpy(), stats['sxy'].to_numpy(), stats['syy'].to_numpy()
 
-    # 초기값 및 증가율 계산
-    initial_value = intercept + slope * x[0]
-    annual_growth_rate = (slope / initial_value) * \
-        100 if initial_value != 0 else 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlation = sxy / np.sqrt(sxx * syy)
+        slope = np.where(sxx > 0, sxy / sxx, 0.0)
+        initial_value = mean_y + slope * (stats['x0'].to_numpy() - mean_x)
+        annual_growth_rate = np.where(initial_value != 0, slope / initial_value * 100, 0)
 
     # 변화가 미미한 경우 '유지'로 표시하기 위한 임계값 설정
     slope_threshold = 0.001
-    if abs(slope) < slope_threshold:
-        growth_trend = "유지"
-    else:
-        growth_trend = "증가" if slope > 0 else "감소"
+    trend = np.where(np.abs(slope) < slope_threshold, "유지", np.where(slope > 0, "증가", "감소"))
+
+    results = stats[group_keys].reset_index(drop=True)
+    results['energy_type'] = results['energy_type'].astype(str)
+    results['energy_name'] = results['energy_type'].map(ENERGY_NAME_MAPPING).fillna(results['energy_type'])
+    results['correlation'] = np.round(correlation, 4)
+    results['slope'] = np.round(slope, 4)
+    results['initial_value'] = np.round(initial_value, 2)
+    results['annual_growth_rate'] = np.round(annual_growth_rate, 2)
+    results['trend'] = trend
+    results['data_points'] = n
+
+    return results[result_columns]
 
-    return {
-        # 시간과 에너지 사용량 간의 상관관계 (-1에서 1 사이 값)
-        'correlation': round(correlation, 4),
-        'slope': round(slope, 4),  # 선형 회귀선의 기울기 (시간당 에너지 변화량)
-        'initial_value': round(initial_value, 2),  # 분석 기간 시작 시점의 예측 에너지 사용량
-        'annual_growth_rate': round(annual_growth_rate, 2),  # 연간 증가율 (%)
-        'trend': growth_trend,  # 전체적인 추세 (증가/감소/유지)
-        'data_points': len(valid_data)  # 분석에 사용된 데이터 포인트 수
-    }
+
+def is_store_current() -> bool:
+    """
+    에너지 큐브가 있고 모든 CSV 파일보다 나중에 생성되었는지 확인합니다.
+    """
+    if not cube_exists():
+        return False
+
+    energy_dir = os.path.join(os.getcwd(), 'data', 'energy')
+    store_mtime = os.path.getmtime(get_cube_dir())
+    return all(os.path.getmtime(os.path.join(energy_dir, file)) <= store_mtime
+               for file in get_csv_files(energy_dir))
 
 
-def analyze_energy_columns(month: int, month_data: pd.DataFrame) -> List[Dict[str, Any]]:
+def analysis_file_name(kapt_code: str, complex_name: str) -> str:
+    return f"{kapt_code}_{complex_name}_analysis.csv"
+
+
+def analyze_complex(kapt_code: str, complex_name: str, df: pd.DataFrame) -> pd.DataFrame:
     """
-    특정 월의 모든 에너지 유형에 대한 분석을 수행합니다.
+    단지 하나의 에너지 데이터를 분석하고 결과를 저장합니다.
 
     Args:
-        month: 분석 대상 월
-        month_data: 해당 월의 데이터
+        kapt_code: 단지 코드
+        complex_name: 단지명
+        df: 단지 에너지 데이터
 
     Returns:
-        각 에너지 유형별 분석 결과 리스트
+        분석 결과 데이터프레임
     """
-    results_rows = []
-    print(f"\n[{month}] 월별 에너지 사용량 분석 시작")
-    print("-"*50)
+    # 데이터 전처리 (같은 요청 월은 처음 행만 사용, 누적 통계와 같은 기준)
+    df = filter_zero_energy_rows(df, ENERGY_COLUMNS)
+    df = drop_duplicate_months(preprocess_time_columns(df), ['month_index'])
+    # 수집 순서와 관계없이 시간 순서로 분석
+    df = df.sort_values('month_index', kind='stable').reset_index(drop=True)
 
-    for column in ENERGY_COLUMNS:
-        if terminate_program:
-            break
+    # 월별, 에너지 유형별 추세 분석
+    results = analyze_energy_trends(df)
+    print(f"총 {len(results)}개 월별 에너지 유형 분석 완료")
 
-        print(f"  - {ENERGY_NAME_MAPPING.get(column, column)} 분석 중...", end=' ')
-        trend_result = analyze_monthly_trend(month_data, column)
-
-        if trend_result:
-            # 결과를 행 형태로 저장
-            row_data = {
-                'month': month,
-                'energy_type': column,
-                'energy_name': ENERGY_NAME_MAPPING.get(column, column)
-            }
-            # 모든 메트릭 추가
-            row_data.update(trend_result)
-            results_rows.append(row_data)
-            print(f"완료 (데이터 포인트: {trend_result['data_points']}개)")
-        else:
-            print("데이터 부족으로 분석 불가")
+    if not results.empty:
+        save_analysis_results(results, analysis_file_name(kapt_code, complex_name))
 
-    print("-"*50)
-    print(f"[{month}] 월별 총 {len(results_rows)}개 에너지 유형 분석 완료")
+    return results
 
-    return results_rows
 
+def analyze_csv_file(file: str) -> Tuple[Optional[str], pd.DataFrame, str]:
+    """
+    에너지 데이터 CSV 파일 하나를 분석합니다. 작업 프로세스에서 실행되며
+    출력은 모아서 반환하므로 주 프로세스가 단지 순서대로 출력합니다.
+
+    Args:
+        file: 에너지 데이터 CSV 파일명
 
-def analyze_all_complexes(csv_files: Optional[List[str]] = None):
+    Returns:
+        (분석 결과 파일명 또는 결과가 없으면 None, 분석 결과 저장소 스키마의 결과, 출력 내용)
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result_file, results = analyze_file(file)
+    return result_file, results, output.getvalue()
+
+
+def analyze_file(file: str) -> Tuple[Optional[str], pd.DataFrame]:
+    """
+    에너지 데이터 CSV 파일 하나를 읽어 분석합니다.
+
+    Args:
+        file: 에너지 데이터 CSV 파일명
+
+    Returns:
+        (분석 결과 파일명 또는 결과가 없으면 None, 분석 결과 저장소 스키마의 결과)
+    """
+    kapt_code, complex_name = decoding_file_name(file)
+    df = load_csv_data(file, source_folder='energy', dtype=ENERGY_DATA_DTYPES)
+    results = analyze_complex(kapt_code, complex_name, df)
+    results = to_analysis_frame(results.assign(kaptCode=kapt_code), complex_name)
+    if results.empty:
+        return None, results
+    return analysis_file_name(kapt_code, complex_name), results
+
+
+def init_analysis_worker():
+    # 종료 요청은 주 프로세스가 처리하고, 작업 프로세스는 진행 중인 단지를 마침
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def print_complex_header(idx: int, total: int, file: str):
+    kapt_code, complex_name = decoding_file_name(file)
+
+    print("\n" + "="*50)
+    print(f"[{idx+1}/{total}] {complex_name} 분석 준비")
+    print("-"*50)
+    print(f"- 단지 코드: {kapt_code}")
+    print(f"- 단지명: {complex_name}")
+    print("="*50 + "\n")
+
+
+def analyze_all_complexes(csv_files: List[str], workers: int = 1,
+                          on_complete: Optional[Callable[[str, Optional[str]], None]] = None):
     """
     output 폴더 내의 모든 CSV 파일을 단지별로 분석합니다.
     각 단지마다 하나의 CSV 파일만 존재합니다.
+
+    workers가 2 이상이면 단지를 프로세스 풀에 나누어 분석하고, 결과는 파일 순서대로 출력합니다.
+    한 단지에서 오류가 발생해도 나머지 단지는 계속 분석합니다. 분석을 마친 단지의 결과는
+    마지막에 분석 결과 저장소에 한 번에 반영합니다.
+
+    Args:
+        csv_files: 에너지 데이터 CSV 파일 목록
+        workers: 작업 프로세스 수 (기본값: 1, 현재 프로세스에서 순서대로 분석)
+        on_complete: 단지 분석을 마칠 때마다 (파일명, 분석 결과 파일명)으로 호출할 함수
     """
     global terminate_program
 
-    try:
+    total = len(csv_files)
+    failed = []
+    analyzed_codes = []
+    store_frames = []
+
+    if workers <= 1:
         for idx, file in enumerate(csv_files):
             if terminate_program:
                 break
 
-            df = load_csv_data(file, source_folder='energy')
-            kapt_code, complex_name = decoding_file_name(file)
-
-            print("\n" + "="*50)
-            print(f"[{idx+1}/{len(csv_files)}] {complex_name} 분석 준비")
-            print("-"*50)
-            print(f"- 단지 코드: {kapt_code}")
-            print(f"- 단지명: {complex_name}")
-            print("="*50 + "\n")
-
-            # 데이터 전처리
-            df = filter_zero_energy_rows(df, ENERGY_COLUMNS)
-            df = preprocess_time_columns(df)
-            df = df.reset_index(drop=True)
-            month_data = df.groupby('month')
-
-            results = []
-            for month, month_df in month_data:
-                # 월별 데이터 분석
-                monthly_results = analyze_energy_columns(month, month_df)
-                results.extend(monthly_results)
+            print_complex_header(idx, total, file)
+            try:
+                result_file, results = analyze_file(file)
+            except Exception as e:
+                print(f"[{file}] 분석 중 오류가 발생했습니다: {str(e)}")
+                failed.append(file)
+                continue
+            analyzed_codes.append(decoding_file_name(file)[0])
+            store_frames.append(results)
+            if on_complete:
+                on_complete(file, result_file)
+    else:
+        print(f"{workers}개 프로세스로 {total}개 단지 분석 시작")
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_analysis_worker) as executor:
+            futures = [executor.submit(analyze_csv_file, file) for file in csv_files]
+
+            for idx, (file, future) in enumerate(zip(csv_files, futures)):
                 if terminate_program:
+                    executor.shutdown(wait=True, cancel_futures=True)
                     break
 
-            if results:
-                save_analysis_results(
-                    results, f"{kapt_code}_{complex_name}_analysis.csv")
+                print_complex_header(idx, total, file)
+                try:
+                    result_file, results, output = future.result()
+                    print(output, end='')
+                except Exception as e:
+                    print(f"[{file}] 분석 중 오류가 발생했습니다: {str(e)}")
+                    failed.append(file)
+                    continue
+                analyzed_codes.append(decoding_file_name(file)[0])
+                store_frames.append(results)
+                if on_complete:
+                    on_complete(file, result_file)
 
-            # break
+    if failed:
+        print(f"\n분석에 실패한 단지 {len(failed)}개: {', '.join(failed)}")
 
+    if analyzed_codes:
+        save_to_analysis_store(pd.concat(store_frames, ignore_index=True), analyzed_codes)
+
+
+def analyze_store(complex_names: Dict[str, str], columns: Optional[List[str]] = None,
+                  on_complete: Optional[Callable[[str, Optional[str]], None]] = None):
+    """
+    에너지 큐브(build_energy_store.py)의 메모리 매핑 배열로 단지별 추세를 계산하고 저장합니다.
+
+    Args:
+        complex_names: {단지 코드: 단지명} 분석할 단지
+        columns: 분석할 에너지 컬럼 목록 (기본값: None, 전체 에너지 컬럼)
+        on_complete: 단지 분석을 마칠 때마다 (단지 코드, 분석 결과 파일명)으로 호출할 함수
+    """
+    columns = columns or ENERGY_COLUMNS
+
+    stats = EnergyCube().trend_stats(list(complex_names), columns)
+    results = trends_from_stats(stats, columns)
+    print(f"에너지 큐브로 {len(complex_names)}개 단지, 총 {len(results)}개 월별 에너지 유형 분석 완료")
+
+    save_complex_results(results, list(complex_names), complex_names, on_complete)
+
+
+def trends_from_stats(stats: pd.DataFrame, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    (단지, 월, 에너지 유형)별 합계 통계로 추세 지표를 계산합니다.
+
+    Args:
+        stats: load_trend_stats 또는 EnergyCube.trend_stats 형식의 통계
+        columns: 분석할 에너지 컬럼 목록 (기본값: None, 전체 에너지 컬럼, 결과도 이 순서로 정렬)
+
+    Returns:
+        단지, 월, 에너지 유형 순서의 분석 결과 데이터프레임
+    """
+    columns = columns or ENERGY_COLUMNS
+    stats = stats[(stats['n'] >= 2) & stats['energy_type'].isin(columns)].copy()
+    stats['energy_type'] = pd.Categorical(stats['energy_type'], categories=columns)
+    stats = stats.sort_values(['kaptCode', 'month', 'energy_type']).reset_index(drop=True)
+    return summarize_trends(stats, keys=['kaptCode', 'month'])
+
+
+def analyze_trend_stats(conn, complex_names: Dict[str, str],
+                        on_complete: Optional[Callable[[str, Optional[str]], None]] = None):
+    """
+    수집 시 갱신된 누적 통계로 단지별 추세를 계산하고 저장합니다. 에너지 데이터 파일은 읽지 않습니다.
+
+    Args:
+        conn: 매니페스트 연결
+        complex_names: {단지 코드: 단지명} 분석할 단지
+        on_complete: 단지 분석을 마칠 때마다 (단지 코드, 분석 결과 파일명)으로 호출할 함수
+    """
+    stats = load_trend_stats(conn, kapt_codes=list(complex_names))
+    results = trends_from_stats(stats)
+    print(f"누적 통계로 {len(complex_names)}개 단지, 총 {len(results)}개 월별 에너지 유형 분석 완료")
+
+    save_complex_results(results, list(complex_names), complex_names, on_complete)
+
+
+def save_complex_results(results: pd.DataFrame, kapt_codes: List[str], complex_names: Dict[str, str],
+                         on_complete: Optional[Callable[[str, Optional[str]], None]] = None):
+    """
+    여러 단지의 분석 결과를 단지별 파일로 저장하고, 분석 결과 저장소에 한 번에 반영합니다.
+
+    Args:
+        results: kaptCode 컬럼을 가진 분석 결과
+        kapt_codes: 분석한 단지 코드 목록
+        complex_names: {단지 코드: 단지명}
+        on_complete: 단지 결과를 저장할 때마다 (단지 코드, 분석 결과 파일명)으로 호출할 함수
+    """
+    complex_results = dict(list(results.groupby('kaptCode', sort=True, observed=True)))
+    saved = 0
+    analyzed_codes = []
+    for kapt_code in sorted(kapt_codes):
+        if terminate_program:
+            break
+
+        # 0이 아닌 데이터가 없거나 분석할 수 있는 월이 없는 단지는 결과 파일 없음
+        result_file = None
+        if kapt_code in complex_results:
+            result_file = analysis_file_name(kapt_code, complex_names[kapt_code])
+            save_analysis_results(complex_results[kapt_code].drop(columns='kaptCode'), result_file)
+            saved += 1
+        analyzed_codes.append(kapt_code)
+        if on_complete:
+            on_complete(kapt_code, result_file)
+
+    print(f"{saved}/{len(complex_results)}개 단지 분석 결과 저장 완료")
+
+    if analyzed_codes:
+        results = results[results['kaptCode'].isin(set(analyzed_codes))]
+        save_to_analysis_store(to_analysis_frame(results, complex_names), analyzed_codes)
+
+
+def save_to_analysis_store(results: pd.DataFrame, kapt_codes: List[str]):
+    """
+    분석한 단지의 결과를 분석 결과 저장소에 반영합니다. 실패해도 단지별 결과 파일은 유지되며,
+    저장소에 빠진 단지는 다음 실행에서 다시 분석합니다.
+
+    Args:
+        results: 분석 결과 저장소 스키마의 결과
+        kapt_codes: 분석한 단지 코드 목록 (결과가 없는 단지는 저장소에서 삭제)
+    """
+    try:
+        rows = upsert_analysis_results(results, kapt_codes)
+        print(f"분석 결과 저장소에 {len(kapt_codes)}개 단지 반영 (전체 {rows}행)")
     except Exception as e:
-        print(f"분석 중 오류가 발생했습니다: {str(e)}")
+        print(f"분석 결과 저장소 저장 중 오류가 발생했습니다: {str(e)}")
+
+
+def remove_complex_results(kapt_codes: set):
+    """
+    단지 기본정보에서 삭제된 단지의 분석 결과 파일과 분석 결과 저장소의 결과를 삭제합니다.
+
+    Args:
+        kapt_codes: 삭제할 단지 코드 집합
+    """
+    output_dir = os.path.join(os.getcwd(), 'data', 'analysis')
+    removed_files = [file for file in get_csv_files(output_dir) if file.split('_', 1)[0] in kapt_codes] \
+        if os.path.exists(output_dir) else []
+    for file in removed_files:
+        os.remove(os.path.join(output_dir, file))
+
+    stored = sorted(stored_kapt_codes() & kapt_codes)
+    if stored:
+        try:
+            rows = upsert_analysis_results([], stored)
+            print(f"분석 결과 저장소에서 {len(stored)}개 단지 삭제 (전체 {rows}행)")
+        except Exception as e:
+            print(f"분석 결과 저장소 삭제 중 오류가 발생했습니다: {str(e)}")
+    print(f"삭제된 단지 {len(kapt_codes)}개의 분석 결과 파일 {len(removed_files)}개 삭제")
+
+
+def analysis_version() -> str:
+    """
+    분석 결과에 영향을 주는 코드와 설정의 버전
+    """
+    # 읽기 타입(schema), 누적 통계(trend_stats), 큐브 통계(energy_cube), 저장 변환(analysis_store) 포함
+    modules = [data_utils, schema, trend_stats, energy_cube, analysis_store]
+    sources = [os.path.abspath(__file__)] + [module.__file__ for module in modules]
+    return code_version(sources, config=','.join(ENERGY_COLUMNS))
 
 
 def main():
     print("에너지 사용량 분석 프로그램 실행 중... (Ctrl+C를 누르면 프로그램이 종료됩니다)")
 
-    # 모든 CSV 파일 가져오기
-    all_csv_files = get_csv_files(os.path.join(os.getcwd(), 'data', 'energy'))
-
-    analyze_all_complexes(all_csv_files)
+    # 입력 파일과 분석 코드가 바뀌지 않은 단지는 건너뜀
+    manifest = open_manifest()
+    ensure_analysis_cache(manifest)
+    ensure_trend_stats(manifest)
+    version = analysis_version()
+
+    all_csv_files = sorted(get_csv_files(os.path.join(os.getcwd(), 'data', 'energy')))
+
+    # 스냅샷 갱신 시에는 바뀐 단지의 파일만 변경 여부를 확인
+    if MASTER_BASE_SNAPSHOT:
+        diff = load_snapshot_diff(MASTER_BASE_SNAPSHOT, MASTER_FILENAME)
+        print_diff_summary(diff, MASTER_BASE_SNAPSHOT, MASTER_FILENAME)
+        targets = affected_codes(diff, columns=MASTER_SNAPSHOT_COLUMNS)
+        all_csv_files = [file for file in all_csv_files if decoding_file_name(file)[0] in targets]
+
+        # 삭제된 단지의 결과는 시각화와 회귀 분석에 쓰이지 않도록 제거
+        removed = affected_codes(diff, changes=(CHANGE_REMOVED,))
+        if removed:
+            remove_complex_results(removed)
+
+    stale = get_stale_files(manifest, all_csv_files, version, force=ANALYSIS_FORCE,
+                            stored_codes=stored_kapt_codes())
+    print(f"전체 {len(all_csv_files)}개 단지 중 {len(stale)}개 단지 분석 "
+          f"(변경 없는 {len(all_csv_files) - len(stale)}개 단지 건너뜀)")
+
+    def record(file, result_file):
+        mark_analyzed(manifest, file, stale[file], version, result_file)
+
+    def record_code(kapt_code, result_file):
+        record(files_by_code[kapt_code], result_file)
+
+    # 수집기가 갱신한 누적 통계가 파일 내용을 모두 반영한 단지는 파일을 읽지 않고 분석
+    complete = get_complete_files(manifest, stale)
+    files_by_code = {decoding_file_name(file)[0]: file for file in stale}
+    if complete:
+        analyze_trend_stats(manifest, dict(decoding_file_name(file) for file in complete),
+                            on_complete=record_code)
+    remaining = [file for file in stale if file not in complete]
+
+    # 최신 에너지 큐브가 있으면 한 번에 계산하고, 없으면 CSV 파일을 하나씩 읽음
+    if remaining and is_store_current():
+        print("에너지 큐브에서 데이터를 읽습니다.")
+        analyze_store(dict(decoding_file_name(file) for file in remaining), on_complete=record_code)
+    elif remaining:
+        print("에너지 데이터 CSV 파일을 읽습니다. (build_energy_store.py로 에너지 큐브를 만들면 더 빠르게 읽습니다)")
+        analyze_all_complexes(remaining, workers=ANALYSIS_WORKERS, on_complete=record)
+
+    manifest.close()
 
     print("프로그램이 종료되었습니다.")
 
@@ -1,28 +1,301 @@
+import random
+import threading
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = "http://apis.data.go.kr/1613000/ApHusEnergyUseInfoOfferServiceV2/getHsmpApHusUsgQtyInfoSearchV2"
+
+# 정상 응답 코드
+SUCCESS_CODES = ('00', '1')
+
+# 실패 분류
+RETRYABLE = 'retryable'            # 일시적 오류 (5xx, 연결 실패, 타임아웃) - 재시도 대상
+QUOTA_EXCEEDED = 'quota_exceeded'  # 일일 요청 한도 초과 - 당일 재시도 불가
+PERMANENT = 'permanent'            # 재시도해도 결과가 같은 오류 (4xx, 잘못된 응답)
+
+
+class EnergyApiError(Exception):
+    """
+    API 호출 실패 예외
+
+    Attributes:
+        kind: 실패 분류 (RETRYABLE, QUOTA_EXCEEDED, PERMANENT)
+        status_code: HTTP 상태 코드 (응답을 받지 못한 경우 None)
+        response_text: 응답 본문 (응답을 받지 못한 경우 None)
+    """
+
+    def __init__(self, message, kind, status_code=None, response_text=None):
+        super().__init__(message)
+        self.kind = kind
+        self.status_code = status_code
+        self.response_text = response_text
+
+
+def is_quota_exceeded(response_text):
+    """
+    일일 API 요청 한도 초과 응답인지 확인
+
+    Args:
+        response_text (str): 응답 본문
+
+    Returns:
+        bool: 한도 초과 응답 여부
+    """
+    return (isinstance(response_text, str) and
+            "LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR" in response_text and
+            "returnReasonCode>22<" in response_text)
+
+
+def parse_energy_response(response, req_month):
+    """
+    API 응답에서 월 데이터를 추출
+
+    Args:
+        response: API 응답 데이터
+        req_month: 요청 월(YYYYMM)
+
+    Returns:
+        tuple: (월 데이터 또는 실패 시 None, 응답 코드)
+
+    Raises:
+        KeyError, TypeError: 응답 형식이 올바르지 않은 경우
+    """
+    result_code = response['response']['header']['resultCode']
+    if result_code in SUCCESS_CODES:
+        item = {'requestMonth': req_month}
+        item.update(response['response']['body']['item'])
+        return item, result_code
+
+    return None, result_code
+
+
+def classify_response(status_code, response_text):
+    """
+    JSON이 아닌 응답 또는 오류 상태 코드를 실패 분류로 변환
+
+    Args:
+        status_code (int): HTTP 상태 코드
+        response_text (str): 응답 본문
+
+    Returns:
+        str: 실패 분류 (RETRYABLE, QUOTA_EXCEEDED, PERMANENT)
+    """
+    if is_quota_exceeded(response_text):
+        return QUOTA_EXCEEDED
+    if status_code >= 500 or status_code == 429:
+        return RETRYABLE
+    return PERMANENT
+
+
+class EnergyApiClient:
+    """
+    연결 풀을 재사용하는 공동주택 에너지 사용량 API 클라이언트
+
+    하나의 세션으로 keep-alive 연결을 유지하고, 일시적 오류는 지터가 적용된
+    지수 백오프로 재시도합니다. 여러 스레드에서 동시에 사용할 수 있습니다.
+    """
+
+    def __init__(self, base_url=BASE_URL, timeout=(5, 30), max_retries=3,
+                 backoff_base=0.5, backoff_max=30.0, pool_size=10, observer=None):
+        """
+        Args:
+            base_url (str): API 엔드포인트 URL
+            timeout (tuple): (연결 타임아웃, 읽기 타임아웃) 초
+            max_retries (int): 일시적 오류 발생 시 최대 재시도 횟수
+            backoff_base (float): 백오프 기본 대기 시간(초)
+            backoff_max (float): 백오프 최대 대기 시간(초)
+            pool_size (int): 유지할 최대 연결 수 (동시 요청 수 이상으로 설정)
+            observer (callable): 호출 한 번마다 (응답 시간(초), 실패 분류 또는 None)으로 호출할 함수
+                (재시도 포함, 속도 제어용)
+        """
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.observer = observer
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
+    def backoff_delay(self, attempt):
+        """
+        재시도 대기 시간 계산 (full jitter 지수 백오프)
 
-def fetch_apt_energy_info(service_key, kapt_code, req_month):
+        Args:
+            attempt (int): 재시도 횟수 (0부터 시작)
+
+        Returns:
+            float: 대기 시간(초)
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def request_once(self, service_key, kapt_code, req_month):
+        """
+        API를 한 번 호출하고 응답을 해석
+
+        Returns:
+            dict: API 응답 데이터
+
+        Raises:
+            EnergyApiError: 호출 또는 응답 해석에 실패한 경우
+        """
+        params = {
+            'serviceKey': service_key,
+            'kaptCode': kapt_code,
+            'reqDate': req_month,
+        }
+
+        try:
+            response = self.session.get(
+                self.base_url, params=params, timeout=self.timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            raise EnergyApiError(f"연결 오류: {e}", RETRYABLE)
+        except requests.exceptions.RequestException as e:
+            raise EnergyApiError(f"요청 오류: {e}", PERMANENT)
+
+        if response.status_code != 200:
+            raise EnergyApiError(f"HTTP {response.status_code}",
+                                 classify_response(
+                                     response.status_code, response.text),
+                                 response.status_code, response.text)
+
+        try:
+            return response.json()
+        except ValueError:
+            kind = classify_response(response.status_code, response.text)
+            message = "일일 API 요청 한도 초과" if kind == QUOTA_EXCEEDED else "JSON이 아닌 응답"
+            raise EnergyApiError(message, kind,
+                                 response.status_code, response.text)
+
+    def fetch(self, service_key, kapt_code, req_month, on_retry=None):
+        """
+        공동주택 에너지 사용량 API 호출 (일시적 오류는 재시도)
+
+        Parameters:
+        - service_key: API 서비스 키
+        - kapt_code: 단지 코드
+        - req_month: 요청 월(YYYYMM)
+        - on_retry: 재시도 요청을 보내기 전마다 호출할 함수 (재시도도 요청 수에 포함되므로 사용량 기록용)
+
+        Returns:
+        - API 응답 데이터(딕셔너리)
+
+        Raises:
+        - EnergyApiError: 재시도 후에도 실패하거나 재시도할 수 없는 오류인 경우
+        """
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                response = self.request_once(service_key, kapt_code, req_month)
+            except EnergyApiError as e:
+                if self.observer is not None:
+                    self.observer(time.monotonic() - started, e.kind)
+                if e.kind != RETRYABLE or attempt >= self.max_retries:
+                    raise
+                time.sleep(self.backoff_delay(attempt))
+                attempt += 1
+                if on_retry is not None:
+                    on_retry()
+                continue
+
+            if self.observer is not None:
+                self.observer(time.monotonic() - started, None)
+            return response
+
+    def close(self):
+        self.session.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+_response_cache = None
+
+
+def configure_default_client(**kwargs):
+    """
+    fetch_apt_energy_info가 사용할 기본 클라이언트를 새 설정으로 교체
+
+    Args:
+        **kwargs: EnergyApiClient 생성 인자
+
+    Returns:
+        EnergyApiClient: 새 기본 클라이언트
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is not None:
+            _default_client.close()
+        _default_client = EnergyApiClient(**kwargs)
+        return _default_client
+
+
+def get_default_client():
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = EnergyApiClient()
+        return _default_client
+
+
+def configure_response_cache(cache):
+    """
+    get_cached_energy_info가 조회하고 fetch_apt_energy_info가 저장할 원본 응답 캐시 설정
+
+    Args:
+        cache: RawResponseCache 또는 캐시를 사용하지 않으려면 None
+    """
+    global _response_cache
+    _response_cache = cache
+
+
+def get_cached_energy_info(kapt_code, req_month):
+    """
+    캐시된 API 응답 조회 (캐시를 사용하지 않으면 None)
+
+    Args:
+        kapt_code: 단지 코드
+        req_month: 요청 월(YYYYMM)
+
+    Returns:
+        dict: 캐시된 API 응답 또는 None
+    """
+    if _response_cache is None:
+        return None
+    return _response_cache.get(kapt_code, req_month)
+
+
+def fetch_apt_energy_info(service_key, kapt_code, req_month, on_retry=None):
     """
     공동주택 에너지 사용량 API 호출 함수
 
+    캐시는 조회하지 않고 항상 API를 호출하며 (조회는 호출하는 쪽에서 get_cached_energy_info로),
+    원본 응답 캐시가 설정되어 있으면 새로 받은 정상 응답을 캐시에 저장합니다.
+
     Parameters:
     - service_key: API 서비스 키
     - kapt_code: 단지 코드
     - req_month: 요청 월(YYYYMM)
+    - on_retry: 재시도 요청을 보내기 전마다 호출할 함수
 
     Returns:
     - API 응답 데이터(딕셔너리)
+
+    Raises:
+    - EnergyApiError: 재시도 후에도 실패하거나 재시도할 수 없는 오류인 경우
     """
-    base_url = "http://apis.data.go.kr/1613000/ApHusEnergyUseInfoOfferServiceV2/getHsmpApHusUsgQtyInfoSearchV2"
+    response = get_default_client().fetch(service_key, kapt_code, req_month, on_retry)
 
-    params = {
-        'serviceKey': service_key,
-        'kaptCode': kapt_code,
-        'reqDate': req_month,
-    }
+    if _response_cache is not None:
+        try:
+            if response['response']['header']['resultCode'] in SUCCESS_CODES:
+                _response_cache.put(kapt_code, req_month, response)
+        except (KeyError, TypeError):
+            pass
 
-    try:
-        response = requests.get(base_url, params=params)
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        return response.text
+    return response
@@ -0,0 +1,176 @@
+import hashlib
+import threading
+import time
+
+
+def make_key_id(service_key):
+    """
+    서비스 키를 기록용 식별자로 변환 (키 원문은 저장하지 않음)
+
+    Args:
+        service_key (str): API 서비스 키
+
+    Returns:
+        str: 서비스 키의 SHA-256 해시 앞 8자리
+    """
+    return hashlib.sha256(service_key.encode('utf-8')).hexdigest()[:8]
+
+
+class ServiceKey:
+    """
+    서비스 키 하나의 요청 속도와 일일 요청 수 상태
+    """
+
+    def __init__(self, service_key, daily_limit, rate_per_second=0, used_today=0):
+        self.service_key = service_key
+        self.key_id = make_key_id(service_key)
+        self.daily_limit = daily_limit
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self.used_today = used_today
+        # 공유 사용량에 미리 기록해 두고 아직 쓰지 않은 요청 수 (음수이면 기록보다 더 쓴 요청 수)
+        self.reserved = 0
+        self.next_available = 0.0
+        self.retired = False
+
+    @property
+    def remaining(self):
+        return max(self.daily_limit - self.used_today, 0) + max(self.reserved, 0)
+
+    @property
+    def active(self):
+        return not self.retired and self.remaining > 0
+
+
+class ServiceKeyPool:
+    """
+    여러 서비스 키에 요청을 분산하는 키 풀
+
+    키마다 요청 속도(초당 요청 수)와 일일 요청 수를 따로 관리하며, 일일 한도를
+    초과한 키는 당일 사용을 중단하고 남은 키로 계속 요청합니다. 여러 스레드에서
+    동시에 사용할 수 있습니다.
+
+    claim_quota를 지정하면 요청 수를 공유 사용량(여러 작업자가 함께 쓰는 매니페스트)에서
+    reserve_batch건씩 미리 확보한 만큼만 사용하므로, 같은 키를 쓰는 작업자들이 합쳐서
+    일일 한도를 넘지 않습니다. 끝나면 settle()로 쓰지 않은 요청 수를 돌려줍니다.
+    """
+
+    def __init__(self, service_keys, daily_limit, rate_per_second=0, usage=None,
+                 claim_quota=None, settle_quota=None, reserve_batch=1):
+        """
+        Args:
+            service_keys (list): API 서비스 키 목록
+            daily_limit (int): 키별 일일 요청 한도
+            rate_per_second (float): 키별 초당 최대 요청 수 (0이면 제한 없음)
+            usage (dict): {키 식별자: 오늘 이미 사용한 요청 수}
+            claim_quota (callable): (키 식별자, 요청 수)로 공유 사용량에서 요청 수를 확보하고
+                (확보한 요청 수, 확보 후 오늘 사용량)을 반환하는 함수 (기본값: None, 이 작업자만 사용)
+            settle_quota (callable): (키 식별자, 쓰지 않은 요청 수)로 확보한 요청 수를 정산하는 함수
+            reserve_batch (int): 한 번에 확보할 요청 수
+        """
+        usage = usage or {}
+        self.keys = []
+        for service_key in dict.fromkeys(service_keys):
+            key = ServiceKey(service_key, daily_limit, rate_per_second)
+            key.used_today = usage.get(key.key_id, 0)
+            self.keys.append(key)
+        self.claim_quota = claim_quota
+        self.settle_quota = settle_quota
+        self.reserve_batch = max(int(reserve_batch), 1)
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def active_keys(self):
+        return [key for key in self.keys if key.active]
+
+    @property
+    def remaining(self):
+        """오늘 전체 키에 남은 요청 수"""
+        return sum(key.remaining for key in self.keys if not key.retired)
+
+    def reserve(self):
+        """
+        가장 빨리 요청할 수 있는 키를 골라 요청 한 건을 예약
+
+        Returns:
+            tuple: (ServiceKey, 요청 전 대기 시간(초)) 또는 사용 가능한 키가 없으면 (None, 0)
+        """
+        with self.lock:
+            while True:
+                candidates = self.active_keys
+                if not candidates:
+                    return None, 0.0
+
+                now = time.monotonic()
+                key = min(candidates, key=lambda candidate: max(candidate.next_available, now))
+                # 확보한 요청 수를 다 쓴 키는 공유 사용량에서 더 확보 (한도에 닿으면 다른 키 선택)
+                if self.claim_quota is None or key.reserved >= 1 or self._claim(key):
+                    break
+
+            start = max(key.next_available, now)
+            key.next_available = start + key.interval
+            self._spend(key)
+            return key, start - now
+
+    def _claim(self, key):
+        # 앞서 더 쓴 요청 수까지 함께 확보
+        granted, used_today = self.claim_quota(key.key_id, self.reserve_batch - min(key.reserved, 0))
+        key.reserved += granted
+        key.used_today = used_today
+        return key.reserved >= 1
+
+    def _spend(self, key):
+        if self.claim_quota is None:
+            key.used_today += 1
+        else:
+            key.reserved -= 1
+
+    def charge(self, key):
+        """
+        예약한 요청 외에 같은 키로 다시 보낸 요청(재시도) 한 건을 사용량에 반영
+
+        Args:
+            key (ServiceKey): 요청에 사용한 키
+        """
+        with self.lock:
+            self._spend(key)
+
+    def settle(self):
+        """
+        확보했지만 쓰지 않은 요청 수(또는 확보보다 더 쓴 요청 수)를 공유 사용량에 정산
+        """
+        with self.lock:
+            for key in self.keys:
+                if key.reserved and self.settle_quota is not None:
+                    self.settle_quota(key.key_id, key.reserved)
+                key.reserved = 0
+
+    def acquire(self):
+        """
+        요청에 사용할 키를 예약하고 속도 제한에 따라 대기
+
+        Returns:
+            ServiceKey: 사용할 키 또는 사용 가능한 키가 없으면 None
+        """
+        key, wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return key
+
+    def retire(self, key):
+        """
+        일일 한도를 초과한 키를 오늘 사용 대상에서 제외
+
+        Args:
+            key (ServiceKey): 제외할 키
+
+        Returns:
+            bool: 이번 호출로 새로 제외되었는지 여부
+        """
+        with self.lock:
+            if key.retired:
+                return False
+            key.retired = True
+            return True
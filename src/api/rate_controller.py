@@ -0,0 +1,159 @@
+import threading
+import time
+from collections import deque
+
+from api.energy_api import RETRYABLE
+
+# 지연 시간 판단에 필요한 최소 표본 수
+MIN_LATENCY_SAMPLES = 20
+
+
+def percentile(values, q):
+    """
+    정렬된 값 목록의 q 분위수 (0~1, 가장 가까운 순위)
+    """
+    if not values:
+        return None
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+class AimdRateController:
+    """
+    응답 지연과 오류에 따라 동시 요청 수와 초당 요청 수를 조절하는 AIMD 제어기
+
+    요청이 정상이면 동시 요청 수를 한 바퀴(동시 요청 수만큼의 응답)마다 1씩, 초당 요청 수를
+    1초마다 rate_increase씩 늘리고(가산 증가), 재시도 대상 오류(429, 5xx, 연결 실패)나 최근 응답의
+    p95 지연이 기준 지연(p50 최솟값)의 latency_factor배를 넘으면 둘 다 decrease배로 줄입니다(승법 감소).
+    처음 혼잡을 만나기 전까지는 응답마다 늘려 빠르게 처리량을 찾습니다(slow start).
+    여러 스레드에서 동시에 사용할 수 있습니다.
+    """
+
+    def __init__(self, max_concurrency, max_rate=0, initial_concurrency=1, initial_rate=2.0, min_rate=0.5,
+                 rate_increase=5.0, decrease=0.5, latency_factor=3.0, window=200):
+        """
+        Args:
+            max_concurrency (int): 최대 동시 요청 수
+            max_rate (float): 최대 초당 요청 수 (0이면 제한 없음)
+            initial_concurrency (int): 시작 동시 요청 수
+            initial_rate (float): 시작 초당 요청 수
+            min_rate (float): 최소 초당 요청 수
+            rate_increase (float): 정상 응답이 이어질 때 1초마다 늘리는 초당 요청 수
+            decrease (float): 혼잡 시 곱하는 비율 (0~1)
+            latency_factor (float): 혼잡으로 판단하는 p95 지연의 기준 지연 대비 배수
+            window (int): 지연 시간 분위수를 계산할 최근 응답 수
+        """
+        self.max_concurrency = max(int(max_concurrency), 1)
+        self.max_rate = max_rate
+        self.concurrency = float(min(max(initial_concurrency, 1), self.max_concurrency))
+        self.rate = float(initial_rate if not max_rate else min(initial_rate, max_rate))
+        self.min_rate = min_rate
+        self.rate_increase = rate_increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+
+        self.latencies = deque(maxlen=window)
+        self.baseline = None
+        self.slow_start = True
+        self.in_flight = 0
+        self.next_available = 0.0
+        self.last_decrease = 0.0
+        self.decreases = 0
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """
+        동시 요청 수에 여유가 있으면 요청 한 건을 예약
+
+        Returns:
+            float: 초당 요청 수에 맞춘 요청 전 대기 시간(초), 동시 요청 수가 가득 찼으면 None
+        """
+        with self.lock:
+            if self.in_flight >= int(self.concurrency):
+                return None
+            now = time.monotonic()
+            start = max(self.next_available, now)
+            self.next_available = start + 1.0 / self.rate
+            self.in_flight += 1
+            return start - now
+
+    def release(self):
+        """
+        예약한 요청이 끝났음을 기록 (성공, 실패와 관계없이 한 번 호출)
+        """
+        with self.lock:
+            self.in_flight -= 1
+
+    def _percentiles(self):
+        if len(self.latencies) < MIN_LATENCY_SAMPLES:
+            return None, None
+        values = sorted(self.latencies)
+        return percentile(values, 0.5), percentile(values, 0.95)
+
+    def observe(self, latency, error_kind=None):
+        """
+        HTTP 호출 한 번의 결과를 반영 (EnergyApiClient의 observer로 사용)
+
+        Args:
+            latency (float): 응답 시간(초)
+            error_kind (str): 실패 분류 (정상 응답이면 None)
+        """
+        with self.lock:
+            if error_kind == RETRYABLE:
+                self._decrease()
+                return
+            if error_kind is not None:
+                # 한도 초과나 잘못된 요청은 서버 혼잡과 관계없음
+                return
+
+            self.latencies.append(latency)
+            p50, p95 = self._percentiles()
+            if p50 is not None:
+                # 기준 지연은 p50의 최솟값을 따르되, 서버 지연이 계속 늘면 천천히 따라감
+                if self.baseline is None or p50 < self.baseline:
+                    self.baseline = p50
+                else:
+                    self.baseline += (p50 - self.baseline) * 0.01
+                if p95 > self.baseline * self.latency_factor:
+                    self._decrease()
+                    return
+
+            self._increase(p50)
+
+    def _increase(self, p50):
+        if self.slow_start:
+            self.concurrency += 1.0
+            self.rate += self.rate_increase
+        else:
+            self.concurrency += 1.0 / self.concurrency
+            self.rate += self.rate_increase / self.rate
+        self.concurrency = min(self.concurrency, float(self.max_concurrency))
+
+        # 동시 요청 수로 낼 수 있는 처리량의 두 배 이상으로는 늘리지 않음 (혼잡 시 바로 줄어들도록)
+        ceiling = self.max_rate or float('inf')
+        if p50:
+            ceiling = min(ceiling, 2.0 * self.concurrency / p50)
+        self.rate = max(min(self.rate, ceiling), self.min_rate)
+
+    def _decrease(self):
+        # 같은 혼잡으로 연달아 줄이지 않도록 최근 지연만큼은 한 번만 감소
+        now = time.monotonic()
+        p50, _ = self._percentiles()
+        if now - self.last_decrease < max(p50 or 0.0, 0.5):
+            return
+
+        self.slow_start = False
+        self.concurrency = max(self.concurrency * self.decrease, 1.0)
+        self.rate = max(self.rate * self.decrease, self.min_rate)
+        self.last_decrease = now
+        self.decreases += 1
+        self.latencies.clear()
+
+    def status(self):
+        """
+        진행 상황 출력용 현재 상태 문자열
+        """
+        with self.lock:
+            p50, p95 = self._percentiles()
+            latency = f", p50 {p50 * 1000:.0f}ms, p95 {p95 * 1000:.0f}ms" if p50 is not None else ""
+            return (f"동시 요청 {int(self.concurrency)}/{self.max_concurrency}, "
+                    f"목표 {self.rate:.1f} req/s{latency}, 감속 {self.decreases}회")
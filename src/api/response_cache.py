@@ -0,0 +1,120 @@
+import os
+import gzip
+import json
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+
+CACHE_FOLDER = os.path.join('cache', 'raw')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS raw_responses (
+    kaptCode TEXT NOT NULL,
+    month TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    PRIMARY KEY (kaptCode, month)
+) WITHOUT ROWID;
+"""
+
+
+class RawResponseCache:
+    """
+    API 원본 응답 캐시
+
+    응답 JSON은 내용의 SHA-256 해시를 이름으로 gzip 압축해 저장하고(내용 주소 방식),
+    (kaptCode, reqDate)와 해시의 대응은 SQLite 색인에 기록합니다.
+    여러 스레드에서 동시에 사용할 수 있습니다.
+    """
+
+    def __init__(self, folder=CACHE_FOLDER):
+        """
+        Args:
+            folder (str): data 폴더 아래 캐시 폴더 경로 (기본값: 'cache/raw')
+        """
+        self.directory = os.path.join(os.getcwd(), 'data', folder)
+        self.objects_dir = os.path.join(self.directory, 'objects')
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(self.directory, 'index.sqlite'),
+                                    timeout=60, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest + '.json.gz')
+
+    def get(self, kapt_code, req_month):
+        """
+        캐시된 응답 조회
+
+        Args:
+            kapt_code (str): 단지 코드
+            req_month (str): 요청 월(YYYYMM)
+
+        Returns:
+            dict: 캐시된 API 응답 또는 없으면 None
+        """
+        with self.lock:
+            row = self.conn.execute("SELECT digest FROM raw_responses WHERE kaptCode = ? AND month = ?",
+                                    (kapt_code, str(req_month))).fetchone()
+        if row is None:
+            return None
+
+        try:
+            with gzip.open(self.object_path(row[0]), 'rb') as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def put(self, kapt_code, req_month, response):
+        """
+        응답을 캐시에 저장
+
+        Args:
+            kapt_code (str): 단지 코드
+            req_month (str): 요청 월(YYYYMM)
+            response (dict): API 응답
+
+        Returns:
+            str: 응답 내용의 해시
+        """
+        data = json.dumps(response, ensure_ascii=False, sort_keys=True,
+                          separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO raw_responses (kaptCode, month, digest, fetched_at) VALUES (?, ?, ?, ?)",
+                (kapt_code, str(req_month), digest, datetime.now().isoformat(timespec='seconds')))
+
+        return digest
+
+    def list_months(self):
+        """
+        캐시된 단지별 월 목록
+
+        Returns:
+            dict: {단지 코드: 월 목록 (오름차순)}
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT kaptCode, month FROM raw_responses ORDER BY kaptCode, month").fetchall()
+
+        months = {}
+        for kapt_code, month in rows:
+            months.setdefault(kapt_code, []).append(month)
+        return months
+
+    def close(self):
+        self.conn.close()
@@ -1,17 +1,74 @@
 import os
+import time
 import signal
+import asyncio
+import pandas as pd
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
-from api.energy_api import fetch_apt_energy_info
-from utils.data_utils import load_csv_data, save_energy_data_to_csv
-from utils.date_utils import calculate_req_date, get_monthly_dates
+from api.energy_api import BASE_URL, QUOTA_EXCEEDED, RETRYABLE, EnergyApiError, configure_default_client, configure_response_cache, fetch_apt_energy_info, get_cached_energy_info, parse_energy_response
+from api.key_pool import ServiceKeyPool, make_key_id
+from api.rate_controller import AimdRateController
+from api.response_cache import RawResponseCache
+from utils.coverage_index import sync_coverage_index
+from utils.data_utils import decoding_file_name, energy_file_name, index_energy_files, load_csv_data, save_energy_data_to_csv
+from utils.date_utils import calculate_req_date
+from utils.journal import JournalWriter, fsync_file, list_journals, read_journal, remove_journal, repair_csv_tail
+from utils.manifest import STATUS_DONE, STATUS_FAILED, add_quota_usage, get_missing_months, get_quota_usage, mark_file_synced, open_manifest, record_months, reserve_quota, sync_energy_files
+from utils.master_data import load_master_data
+from utils.master_diff import affected_codes, load_snapshot_diff, print_diff_summary
+from utils.request_planner import build_request_schedule, print_schedule_summary
+from utils.retry_queue import MALFORMED, QUOTA, TRANSIENT, classify_result_code, enqueue_failure, ensure_retry_queue, get_due_retries, print_retry_summary, resolve_retries
+from utils.trend_stats import ensure_trend_stats, is_trend_synced, mark_trend_synced, sync_trend_stats, update_trend_stats
+from utils.work_queue import claim_complexes, default_worker_id, ensure_work_queue, get_leased_complexes, get_own_leases, release_leases, renew_leases
 
 # 상수 정의
 CSV_FILENAME = '20250328_단지_기본정보_수도권.csv'
 OUTPUT_FOLDER = 'energy'
+# 수집에 필요한 단지 기본정보 컬럼
+MASTER_COLUMNS = ['단지코드', '단지명', '사용승인일']
 
 load_dotenv()
 
+# 동시 요청 수 (1 이하이면 순차 수집)
+CONCURRENCY = int(os.getenv("COLLECTOR_CONCURRENCY", "1"))
+# 1이면 비동기 수집 시 응답 지연과 오류에 따라 동시 요청 수(최대 COLLECTOR_CONCURRENCY)와 초당 요청 수를 자동 조절
+ADAPTIVE_RATE = os.getenv("COLLECTOR_ADAPTIVE_RATE", "1") == "1"
+# 자동 조절 시 전체 초당 최대 요청 수 (0이면 제한 없음)
+MAX_REQUEST_RATE = float(os.getenv("COLLECTOR_MAX_RATE", "0"))
+# 서비스 키별 일일 요청 한도
+DAILY_REQUEST_LIMIT = int(os.getenv("DAILY_REQUEST_LIMIT", "10000"))
+# 서비스 키별 초당 최대 요청 수 (0이면 제한 없음)
+KEY_RATE_LIMIT = float(os.getenv("SERVICE_KEY_RATE_LIMIT", "0"))
+# 서비스 키별 일일 요청 수를 매니페스트에서 한 번에 확보하는 단위 (작업자들이 함께 한도를 지키도록 미리 기록)
+QUOTA_RESERVE_BATCH = 20
+# 요청 우선순위 전략 (newest_first: 최신 월 우선, complex_order: 단지 순서)
+SCHEDULE_STRATEGY = os.getenv("SCHEDULE_STRATEGY", "newest_first")
+# 1이면 전체 단지 계획 없이 재시도 대기열에서 재시도 시각이 된 요청만 처리
+RETRY_ONLY = os.getenv("COLLECTOR_RETRY_ONLY", "0") == "1"
+# 1이면 요청 일정만 출력하고 종료
+DRY_RUN = os.getenv("COLLECTOR_DRY_RUN", "0") == "1"
+# 수집 결과를 CSV와 매니페스트에 반영하는 주기 (월 데이터 수, 초)
+FLUSH_RECORDS = int(os.getenv("COLLECTOR_FLUSH_RECORDS", "20"))
+FLUSH_SECONDS = float(os.getenv("COLLECTOR_FLUSH_SECONDS", "30"))
+# 작업자 식별자 (여러 프로세스/컨테이너로 나누어 수집할 때 작업자마다 달라야 함)
+WORKER_ID = os.getenv("WORKER_ID") or default_worker_id()
+# 한 번에 임대할 단지 수
+LEASE_BATCH = int(os.getenv("LEASE_BATCH", "100"))
+# 단지 임대 유지 시간(초). 작업자가 비정상 종료되면 이 시간 후 다른 작업자가 가져감
+LEASE_SECONDS = float(os.getenv("LEASE_SECONDS", "600"))
+# 1이면 원본 API 응답을 data/cache/raw에 저장하고 재사용
+RESPONSE_CACHE = os.getenv("RESPONSE_CACHE", "1") == "1"
+# API 엔드포인트 (모의 서버로 시험할 때 변경)
+API_BASE_URL = os.getenv("ENERGY_API_BASE_URL") or BASE_URL
+# 이전 단지 기본정보 스냅샷 파일명. 설정하면 이 스냅샷과 비교해 추가되거나 사용승인일 등이 바뀐 단지만 수집
+MASTER_BASE_SNAPSHOT = os.getenv("MASTER_BASE_SNAPSHOT")
+# 진행 상황 출력 주기 (요청 수)
+PROGRESS_INTERVAL = 100
+# 동시 요청 수가 가득 찼을 때 다시 확인하는 간격 (초)
+SLOT_POLL_SECONDS = 0.01
+
 terminate_program = False
 
 
@@ -25,8 +82,13 @@ def prepare_apt_info(row):
     kapt_code = row['단지코드']
     apt_name = row['단지명']
 
+    # 스키마 로더는 날짜 타입(결측값은 NaT)으로, 이전 CSV 로더는 실수로 읽음
     approval_date = row['사용승인일']
-    if isinstance(approval_date, float):
+    if pd.isna(approval_date):
+        approval_date = None
+    elif isinstance(approval_date, pd.Timestamp):
+        approval_date = approval_date.strftime('%Y%m%d')
+    elif isinstance(approval_date, float):
         approval_date = str(int(approval_date))
 
     req_date = calculate_req_date(approval_date)
@@ -34,115 +96,717 @@ def prepare_apt_info(row):
     return kapt_code, apt_name, approval_date, req_date
 
 
-def get_target_months(kapt_code, apt_name, start_date, end_date):
-    monthly_dates = get_monthly_dates(start_date, end_date)
-
-    filename = f"{kapt_code}_{apt_name}_{start_date}_{end_date}.csv"
-    base_path = os.path.join(os.getcwd(), 'data')
-    output_path = os.path.join(base_path, OUTPUT_FOLDER, filename)
-
-    if os.path.exists(output_path):
-        collected_months = load_csv_data(filename, source_folder=OUTPUT_FOLDER)[
-            'requestMonth'].tolist()
-        collected_months = [str(month) for month in collected_months]
+def plan_collection(df, manifest, file_index, coverage=None):
+    """
+    매니페스트를 기준으로 단지별 수집 대상 월 계획
 
-        target_months = [
-            month for month in monthly_dates if month not in collected_months]
+    모든 단지의 요청 기간을 모아 매니페스트에서 한 번에 누락 월을 조회하므로
+    단지별 CSV를 다시 읽지 않습니다. 수집 월 색인이 있으면 색인의 비트맵으로 누락 월을 구합니다.
 
-        if not target_months:
-            print(f"[{apt_name}] 이미 모든 데이터 수집 완료")
-            return [], filename
+    Args:
+        df: 단지 기본정보 DataFrame
+        manifest: 매니페스트 연결
+        file_index: {단지 코드: 파일명} 색인
+        coverage: 매니페스트와 일치하는 수집 월 색인 (기본값: None, 매니페스트 조회)
 
-        return target_months, filename
+    Returns:
+        list: 수집 대상 단지 정보 딕셔너리 목록
+              (idx, kapt_code, apt_name, approval_date, filename, months)
+    """
+    complexes = []
+    targets = []
 
-    return monthly_dates, filename
+    for idx, row in zip(df.index, df[MASTER_COLUMNS].to_dict('records')):
+        kapt_code, apt_name, approval_date, req_date = prepare_apt_info(row)
 
+        if req_date is None:
+            print(f"[{apt_name}] 사용승인일이 유효하지 않거나 요청 날짜 계산 실패")
+            continue
 
-def fetch_energy_data(service_key, kapt_code, apt_name, monthly_dates):
+        start_date, end_date = req_date
+        targets.append((kapt_code, start_date, end_date))
+        complexes.append({
+            'idx': idx,
+            'kapt_code': kapt_code,
+            'apt_name': apt_name,
+            'approval_date': approval_date,
+            'filename': file_index.get(kapt_code) or energy_file_name(kapt_code, apt_name),
+        })
+
+    if coverage is not None:
+        missing = coverage.missing_months(targets)
+    else:
+        missing = get_missing_months(manifest, targets)
+
+    plan = []
+    for info in complexes:
+        info['months'] = missing.get(info['kapt_code'], [])
+        if info['months']:
+            plan.append(info)
+
+    print(f"수집 계획: {len(complexes)}개 단지 중 {len(plan)}개 단지, "
+          f"총 {sum(len(info['months']) for info in plan)}개월 요청 예정")
+
+    return plan
+
+
+def add_retry_requests(plan, df, file_index, retries):
+    """
+    재시도 시각이 된 요청을 수집 계획에 추가
+
+    Args:
+        plan: plan_collection 결과 (수집 대상 단지 정보 목록)
+        df: 단지 기본정보 DataFrame
+        file_index: {단지 코드: 파일명} 색인
+        retries: 재시도할 (단지 코드, 월) 목록
+
+    Returns:
+        list: 재시도 요청을 포함한 수집 계획
+    """
+    if not retries:
+        return plan
+
+    retry_months = {}
+    for kapt_code, month in retries:
+        retry_months.setdefault(kapt_code, []).append(month)
+
+    by_code = {info['kapt_code']: info for info in plan}
+    names = dict(zip(df['단지코드'], df['단지명']))
+    for kapt_code, months in retry_months.items():
+        info = by_code.get(kapt_code)
+        if info is None:
+            filename = file_index.get(kapt_code)
+            apt_name = names.get(kapt_code) or (decoding_file_name(filename)[1] if filename else kapt_code)
+            info = {
+                'idx': None,
+                'kapt_code': kapt_code,
+                'apt_name': apt_name,
+                'approval_date': None,
+                'filename': filename or energy_file_name(kapt_code, apt_name),
+                'months': [],
+            }
+            plan.append(info)
+            by_code[kapt_code] = info
+        info['months'] = sorted(set(info['months']) | set(months))
+
+    print(f"재시도 대기열에서 {len(retry_months)}개 단지, {len(retries)}건 요청 추가")
+    return plan
+
+
+def load_service_keys():
+    """
+    환경 변수에서 서비스 키 목록 로드
+
+    SERVICE_KEYS(쉼표로 구분)를 우선 사용하고, 없으면 SERVICE_KEY 하나를 사용합니다.
+
+    Returns:
+        list: 서비스 키 목록
+    """
+    service_keys = os.getenv("SERVICE_KEYS", "")
+    keys = [key.strip() for key in service_keys.split(',') if key.strip()]
+    if not keys and os.getenv("SERVICE_KEY"):
+        keys = [os.getenv("SERVICE_KEY")]
+    return keys
+
+
+def stop_for_quota():
+    """
+    사용 가능한 서비스 키가 없을 때 프로그램 종료 요청
+    """
     global terminate_program
-    all_results = []
 
-    for req_month in monthly_dates:
-        if terminate_program:
-            break
+    if not terminate_program:
+        print("모든 서비스 키의 일일 API 요청 한도를 초과했습니다. 프로그램을 종료합니다.")
+    terminate_program = True
+
 
-        print(f"[{req_month}] [{apt_name}] 요청 중...", end=' ')
-        response = fetch_apt_energy_info(service_key, kapt_code, req_month)
+def retire_key(key_pool, key):
+    """
+    일일 한도를 초과한 서비스 키를 오늘 사용 대상에서 제외
+    """
+    if key_pool.retire(key):
+        print(f"[{key.key_id}] 서비스 키 일일 요청 한도 초과 - "
+              f"남은 서비스 키 {len(key_pool.active_keys)}개")
+
+
+def record_failure(manifest, kapt_code, apt_name, req_month, category, error, result_code=None):
+    """
+    실패한 요청을 매니페스트에 실패로 기록하고 재시도 대기열에 예약
+
+    매니페스트의 실패 기록으로 요청하지 않은 월과 구분되고, 전체 계획에서는 다시 요청하지 않으며
+    재시도 대기열이 분류별 간격으로 다시 요청합니다. 한도 초과는 요청하지 못한 것이므로
+    매니페스트에 기록하지 않습니다.
+
+    Args:
+        category: 실패 분류 (TRANSIENT, EMPTY, QUOTA, MALFORMED)
+        error: 오류 내용
+        result_code: 매니페스트에 기록할 응답 코드 (기본값: None, 실패 분류)
+    """
+    if category != QUOTA:
+        record_months(manifest, kapt_code, [req_month], STATUS_FAILED, result_code or category)
+    next_attempt_at = enqueue_failure(manifest, kapt_code, req_month, category, str(error))
+    retry = (time.strftime('%m-%d %H:%M 재시도', time.localtime(next_attempt_at))
+             if next_attempt_at is not None else "재시도 중단")
+    print(f"[{req_month}] [{apt_name}] 요청 실패 ({error}, {category}, {retry})")
+    return None
+
+
+def handle_api_error(error, kapt_code, apt_name, req_month, manifest):
+    """
+    API 호출 실패 처리 (한도 초과 제외)
+
+    클라이언트의 재시도 후에도 남은 일시적 오류와 재시도할 수 없는 오류를 분류해 재시도 대기열에 기록합니다.
+    """
+    category = TRANSIENT if error.kind == RETRYABLE else MALFORMED
+    return record_failure(manifest, kapt_code, apt_name, req_month, category, error)
+
+
+def handle_energy_response(response, kapt_code, apt_name, req_month, manifest):
+    """
+    API 응답 처리
+
+    Returns:
+        dict: 수집된 월 데이터 또는 실패 시 None
+    """
+    try:
+        item, result_code = parse_energy_response(response, req_month)
+        if item:
+            print(f"[{req_month}] [{apt_name}] 요청 완료")
+            return item
+
+        message = f"응답 코드: {result_code}, 응답 메시지: {response['response']['header']['resultMsg']}"
+    except Exception as e:
+        return record_failure(manifest, kapt_code, apt_name, req_month, MALFORMED, f"데이터 처리 중 오류 발생: {e}")
+
+    return record_failure(manifest, kapt_code, apt_name, req_month, classify_result_code(result_code), message,
+                          result_code)
+
+
+def fetch_energy_month(key_pool, kapt_code, apt_name, req_month, manifest):
+    """
+    한 달치 에너지 사용량 요청
+
+    키 풀에서 요청할 키를 고르며, 키가 한도를 초과하면 다른 키로 다시 요청합니다.
+
+    Args:
+        key_pool: 서비스 키 풀
+        kapt_code: 단지 코드
+        apt_name: 단지명
+        req_month: 요청 월(YYYYMM)
+        manifest: 매니페스트 연결
+
+    Returns:
+        dict: 수집된 월 데이터 또는 실패 시 None
+    """
+    # 캐시된 응답은 서비스 키를 사용하지 않음
+    cached = get_cached_energy_info(kapt_code, req_month)
+    if cached is not None:
+        return handle_energy_response(cached, kapt_code, apt_name, req_month, manifest)
+
+    while True:
+        key = key_pool.acquire()
+        if key is None:
+            record_failure(manifest, kapt_code, apt_name, req_month, QUOTA, "사용 가능한 서비스 키 없음")
+            return stop_for_quota()
 
         try:
-            if response and (response['response']['header']['resultCode'] == '00' or
-                             response['response']['header']['resultCode'] == '1'):
-                item = {'requestMonth': req_month}
-                item.update(response['response']['body']['item'])
-                all_results.append(item)
-                print(f"요청 완료")
-            else:
-                print(f"요청 실패")
-                print(f"응답 코드: {response['response']['header']['resultCode']}")
-                print(f"응답 메시지: {response['response']['header']['resultMsg']}")
-                print(f"응답 내용: {response['response']['body']}")
-        except Exception as e:
-            if isinstance(response, str) and "LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR" in response and "returnReasonCode>22<" in response:
-                print("일일 API 요청 한도를 초과했습니다. 프로그램을 종료합니다.")
-                terminate_program = True
-                break
-            print(f"데이터 처리 중 오류 발생: {e}")
+            response = fetch_apt_energy_info(key.service_key, kapt_code, req_month,
+                                            on_retry=partial(key_pool.charge, key))
+        except EnergyApiError as e:
+            if e.kind == QUOTA_EXCEEDED:
+                retire_key(key_pool, key)
+                continue
+            return handle_api_error(e, kapt_code, apt_name, req_month, manifest)
+
+        return handle_energy_response(response, kapt_code, apt_name, req_month, manifest)
+
+
+async def acquire_request_slot(rate_controller):
+    """
+    속도 제어기의 동시 요청 수에 여유가 생길 때까지 기다린 뒤, 초당 요청 수에 맞춰 대기
+    """
+    while True:
+        wait = rate_controller.reserve()
+        if wait is not None:
             break
+        await asyncio.sleep(SLOT_POLL_SECONDS)
+    if wait > 0:
+        await asyncio.sleep(wait)
+
+
+async def fetch_energy_month_async(key_pool, kapt_code, apt_name, req_month, manifest, rate_controller=None):
+    """
+    한 달치 에너지 사용량을 비동기로 요청
+
+    블로킹 HTTP 호출은 스레드 풀에서 실행되므로 여러 요청이 동시에 진행됩니다.
+    매니페스트 기록은 이벤트 루프 스레드에서 처리됩니다.
+
+    Args:
+        key_pool: 서비스 키 풀
+        kapt_code: 단지 코드
+        apt_name: 단지명
+        req_month: 요청 월(YYYYMM)
+        manifest: 매니페스트 연결
+        rate_controller: 동시 요청 수와 초당 요청 수를 조절하는 속도 제어기 (기본값: None, 조절 없음)
+
+    Returns:
+        dict: 수집된 월 데이터 또는 실패 시 None
+    """
+    # 캐시된 응답은 서비스 키를 사용하지 않음
+    cached = await asyncio.to_thread(get_cached_energy_info, kapt_code, req_month)
+    if cached is not None:
+        return handle_energy_response(cached, kapt_code, apt_name, req_month, manifest)
+
+    if rate_controller is None:
+        return await request_energy_month_async(key_pool, kapt_code, apt_name, req_month, manifest)
+
+    await acquire_request_slot(rate_controller)
+    try:
+        return await request_energy_month_async(key_pool, kapt_code, apt_name, req_month, manifest)
+    finally:
+        rate_controller.release()
+
+
+async def request_energy_month_async(key_pool, kapt_code, apt_name, req_month, manifest):
+    """
+    서비스 키를 골라 한 달치 에너지 사용량 API를 비동기로 호출 (키가 한도를 초과하면 다른 키로 다시 요청)
+    """
+    while True:
+        key, wait = key_pool.reserve()
+        if key is None:
+            record_failure(manifest, kapt_code, apt_name, req_month, QUOTA, "사용 가능한 서비스 키 없음")
+            return stop_for_quota()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        try:
+            response = await asyncio.to_thread(
+                fetch_apt_energy_info, key.service_key, kapt_code, req_month,
+                on_retry=partial(key_pool.charge, key))
+        except EnergyApiError as e:
+            if e.kind == QUOTA_EXCEEDED:
+                retire_key(key_pool, key)
+                continue
+            return handle_api_error(e, kapt_code, apt_name, req_month, manifest)
+
+        return handle_energy_response(response, kapt_code, apt_name, req_month, manifest)
+
+
+def save_collected_results(manifest, apt_name, kapt_code, filename, results):
+    """
+    수집된 월 데이터를 요청 월 순서로 정렬하여 CSV에 저장하고 매니페스트에 기록
+
+    CSV를 디스크에 기록한 뒤 매니페스트에 반영하므로, 매니페스트에 완료로 기록된 월은
+    항상 CSV에 존재합니다.
+
+    Args:
+        manifest: 매니페스트 연결
+        apt_name: 단지명
+        kapt_code: 단지 코드
+        filename: 저장할 파일명
+        results: 수집된 월 데이터 목록
+    """
+    if not results:
+        return
 
-    return all_results
+    # 누적 통계가 이미 파일과 어긋나 있으면 다음 실행의 sync_trend_stats가 다시 계산하도록 기록하지 않음
+    trend_synced = is_trend_synced(manifest, filename, source_folder=OUTPUT_FOLDER)
+
+    results.sort(key=lambda item: item['requestMonth'])
+    filepath = save_energy_data_to_csv(results, filename, output_folder=OUTPUT_FOLDER)
+    fsync_file(filepath)
+    record_months(manifest, kapt_code,
+                  [item['requestMonth'] for item in results], STATUS_DONE)
+    resolve_retries(manifest, kapt_code, [item['requestMonth'] for item in results])
+    mark_file_synced(manifest, filename, source_folder=OUTPUT_FOLDER)
+    update_trend_stats(manifest, kapt_code, results)
+    if trend_synced:
+        mark_trend_synced(manifest, filename, source_folder=OUTPUT_FOLDER)
+    print(f"[{apt_name}] {len(results)}개월 데이터 저장")
+
+
+def recover_journals(manifest, filenames):
+    """
+    비정상 종료로 남은 저널을 CSV와 매니페스트에 반영
+
+    CSV에 이미 있는 월은 제외하고, 쓰기 도중 끊긴 CSV 마지막 줄은 제거한 뒤
+    저널의 나머지 결과를 이어서 저장합니다.
+
+    저널을 읽고 CSV에 이어 쓰는 동안 다른 작업자가 같은 파일을 쓰지 않도록, 호출하는 쪽이
+    해당 단지를 claim_complexes로 임대하고 있어야 합니다. 이 작업자가 임대하지 않은 단지의
+    저널은 건너뜁니다.
+
+    Args:
+        manifest: 매니페스트 연결
+        filenames: 복구할 에너지 데이터 파일명 목록 (이 작업자가 임대한 단지의 파일)
+
+    Returns:
+        int: 복구한 월 수
+    """
+    held = get_own_leases(manifest, WORKER_ID, [filename.split('_', 1)[0] for filename in filenames])
+
+    recovered = 0
+    for filename in filenames:
+        if filename.split('_', 1)[0] not in held:
+            print(f"[{filename}] 임대하지 않은 단지의 저널은 복구하지 않습니다.")
+            continue
 
+        items = read_journal(filename)
+        if not items:
+            remove_journal(filename)
+            continue
 
-def process_apartments(df, service_key):
-    for idx, row in df.iterrows():
+        kapt_code = filename.split('_', 1)[0]
+        filepath = os.path.join(os.getcwd(), 'data', OUTPUT_FOLDER, filename)
+        if repair_csv_tail(filepath):
+            print(f"[{filename}] 끊긴 마지막 줄 제거")
+
+        collected = set()
+        if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
+            collected = set(load_csv_data(filename, source_folder=OUTPUT_FOLDER,
+                                          columns=['requestMonth'])['requestMonth'].astype(str))
+
+        # 저널 결과 중 이미 CSV에 있는 월은 매니페스트만 맞춤
+        record_months(manifest, kapt_code,
+                      [item['requestMonth'] for item in items if item['requestMonth'] in collected],
+                      STATUS_DONE)
+        items = list({item['requestMonth']: item for item in items
+                      if item['requestMonth'] not in collected}.values())
+        save_collected_results(manifest, kapt_code, kapt_code, filename, items)
+        remove_journal(filename)
+        recovered += len(items)
+
+    return recovered
+
+
+class CollectionProgress:
+    """
+    요청 목록의 단지별 진행 상황과 수집 결과 관리
+
+    수집된 월 데이터는 즉시 단지별 저널에 한 줄씩 기록되고, FLUSH_RECORDS건 또는
+    FLUSH_SECONDS초마다 저널을 디스크에 기록한 뒤 CSV와 매니페스트에 반영합니다.
+    비정상 종료되더라도 저널에 남은 결과는 다음 실행에서 recover_journals로 복구됩니다.
+    """
+
+    def __init__(self, requests, complexes, manifest, heartbeat=None, heartbeat_interval=60,
+                 rate_controller=None):
+        self.complexes = complexes
+        self.rate_controller = rate_controller
+        self.manifest = manifest
+        self.heartbeat = heartbeat
+        self.heartbeat_interval = heartbeat_interval
+        self.last_heartbeat = time.monotonic()
+        self.remaining = {}
+        for kapt_code, _ in requests:
+            self.remaining[kapt_code] = self.remaining.get(kapt_code, 0) + 1
+        self.pending = {}
+        self.pending_count = 0
+        self.last_flush = time.monotonic()
+        self.journal = JournalWriter()
+        self.requests = 0
+        self.started = time.monotonic()
+
+    def complete(self, kapt_code, item, requested=True):
+        if item:
+            self.journal.write(self.complexes[kapt_code]['filename'], item)
+            self.pending.setdefault(kapt_code, []).append(item)
+            self.pending_count += 1
+
+        if requested:
+            self.requests += 1
+            if self.requests % PROGRESS_INTERVAL == 0:
+                elapsed = time.monotonic() - self.started
+                rate_status = f" ({self.rate_controller.status()})" if self.rate_controller else ""
+                print(f"진행 상황: {self.requests}건 요청, "
+                      f"{self.requests / elapsed:.1f} req/s{rate_status}")
+
+        if self.heartbeat and time.monotonic() - self.last_heartbeat >= self.heartbeat_interval:
+            self.heartbeat()
+            self.last_heartbeat = time.monotonic()
+
+        self.remaining[kapt_code] -= 1
+        if self.remaining[kapt_code] == 0:
+            self.flush(kapt_code)
+
+        if (self.pending_count >= FLUSH_RECORDS or
+                time.monotonic() - self.last_flush >= FLUSH_SECONDS):
+            self.flush_all()
+
+    def flush(self, kapt_code):
+        results = self.pending.pop(kapt_code, [])
+        if not results:
+            return
+
+        info = self.complexes[kapt_code]
+        self.journal.sync()
+        save_collected_results(self.manifest, info['apt_name'], kapt_code,
+                               info['filename'], results)
+        self.journal.remove(info['filename'])
+        self.pending_count -= len(results)
+
+    def flush_all(self):
+        self.journal.sync()
+        for kapt_code in list(self.pending):
+            self.flush(kapt_code)
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        self.flush_all()
+        self.journal.close()
+
+
+def process_apartments(requests, complexes, key_pool, manifest, heartbeat=None):
+    """
+    요청 목록을 순서대로 수집
+
+    Args:
+        requests: (단지 코드, 월) 요청 목록
+        complexes: {단지 코드: 단지 정보}
+        key_pool: 서비스 키 풀
+        manifest: 매니페스트 연결
+        heartbeat: 주기적으로 호출할 함수 (단지 임대 연장용)
+    """
+    progress = CollectionProgress(requests, complexes, manifest,
+                                  heartbeat, LEASE_SECONDS / 3)
+
+    for kapt_code, req_month in requests:
         if terminate_program:
             break
 
-        kapt_code, apt_name, approval_date, req_date = prepare_apt_info(row)
+        item = fetch_energy_month(
+            key_pool, kapt_code, complexes[kapt_code]['apt_name'], req_month, manifest)
+        progress.complete(kapt_code, item)
+
+    # 종료 요청으로 중단된 단지의 부분 결과 저장
+    progress.close()
+
+
+async def process_apartments_async(requests, complexes, key_pool, manifest, concurrency,
+                                   heartbeat=None, rate_controller=None):
+    """
+    요청 목록을 제한된 동시성으로 비동기 수집
+
+    (단지, 월) 요청을 큐에 넣고 concurrency개의 워커가 동시에 처리합니다.
+    단지의 모든 월 요청이 끝나면 결과를 CSV로 저장하며, 종료 요청이나
+    일일 요청 한도 초과 시에는 새 요청을 멈추고 수집된 결과까지만 저장합니다.
+
+    Args:
+        requests: (단지 코드, 월) 요청 목록
+        complexes: {단지 코드: 단지 정보}
+        key_pool: 서비스 키 풀
+        manifest: 매니페스트 연결
+        concurrency: 동시에 진행할 최대 요청 수
+        heartbeat: 주기적으로 호출할 함수 (단지 임대 연장용)
+        rate_controller: 동시 요청 수(concurrency 이하)와 초당 요청 수를 조절하는 속도 제어기
+    """
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    progress = CollectionProgress(requests, complexes, manifest,
+                                  heartbeat, LEASE_SECONDS / 3, rate_controller)
+
+    # 기본 스레드 풀은 CPU 수 + 4개로 제한되므로 동시 요청 수만큼 스레드를 둠
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+
+    async def produce():
+        for request in requests:
+            if terminate_program:
+                break
+            await queue.put(request)
 
-        if req_date is None:
-            print(f"[{apt_name}] 사용승인일이 유효하지 않거나 요청 날짜 계산 실패")
-            continue
+        for _ in range(concurrency):
+            await queue.put(None)
 
-        start_date, end_date = req_date
-        monthly_dates, filename = get_target_months(
-            kapt_code, apt_name, start_date, end_date)
+    async def work():
+        while True:
+            request = await queue.get()
+            if request is None:
+                break
 
-        if not monthly_dates:
-            continue
+            kapt_code, req_month = request
+            if terminate_program:
+                progress.complete(kapt_code, None, requested=False)
+                continue
+
+            item = await fetch_energy_month_async(
+                key_pool, kapt_code, complexes[kapt_code]['apt_name'], req_month, manifest, rate_controller)
+            progress.complete(kapt_code, item)
+
+    await asyncio.gather(produce(), *(work() for _ in range(concurrency)))
+
+    # 종료 요청으로 중단된 단지의 부분 결과 저장
+    progress.close()
 
-        print("\n" + "="*50)
-        print(f"[{idx+1}/{len(df)}] API 호출 준비 정보")
-        print("-"*50)
-        print(f"- 단지 코드: {kapt_code}")
-        print(f"- 단지명: {apt_name}")
-        print(f"- 사용승인일: {approval_date}")
-        print("="*50 + "\n")
 
-        all_results = fetch_energy_data(
-            service_key, kapt_code, apt_name, monthly_dates)
+def run_worker(requests, complexes, key_pool, manifest, rate_controller=None):
+    """
+    단지를 임대하며 요청 목록을 처리
 
-        if all_results:
-            save_energy_data_to_csv(all_results, filename,
-                                    output_folder=OUTPUT_FOLDER)
-            print(f"[{apt_name}] 총 {len(all_results)}개월 데이터 수집 완료")
+    요청 목록의 우선순위 순서대로 다른 작업자가 임대하지 않은 단지를 LEASE_BATCH개씩
+    임대하고, 임대한 단지의 요청만 처리합니다. 단지의 CSV는 임대한 작업자만 쓰므로
+    여러 작업자가 같은 data 폴더를 함께 사용할 수 있으며, 비정상 종료된 작업자의
+    단지는 임대가 만료되면 다른 작업자가 이어서 수집합니다.
 
-        # break
+    Args:
+        requests: 오늘 처리할 (단지 코드, 월) 요청 목록
+        complexes: {단지 코드: 단지 정보}
+        key_pool: 서비스 키 풀
+        manifest: 매니페스트 연결
+        rate_controller: 비동기 수집의 속도 제어기 (기본값: None, 고정 동시 요청 수)
+    """
+    candidates = list(dict.fromkeys(kapt_code for kapt_code, _ in requests))
+
+    while candidates and not terminate_program:
+        batch = claim_complexes(manifest, WORKER_ID, candidates, LEASE_BATCH, LEASE_SECONDS)
+        if not batch:
+            print("다른 작업자가 남은 단지를 모두 수집 중입니다.")
+            break
+
+        batch_set = set(batch)
+        candidates = [kapt_code for kapt_code in candidates if kapt_code not in batch_set]
+
+        try:
+            # 이전 작업자가 남긴 저널을 먼저 반영 (임대한 뒤의 저널 목록 기준)
+            journals = set(list_journals())
+            recover_journals(manifest, [complexes[kapt_code]['filename'] for kapt_code in batch
+                                        if complexes[kapt_code]['filename'] in journals])
+
+            # 임대 전에 다른 작업자가 수집한 월은 제외 (실패로 기록된 월은 재시도 요청일 수 있으므로 유지)
+            batch_months = {}
+            for kapt_code, month in requests:
+                if kapt_code in batch_set:
+                    batch_months.setdefault(kapt_code, []).append(month)
+            missing = get_missing_months(manifest, [
+                (kapt_code, min(months), max(months)) for kapt_code, months in batch_months.items()],
+                include_failed=True)
+            missing = {kapt_code: set(months) for kapt_code, months in missing.items()}
+            batch_requests = [(kapt_code, month) for kapt_code, month in requests
+                              if month in missing.get(kapt_code, ())]
+            if not batch_requests:
+                continue
+
+            print(f"[{WORKER_ID}] {len(batch)}개 단지 임대, {len(batch_requests)}건 요청 시작")
+
+            def heartbeat():
+                renew_leases(manifest, WORKER_ID, batch, LEASE_SECONDS)
+
+            if CONCURRENCY > 1:
+                asyncio.run(process_apartments_async(
+                    batch_requests, complexes, key_pool, manifest, CONCURRENCY, heartbeat, rate_controller))
+            else:
+                process_apartments(batch_requests, complexes, key_pool, manifest, heartbeat)
+        finally:
+            release_leases(manifest, WORKER_ID, batch)
 
 
 def main():
     print("프로그램 실행 중... (Ctrl+C를 누르면 프로그램이 종료됩니다)")
 
-    # CSV 데이터 로드
-    df = load_csv_data(CSV_FILENAME)
+    # 단지 기본정보 로드 (변환 결과 캐시 사용)
+    df = load_master_data(CSV_FILENAME, columns=MASTER_COLUMNS)
+
+    # 스냅샷 갱신 시에는 바뀐 단지만 수집 계획에 포함
+    if MASTER_BASE_SNAPSHOT:
+        diff = load_snapshot_diff(MASTER_BASE_SNAPSHOT, CSV_FILENAME)
+        print_diff_summary(diff, MASTER_BASE_SNAPSHOT, CSV_FILENAME)
+        df = df[df['단지코드'].isin(affected_codes(diff, columns=MASTER_COLUMNS))]
+        print(f"스냅샷 비교 결과 {len(df)}개 단지만 수집 계획에 포함")
 
     # 환경 변수에서 서비스 키 로드
-    service_key = os.getenv("SERVICE_KEY")
-    if not service_key:
-        print("SERVICE_KEY 환경 변수가 설정되지 않았습니다.")
+    service_keys = load_service_keys()
+    if not service_keys and not DRY_RUN:
+        print("SERVICE_KEYS 또는 SERVICE_KEY 환경 변수가 설정되지 않았습니다.")
+        return
+
+    # 비동기 수집은 응답 지연과 오류에 따라 동시 요청 수와 초당 요청 수를 조절
+    rate_controller = None
+    if CONCURRENCY > 1 and ADAPTIVE_RATE:
+        rate_controller = AimdRateController(CONCURRENCY, max_rate=MAX_REQUEST_RATE)
+
+    # 동시 요청 수만큼 연결을 유지하는 API 클라이언트 설정
+    configure_default_client(base_url=API_BASE_URL, pool_size=max(CONCURRENCY, 1),
+                             observer=rate_controller.observe if rate_controller else None)
+    if RESPONSE_CACHE:
+        configure_response_cache(RawResponseCache())
+
+    # 매니페스트 갱신 후 수집 계획 수립
+    manifest = open_manifest()
+    ensure_work_queue(manifest)
+    ensure_trend_stats(manifest)
+    ensure_retry_queue(manifest)
+
+    # 남은 저널은 단지를 임대한 뒤에만 복구 (다른 작업자가 임대해 쓰고 있는 저널은 임대되지 않아 제외)
+    orphaned = {filename.split('_', 1)[0]: filename for filename in list_journals()}
+    if orphaned:
+        claimed = claim_complexes(manifest, WORKER_ID, list(orphaned), len(orphaned), LEASE_SECONDS)
+        try:
+            recovered = recover_journals(manifest, [orphaned[kapt_code] for kapt_code in claimed])
+        finally:
+            release_leases(manifest, WORKER_ID, claimed)
+        if recovered:
+            print(f"저널에서 {recovered}개월 데이터 복구")
+
+    # 다른 작업자가 쓰고 있는 파일은 매니페스트 반영에서 제외
+    leased = get_leased_complexes(manifest, WORKER_ID)
+
+    file_index = index_energy_files(OUTPUT_FOLDER)
+    synced_count = sync_energy_files(
+        manifest, {kapt_code: filename for kapt_code, filename in file_index.items()
+                   if kapt_code not in leased},
+        source_folder=OUTPUT_FOLDER)
+    if synced_count:
+        print(f"매니페스트에 {synced_count}개 파일 반영")
+    trend_count = sync_trend_stats(
+        manifest, {kapt_code: filename for kapt_code, filename in file_index.items()
+                   if kapt_code not in leased},
+        source_folder=OUTPUT_FOLDER)
+    if trend_count:
+        print(f"추세 통계에 {trend_count}개월 데이터 반영")
+    if RETRY_ONLY:
+        print("재시도 대기열의 요청만 처리합니다.")
+        plan = []
+    else:
+        coverage = sync_coverage_index(manifest)
+        plan = plan_collection(df, manifest, file_index, coverage)
+
+    # 재시도 시각이 된 실패 요청 추가
+    print_retry_summary(manifest)
+    plan = add_retry_requests(plan, df, file_index, get_due_retries(manifest))
+
+    # 서비스 키별 오늘 사용량을 반영한 키 풀 구성
+    usage = {make_key_id(key): get_quota_usage(manifest, key_id=make_key_id(key))
+             for key in service_keys}
+    # 같은 키를 쓰는 다른 작업자와 함께 한도를 지키도록 요청 수는 매니페스트에서 확보한 만큼만 사용
+    key_pool = ServiceKeyPool(
+        service_keys, DAILY_REQUEST_LIMIT, rate_per_second=KEY_RATE_LIMIT, usage=usage,
+        claim_quota=lambda key_id, count: reserve_quota(manifest, key_id, count, DAILY_REQUEST_LIMIT),
+        settle_quota=lambda key_id, unused: add_quota_usage(manifest, -unused, key_id=key_id),
+        reserve_batch=QUOTA_RESERVE_BATCH)
+    print(f"서비스 키 {len(key_pool)}개 사용 (오늘 남은 요청 수: {key_pool.remaining})")
+
+    # 일일 요청 한도에 맞춘 요청 일정 수립 (키 없이 일정만 확인하는 경우 키 1개 기준)
+    daily_budget = DAILY_REQUEST_LIMIT * max(len(key_pool), 1)
+    first_day_budget = key_pool.remaining if len(key_pool) else daily_budget
+    schedule = build_request_schedule(
+        {info['kapt_code']: info['months'] for info in plan},
+        daily_budget, SCHEDULE_STRATEGY, first_day_budget=first_day_budget)
+    print_schedule_summary(schedule, daily_budget, first_day_budget)
+
+    if DRY_RUN or not schedule or not schedule[0]:
+        manifest.close()
+        print("프로그램이 종료되었습니다.")
         return
 
-    # 아파트 정보 처리
-    process_apartments(df, service_key)
+    complexes = {info['kapt_code']: info for info in plan}
+
+    # 오늘 일정의 요청 처리
+    if rate_controller:
+        print(f"비동기 수집 모드 (동시 요청 수 자동 조절, 최대 {CONCURRENCY})")
+    elif CONCURRENCY > 1:
+        print(f"비동기 수집 모드 (동시 요청 수: {CONCURRENCY})")
+    try:
+        run_worker(schedule[0], complexes, key_pool, manifest, rate_controller)
+    finally:
+        key_pool.settle()
+        manifest.close()
 
     print("프로그램이 종료되었습니다.")
 
@@ -0,0 +1,72 @@
+import os
+import time
+
+import pandas as pd
+
+from utils.data_utils import decoding_file_name, index_energy_files, load_csv_data
+from utils.energy_cube import build_energy_cube
+from utils.energy_store import load_energy_store, store_file_sizes, to_store_frame, write_energy_store
+
+# 상수 정의
+SOURCE_FOLDER = 'energy'
+
+
+def load_energy_csv_files(file_index):
+    """
+    단지별 에너지 데이터 CSV를 읽어 저장소 스키마의 DataFrame 하나로 병합
+
+    Args:
+        file_index (dict): {단지 코드: 파일명}
+
+    Returns:
+        pandas.DataFrame: 저장소 스키마의 DataFrame
+    """
+    frames = []
+    for idx, (kapt_code, filename) in enumerate(sorted(file_index.items())):
+        _, apt_name = decoding_file_name(filename)
+        try:
+            df = load_csv_data(filename, source_folder=SOURCE_FOLDER)
+        except IOError as e:
+            print(f"[{filename}] 파일을 읽지 못해 건너뜁니다: {e}")
+            continue
+        if df.empty:
+            continue
+        frames.append(to_store_frame(df, kapt_code, apt_name or kapt_code))
+
+        if (idx + 1) % 500 == 0:
+            print(f"  {idx+1}/{len(file_index)}개 파일 읽음")
+
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def main():
+    print("에너지 데이터 CSV를 Parquet 저장소와 에너지 큐브로 변환 시작...")
+    start = time.monotonic()
+
+    file_index = index_energy_files(SOURCE_FOLDER)
+    if not file_index:
+        print("변환할 에너지 데이터 파일이 없습니다.")
+        return
+
+    df = load_energy_csv_files(file_index)
+    if df.empty:
+        print("변환할 에너지 데이터가 없습니다.")
+        return
+
+    rows = write_energy_store(df)
+    count, size = store_file_sizes()
+    print(f"{len(file_index)}개 CSV 파일, {rows}행을 {count}개 Parquet 파일({size / 1024 / 1024:.1f}MB)로 저장했습니다. "
+          f"({time.monotonic() - start:.1f}초)")
+
+    # 단지 간 비교용 [단지 × 월 × 에너지 유형] 배열
+    shape = build_energy_cube(df)
+    print(f"에너지 큐브 저장: {shape[0]}개 단지 × {shape[1]}개월 × {shape[2]}개 에너지 유형")
+
+    # 저장 결과 확인: 전체 단지의 전기 사용량만 읽기
+    start = time.monotonic()
+    elect = load_energy_store(columns=['elect'])
+    print(f"확인: 전체 단지 전기 사용량 {len(elect)}행 읽기 {time.monotonic() - start:.2f}초")
+
+
+if __name__ == "__main__":
+    main()
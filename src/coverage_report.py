@@ -0,0 +1,59 @@
+import os
+import time
+
+from utils.coverage_index import request_window_ordinals, sync_coverage_index
+from utils.manifest import open_manifest
+from utils.master_data import load_master_data
+
+# 상수 정의
+CSV_FILENAME = '20250328_단지_기본정보_수도권.csv'
+OUTPUT_FOLDER = 'processed'
+REPORT_FILENAME = 'coverage_report.csv'
+# 누락 구간 시작 월별로 출력할 개수
+TOP_MONTHS = 5
+
+
+def main():
+    print("단지별 에너지 데이터 수집 현황 집계 시작...")
+    start = time.monotonic()
+
+    df = load_master_data(CSV_FILENAME, columns=['단지코드', '단지명', '사용승인일'])
+    starts, ends = request_window_ordinals(df['사용승인일'])
+    valid = starts >= 0
+    if (~valid).any():
+        print(f"사용승인일이 없는 {int((~valid).sum())}개 단지는 제외합니다.")
+    df = df[valid].reset_index(drop=True)
+
+    manifest = open_manifest()
+    try:
+        coverage = sync_coverage_index(manifest)
+    finally:
+        manifest.close()
+    print(f"수집 월 색인: {len(coverage)}개 단지, {coverage.width}개월 "
+          f"({coverage.packed_bytes() / 1024:.0f}KB)")
+
+    report = coverage.summary(df['단지코드'].tolist(), starts[valid], ends[valid])
+    report.insert(1, 'kaptName', df['단지명'].to_numpy())
+
+    complete = int((report['missing'] == 0).sum())
+    empty = int((report['collected'] == 0).sum())
+    print(f"\n전체 {len(report)}개 단지: 수집 완료 {complete}개, 일부 수집 {len(report) - complete - empty}개, "
+          f"미수집 {empty}개")
+    print(f"요청 기간 {int(report['requested'].sum())}개월 중 {int(report['collected'].sum())}개월 수집 "
+          f"({report['collected'].sum() / max(report['requested'].sum(), 1):.1%}), "
+          f"실패 기록 {int(report['failed'].sum())}개월")
+
+    # 마지막 수집 이후 계속 비어 있는 단지를 누락 시작 월별로 집계
+    since = report['missing_since'].dropna().astype(int).value_counts().sort_index(ascending=False)
+    if len(since):
+        print("\n누락 구간 시작 월별 단지 수 (최근 순):")
+        for month, count in since.head(TOP_MONTHS).items():
+            print(f"  - {month}부터: {count}개 단지")
+
+    output_path = os.path.join(os.getcwd(), 'data', OUTPUT_FOLDER, REPORT_FILENAME)
+    report.to_csv(output_path, index=False, encoding='utf-8-sig')
+    print(f"\n수집 현황이 저장되었습니다: {output_path} ({time.monotonic() - start:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
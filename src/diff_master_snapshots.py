@@ -0,0 +1,34 @@
+import os
+import unicodedata
+
+from dotenv import load_dotenv
+
+from utils.master_diff import load_snapshot_diff, print_diff_summary
+
+# 상수 정의
+CSV_FILENAME = '20250328_단지_기본정보_수도권.csv'
+OUTPUT_FOLDER = 'processed'
+
+load_dotenv()
+
+# 비교할 이전 단지 기본정보 스냅샷 (예: 20241231_단지_기본정보_수도권.csv)
+MASTER_BASE_SNAPSHOT = os.getenv("MASTER_BASE_SNAPSHOT")
+
+
+def main():
+    if not MASTER_BASE_SNAPSHOT:
+        print("MASTER_BASE_SNAPSHOT 환경 변수에 비교할 이전 스냅샷 파일명을 설정해 주세요.")
+        return
+
+    diff = load_snapshot_diff(MASTER_BASE_SNAPSHOT, CSV_FILENAME)
+    print_diff_summary(diff, MASTER_BASE_SNAPSHOT, CSV_FILENAME)
+
+    # 바뀐 단지 목록 저장 (예: 20250328_단지_기본정보_수도권_변경단지.csv)
+    stem = os.path.splitext(unicodedata.normalize('NFC', CSV_FILENAME))[0]
+    output_path = os.path.join(os.getcwd(), 'data', OUTPUT_FOLDER, stem + '_변경단지.csv')
+    diff.to_csv(output_path, index=False, encoding='utf-8-sig')
+    print(f"바뀐 단지 {len(diff)}개 목록이 저장되었습니다: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
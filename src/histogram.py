@@ -3,15 +3,15 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
 
-from utils.data_utils import decoding_file_name, get_csv_files, load_csv_data
+from utils.analysis_store import analysis_store_exists, load_analysis_results
+from utils.data_utils import decoding_file_name, get_csv_files
+from utils.schema import ANALYSIS_RESULT_DTYPES, ENERGY_COLUMNS, memory_mb
 
 
-ENERGY_COLUMNS = [
-    'heat', 'hheat', 'waterHot', 'hwaterHot', 'gas',
-    'hgas', 'elect', 'helect', 'waterCool', 'hwaterCool'
-]
-
 ENERGY_NAME_MAPPING = {
     'heat': '난방 사용량',
     'hheat': '난방 사용량',
@@ -25,52 +25,121 @@ ENERGY_NAME_MAPPING = {
     'hwaterCool': '수도 사용량'
 }
 
+# 시각화에 사용하는 병합 데이터 컬럼
+VISUALIZATION_COLUMNS = ['month', 'energy_type', 'correlation']
+# 분석 결과 파일 컬럼 타입
+ANALYSIS_COLUMN_TYPES = {
+    'month': pa.int64(),
+    'energy_type': pa.string(),
+    'energy_name': pa.string(),
+    'correlation': pa.float64(),
+    'slope': pa.float64(),
+    'initial_value': pa.float64(),
+    'annual_growth_rate': pa.float64(),
+    'trend': pa.string(),
+    'data_points': pa.int64(),
+}
+
 
 def merge_filtered_energy_data(analysis_files: list, output_folder: str):
     """
     분석 파일을 읽고 data_points 값이 5개 이상인 데이터만 병합하여 시각화 준비
 
+    파일을 하나씩 Arrow 테이블로 읽어 조건에 맞는 행만 결과 파일에 이어 쓰므로, 병합 시간은
+    파일 수에 비례하고 메모리에는 파일 하나 분량만 올라갑니다. 결과 파일은 임시 파일에 먼저 쓴 뒤 교체합니다.
+
     Args:
         analysis_files: 분석 결과 파일 목록
-        output_folder: 시각화 결과 저장 폴더
+        output_folder: 병합 결과 저장 폴더
 
     Returns:
-        통합된 데이터프레임
+        병합된 데이터 파일 경로 (조건에 맞는 데이터가 없으면 None)
     """
+    analysis_folder = os.path.join(os.getcwd(), 'data', 'analysis')
+    output_path = os.path.join(output_folder, 'merged_filtered_energy_data.csv')
+    temp_path = output_path + '.tmp'
+
+    # 파일마다 타입을 추론하지 않도록 분석 결과 컬럼 타입 고정
+    convert_options = pv.ConvertOptions(column_types=ANALYSIS_COLUMN_TYPES)
+    writer = None
+
     try:
-        all_data = pd.DataFrame()
+        total_rows = 0
 
-        for file in analysis_files:
+        for file in sorted(analysis_files):
             kapt_code, complex_name = decoding_file_name(file)
 
-            df = load_csv_data(file, source_folder='analysis')
+            table = pv.read_csv(os.path.join(analysis_folder, file), convert_options=convert_options)
 
             # data_points 컬럼 값이 5 이상인 데이터만 필터링
-            filtered_df = df[df['data_points'] >= 5].copy()  # 명시적으로 복사본 생성
+            table = table.filter(pc.greater_equal(table['data_points'], 5))
+            if table.num_rows == 0:
+                continue
+
+            table = table.append_column('kapt_code', pa.array([kapt_code] * table.num_rows, pa.string()))
+            table = table.append_column('complex_name', pa.array([complex_name] * table.num_rows, pa.string()))
 
-            if not filtered_df.empty:
-                # kapt_code 컬럼 추가 (loc를 사용하여 안전하게 값 설정)
-                filtered_df.loc[:, 'kapt_code'] = kapt_code
-                filtered_df.loc[:, 'complex_name'] = complex_name
+            if writer is None:
+                writer = pv.CSVWriter(temp_path, table.schema)
+            writer.write_table(table)
+            total_rows += table.num_rows
 
-                # 통합 데이터프레임에 추가
-                all_data = pd.concat(
-                    [all_data, filtered_df], ignore_index=True)
+        if writer is not None:
+            writer.close()
+            writer = None
 
         print(
-            f"총 {len(all_data)} 행, data_points가 5 이상인 데이터만 병합했습니다.")
+            f"총 {total_rows} 행, data_points가 5 이상인 데이터만 병합했습니다.")
+
+        if total_rows == 0:
+            return None
+
+        os.replace(temp_path, output_path)
+        print(f"병합된 데이터 저장 완료: {output_path}")
+        return output_path
+
+    except Exception as e:
+        print(f"데이터 병합 중 오류 발생: {e}")
+        if writer is not None:
+            writer.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return None
+
 
-        if not all_data.empty:
-            output_path = os.path.join(
-                output_folder, 'merged_filtered_energy_data.csv')
-            all_data.to_csv(output_path, index=False)
-            print(f"병합된 데이터 저장 완료: {output_path}")
+def merge_filtered_analysis_store(output_folder: str):
+    """
+    분석 결과 저장소에서 data_points 값이 5개 이상인 데이터를 한 번에 읽어 병합 파일로 저장
 
-        return all_data
+    Args:
+        output_folder: 병합 결과 저장 폴더
+
+    Returns:
+        병합된 데이터 파일 경로 (조건에 맞는 데이터가 없으면 None)
+    """
+    output_path = os.path.join(output_folder, 'merged_filtered_energy_data.csv')
+    temp_path = output_path + '.tmp'
+
+    try:
+        merged = load_analysis_results(min_data_points=5)
+        print(f"총 {len(merged)} 행, data_points가 5 이상인 데이터만 병합했습니다.")
+        if merged.empty:
+            return None
+
+        # 파일별 병합 결과와 같은 컬럼 구성
+        merged = merged.rename(columns={'kaptCode': 'kapt_code', 'kaptName': 'complex_name'})
+        merged = merged[[column for column in merged.columns if column not in ('kapt_code', 'complex_name')] +
+                        ['kapt_code', 'complex_name']]
+        merged.to_csv(temp_path, index=False)
+        os.replace(temp_path, output_path)
+        print(f"병합된 데이터 저장 완료: {output_path}")
+        return output_path
 
     except Exception as e:
         print(f"데이터 병합 중 오류 발생: {e}")
-        return pd.DataFrame()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return None
 
 
 def group_data_by_energy_type_and_month(data: pd.DataFrame):
@@ -86,11 +155,11 @@ def group_data_by_energy_type_and_month(data: pd.DataFrame):
     grouped_data = {}
 
     # energy_type으로 첫 번째 그룹화
-    for energy_type, energy_df in data.groupby('energy_type'):
+    for energy_type, energy_df in data.groupby('energy_type', observed=True):
         grouped_data[energy_type] = {}
 
         # 각 energy_type 내에서 month로 두 번째 그룹화
-        for month, month_df in energy_df.groupby('month'):
+        for month, month_df in energy_df.groupby('month', observed=True):
             grouped_data[energy_type][month] = month_df
 
     return grouped_data
@@ -216,10 +285,7 @@ def visualize_correlation_by_energy_and_month(grouped_data: dict, output_folder)
 def main():
     print("에너지 사용량 분석 결과 시각화 시작...")
 
-    # 분석 결과와 시각화 결과 폴더 경로
-    analysis_folder = os.path.join(os.getcwd(), 'data', 'analysis')
-    analysis_files = get_csv_files(analysis_folder)
-
+    # 시각화 결과 폴더 경로
     visualization_folder = os.path.join(os.getcwd(), 'data', 'visualization')
     os.makedirs(visualization_folder, exist_ok=True)
 
@@ -228,11 +294,20 @@ def main():
     os.makedirs(merged_folder, exist_ok=True)
 
     # 데이터 포인트가 5개 이상인 분석 결과만 병합
-    merged_data = merge_filtered_energy_data(analysis_files, merged_folder)
+    # 분석 결과 저장소가 있으면 한 번에 읽고, 없으면 단지별 분석 결과 파일을 읽음
+    if analysis_store_exists():
+        print("분석 결과 저장소에서 데이터를 읽습니다.")
+        merged_path = merge_filtered_analysis_store(merged_folder)
+    else:
+        analysis_folder = os.path.join(os.getcwd(), 'data', 'analysis')
+        merged_path = merge_filtered_energy_data(get_csv_files(analysis_folder), merged_folder)
 
-    if not merged_data.empty:
+    if merged_path:
         print("데이터 병합 완료!")
-        print(f"병합된 데이터 형태: {merged_data.shape}")
+
+        # 시각화에 필요한 컬럼만 읽기
+        merged_data = pd.read_csv(merged_path, usecols=VISUALIZATION_COLUMNS, dtype=ANALYSIS_RESULT_DTYPES)
+        print(f"병합된 데이터 형태: {merged_data.shape} ({memory_mb(merged_data):.1f}MB)")
         print(f"컬럼 목록: {merged_data.columns.tolist()}")
 
         # 데이터를 energy_type과 month로 그룹화
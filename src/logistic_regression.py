@@ -3,36 +3,13 @@ import numpy as np
 import pandas as pd
 import statsmodels.api as sm
 
+from utils.analysis_store import analysis_store_exists, load_analysis_results
+from utils.master_data import load_master_data
+from utils.master_diff import CHANGE_ADDED, CHANGE_CHANGED, CHANGE_REMOVED, affected_codes, load_snapshot_diff, print_diff_summary
+from utils.schema import ANALYSIS_KEY_DTYPES
 
-def extract_columns(file_path, columns=None):
-    """
-    CSV 파일에서 특정 컬럼만 추출하여 DataFrame으로 반환하는 함수
-
-    Args:
-        file_path (str): 처리할 CSV 파일 경로
-        columns (list): 추출할 컬럼명 목록
-
-    Returns:
-        pd.DataFrame: 지정된 컬럼만 포함된 DataFrame
-    """
-    # 파일 존재 확인
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
-
-    # CSV 파일 읽기
-    df = pd.read_csv(file_path, encoding='utf-8-sig')
-
-    # 지정된 컬럼만 선택
-    if columns:
-        # 존재하는 컬럼만 필터링
-        available_columns = [col for col in columns if col in df.columns]
-        if not available_columns:
-            raise ValueError(f"지정한 컬럼이 파일에 존재하지 않습니다: {columns}")
-        df_selected = df[available_columns]
-    else:
-        df_selected = df
-
-    return df_selected
+# 이전 단지 기본정보 스냅샷 파일명. 설정하면 회귀 입력 컬럼이 바뀐 단지를 출력
+MASTER_BASE_SNAPSHOT = os.getenv("MASTER_BASE_SNAPSHOT")
 
 
 # 결측치 제거
@@ -55,27 +32,40 @@ def main():
     """
     """-------------------------"""
     file_name = '20250328_단지_기본정보_수도권'
-    file_path = os.path.join(
-        os.getcwd(), 'data', 'processed', file_name + '.csv')
 
     columns_to_extract = ['단지코드', '단지명',
                           '단지분류', '사용승인일', '난방방식', '건물구조', '급수방식']
 
-    df = extract_columns(file_path, columns_to_extract)
+    # 단지 기본정보는 필요한 컬럼만 스키마 타입으로 읽음 (변환 결과 캐시 사용)
+    df = load_master_data(file_name + '.csv', columns=columns_to_extract)
+
+    # 회귀는 전체 단지로 다시 적합하므로, 스냅샷 갱신 시 회귀 입력이 바뀐 단지만 확인
+    if MASTER_BASE_SNAPSHOT:
+        diff = load_snapshot_diff(MASTER_BASE_SNAPSHOT, file_name + '.csv', columns=columns_to_extract)
+        print_diff_summary(diff, MASTER_BASE_SNAPSHOT, file_name + '.csv')
+        changed = affected_codes(diff, changes=(CHANGE_ADDED, CHANGE_REMOVED, CHANGE_CHANGED))
+        print(f"회귀 입력이 바뀐 단지 {len(changed)}개")
     df_cleaned = remove_missing_values(df)
+    # 범주 값을 바꾸고 회귀 수준으로 쓰므로 범주형 컬럼은 문자열로 사용
+    df_cleaned = df_cleaned.astype({column: str for column in ['단지분류', '난방방식', '건물구조', '급수방식']})
     """-------------------------"""
 
     """-------------------------"""
-    file_name = 'merged_filtered_energy_data'
-    file_path = os.path.join(
-        os.getcwd(), 'data', 'processed', file_name + '.csv')
-    df = pd.read_csv(file_path, encoding='utf-8-sig')
+    # 분석 결과 저장소가 있으면 data_points가 5 이상인 waterCool 결과만 읽음
+    if analysis_store_exists():
+        df_waterCool = load_analysis_results(columns=['energy_type', 'correlation'], energy_types=['waterCool'],
+                                             min_data_points=5).rename(columns={'kaptCode': 'kapt_code'})
+    else:
+        file_name = 'merged_filtered_energy_data'
+        file_path = os.path.join(
+            os.getcwd(), 'data', 'processed', file_name + '.csv')
+        df = pd.read_csv(file_path, encoding='utf-8-sig', dtype=ANALYSIS_KEY_DTYPES)
 
-    # energy_type이 waterCool만 추출
-    df_waterCool = df[df['energy_type'] == 'waterCool']
+        # energy_type이 waterCool만 추출
+        df_waterCool = df[df['energy_type'] == 'waterCool']
 
     # kapt_code 기준으로 그룹화
-    grouped_by_kapt = df_waterCool.groupby('kapt_code')
+    grouped_by_kapt = df_waterCool.groupby('kapt_code', observed=True)
     """-------------------------"""
 
     """-------------------------"""
@@ -0,0 +1,227 @@
+"""
+공동주택 에너지 사용량 API(getHsmpApHusUsgQtyInfoSearchV2) 로컬 모의 서버
+
+실제 API 할당량을 쓰지 않고 수집기의 처리량, 동시성, 재시도 동작을 시험합니다.
+
+사용 예:
+    MOCK_LATENCY_MS=80 MOCK_ERROR_RATE=0.02 python src/mock_energy_server.py
+    ENERGY_API_BASE_URL=http://127.0.0.1:8089/getHsmpApHusUsgQtyInfoSearchV2 \\
+        COLLECTOR_CONCURRENCY=16 python src/apt_energy_collector.py
+"""
+import os
+import json
+import time
+import random
+import hashlib
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from dotenv import load_dotenv
+
+from utils.schema import ENERGY_COLUMNS
+
+load_dotenv()
+
+# 서버 설정
+HOST = os.getenv("MOCK_HOST", "127.0.0.1")
+PORT = int(os.getenv("MOCK_PORT", "8089"))
+ENDPOINT = '/getHsmpApHusUsgQtyInfoSearchV2'
+
+# 응답 지연 (밀리초): 평균과 ± 지터
+LATENCY_MS = float(os.getenv("MOCK_LATENCY_MS", "50"))
+LATENCY_JITTER_MS = float(os.getenv("MOCK_LATENCY_JITTER_MS", "20"))
+# 오류 비율 (0~1): HTTP 503, 데이터 없음(resultCode 03), 잘못된 JSON
+ERROR_RATE = float(os.getenv("MOCK_ERROR_RATE", "0"))
+NODATA_RATE = float(os.getenv("MOCK_NODATA_RATE", "0"))
+MALFORMED_RATE = float(os.getenv("MOCK_MALFORMED_RATE", "0"))
+# 서버 처리 용량: 동시 요청이 이 수를 넘으면 지연이 비례해 늘어남 (0이면 제한 없음)
+CAPACITY = int(os.getenv("MOCK_CAPACITY", "0"))
+# 초당 요청 한도: 최근 1초 요청 수가 이 수를 넘으면 HTTP 429 (0이면 제한 없음)
+RATE_LIMIT = int(os.getenv("MOCK_RATE_LIMIT", "0"))
+# 서비스 키별 일일 요청 한도 (0이면 제한 없음)
+DAILY_QUOTA = int(os.getenv("MOCK_DAILY_QUOTA", "0"))
+# 난수 시드 (같은 시드면 같은 오류 순서)
+SEED = int(os.getenv("MOCK_SEED", "42"))
+
+QUOTA_EXCEEDED_XML = """<OpenAPI_ServiceResponse>
+\t<cmmMsgHeader>
+\t\t<errMsg>SERVICE ERROR</errMsg>
+\t\t<returnAuthMsg>LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR</returnAuthMsg>
+\t\t<returnReasonCode>22</returnReasonCode>
+\t</cmmMsgHeader>
+</OpenAPI_ServiceResponse>"""
+
+
+def synthetic_item(kapt_code, req_month):
+    """
+    (단지 코드, 요청 월)마다 항상 같은 값을 갖는 모의 에너지 사용량 생성
+
+    Args:
+        kapt_code (str): 단지 코드
+        req_month (str): 요청 월(YYYYMM)
+
+    Returns:
+        dict: body.item 형식의 에너지 사용량
+    """
+    seed = int(hashlib.sha256(f"{kapt_code}{req_month}".encode('utf-8')).hexdigest()[:16], 16)
+    rng = random.Random(seed)
+    month = int(req_month[-2:])
+
+    # 겨울에 난방/급탕/가스, 여름에 전기 사용량이 늘어나는 계절성
+    winter = 1.0 + 0.8 * (month in (12, 1, 2))
+    summer = 1.0 + 0.4 * (month in (7, 8))
+    households = rng.randint(100, 2000)
+
+    item = {'kaptCode': kapt_code}
+    base = {
+        'heat': 900 * winter, 'waterHot': 300 * winter, 'gas': 40 * winter,
+        'elect': 250 * summer, 'waterCool': 12,
+    }
+    for field, per_household in base.items():
+        total = int(per_household * households * rng.uniform(0.8, 1.2))
+        item[field] = total
+        item['h' + field] = int(total / households)
+
+    return {field: item.get(field, 0) for field in ['kaptCode'] + ENERGY_COLUMNS}
+
+
+class MockState:
+    """
+    모의 서버의 요청 통계와 서비스 키별 요청 수
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rng = random.Random(SEED)
+        self.key_usage = {}
+        self.stats = {'requests': 0, 'ok': 0, 'nodata': 0, 'error_503': 0,
+                      'malformed': 0, 'quota_exceeded': 0, 'throttled': 0}
+        self.started = time.monotonic()
+        self.in_flight = 0
+        self.recent = deque()
+
+    def next_outcome(self, service_key):
+        with self.lock:
+            self.stats['requests'] += 1
+            used = self.key_usage.get(service_key, 0) + 1
+            self.key_usage[service_key] = used
+
+            now = time.monotonic()
+            self.recent.append(now)
+            while self.recent and self.recent[0] <= now - 1.0:
+                self.recent.popleft()
+            self.in_flight += 1
+
+            if RATE_LIMIT and len(self.recent) > RATE_LIMIT:
+                outcome = 'throttled'
+            elif DAILY_QUOTA and used > DAILY_QUOTA:
+                outcome = 'quota_exceeded'
+            else:
+                roll = self.rng.random()
+                if roll < ERROR_RATE:
+                    outcome = 'error_503'
+                elif roll < ERROR_RATE + NODATA_RATE:
+                    outcome = 'nodata'
+                elif roll < ERROR_RATE + NODATA_RATE + MALFORMED_RATE:
+                    outcome = 'malformed'
+                else:
+                    outcome = 'ok'
+            self.stats[outcome] += 1
+            delay = max(LATENCY_MS + self.rng.uniform(-LATENCY_JITTER_MS, LATENCY_JITTER_MS), 0)
+            if CAPACITY and self.in_flight > CAPACITY:
+                delay *= self.in_flight / CAPACITY
+            return outcome, delay / 1000
+
+    def finish(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def snapshot(self):
+        with self.lock:
+            elapsed = time.monotonic() - self.started
+            return dict(self.stats, elapsed_seconds=round(elapsed, 1),
+                        requests_per_second=round(self.stats['requests'] / elapsed, 1) if elapsed else 0)
+
+
+STATE = MockState()
+
+
+class MockEnergyHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, status, body, content_type):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+
+        if url.path == '/stats':
+            self.send_body(200, json.dumps(STATE.snapshot()), 'application/json')
+            return
+
+        if not url.path.endswith(ENDPOINT):
+            self.send_body(404, 'Not Found', 'text/plain')
+            return
+
+        params = parse_qs(url.query)
+        service_key = params.get('serviceKey', [''])[0]
+        kapt_code = params.get('kaptCode', [''])[0]
+        req_month = params.get('reqDate', [''])[0]
+
+        outcome, delay = STATE.next_outcome(service_key)
+        try:
+            time.sleep(delay)
+        finally:
+            STATE.finish()
+
+        if outcome == 'throttled':
+            self.send_body(429, 'Too Many Requests', 'text/plain')
+        elif outcome == 'quota_exceeded':
+            self.send_body(200, QUOTA_EXCEEDED_XML, 'text/xml;charset=UTF-8')
+        elif outcome == 'error_503':
+            self.send_body(503, 'Service Unavailable', 'text/plain')
+        elif outcome == 'malformed':
+            self.send_body(200, '{"response": {"header": ', 'application/json')
+        elif outcome == 'nodata' or len(req_month) != 6:
+            body = {'response': {'header': {'resultCode': '03', 'resultMsg': 'NODATA_ERROR'},
+                                 'body': {}}}
+            self.send_body(200, json.dumps(body), 'application/json;charset=UTF-8')
+        else:
+            body = {'response': {'header': {'resultCode': '00', 'resultMsg': 'NORMAL SERVICE.'},
+                                 'body': {'item': synthetic_item(kapt_code, req_month)}}}
+            self.send_body(200, json.dumps(body), 'application/json;charset=UTF-8')
+
+
+def main():
+    server = ThreadingHTTPServer((HOST, PORT), MockEnergyHandler)
+    server.daemon_threads = True
+
+    print(f"모의 API 서버 실행 중: http://{HOST}:{PORT}{ENDPOINT}")
+    print(f"- 응답 지연: {LATENCY_MS}±{LATENCY_JITTER_MS}ms")
+    print(f"- 오류 비율: 503 {ERROR_RATE}, 데이터 없음 {NODATA_RATE}, 잘못된 JSON {MALFORMED_RATE}")
+    print(f"- 키별 일일 한도: {DAILY_QUOTA or '제한 없음'}")
+    print(f"- 처리 용량: 동시 {CAPACITY or '제한 없음'}, 초당 {RATE_LIMIT or '제한 없음'}")
+    print(f"- 요청 통계: http://{HOST}:{PORT}/stats")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n요청 통계: {STATE.snapshot()}")
+        print("프로그램이 종료되었습니다.")
+
+
+if __name__ == "__main__":
+    main()
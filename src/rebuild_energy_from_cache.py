@@ -0,0 +1,98 @@
+import os
+
+import pandas as pd
+
+from api.energy_api import parse_energy_response
+from api.response_cache import RawResponseCache
+from utils.data_utils import energy_file_name, index_energy_files, load_csv_data
+from utils.master_data import load_master_data
+
+# 상수 정의
+CSV_FILENAME = '20250328_단지_기본정보_수도권.csv'
+OUTPUT_FOLDER = 'energy'
+
+
+def load_complex_names():
+    """
+    단지 기본정보에서 {단지 코드: 단지명} 로드 (파일이 없으면 빈 딕셔너리)
+    """
+    try:
+        df = load_master_data(CSV_FILENAME, columns=['단지코드', '단지명'])
+    except FileNotFoundError:
+        return {}
+    return dict(zip(df['단지코드'], df['단지명']))
+
+
+def rebuild_complex(cache, kapt_code, months, filename, output_folder=OUTPUT_FOLDER):
+    """
+    캐시된 원본 응답으로 단지의 에너지 데이터 CSV를 다시 생성
+
+    캐시에 없는 월(캐시 도입 전에 수집된 월)은 기존 파일의 행을 유지합니다.
+    파일은 임시 파일에 먼저 쓴 뒤 교체하므로 중간에 중단되어도 기존 파일이 손상되지 않습니다.
+
+    Args:
+        cache: 원본 응답 캐시
+        kapt_code: 단지 코드
+        months: 캐시된 월 목록
+        filename: 저장할 파일명
+        output_folder: 출력 폴더 이름 (기본값: 'energy')
+
+    Returns:
+        int: 저장한 월 수
+    """
+    rows = []
+    for month in months:
+        response = cache.get(kapt_code, month)
+        if response is None:
+            continue
+        try:
+            item, _ = parse_energy_response(response, month)
+        except (KeyError, TypeError):
+            continue
+        if item:
+            rows.append(item)
+
+    if not rows:
+        return 0
+
+    output_dir = os.path.join(os.getcwd(), 'data', output_folder)
+    os.makedirs(output_dir, exist_ok=True)
+    filepath = os.path.join(output_dir, filename)
+    temp_path = filepath + '.tmp'
+
+    df = pd.DataFrame(rows)
+    if os.path.exists(filepath):
+        existing = load_csv_data(filename, source_folder=output_folder)
+        existing = existing[~existing['requestMonth'].astype(str).isin(df['requestMonth'])]
+        df = pd.concat([existing.astype({'requestMonth': str}), df], ignore_index=True)
+
+    df = df.sort_values('requestMonth', kind='stable')
+    df.to_csv(temp_path, index=False, encoding='utf-8-sig')
+    os.replace(temp_path, filepath)
+
+    return len(rows)
+
+
+def main():
+    print("원본 응답 캐시로 에너지 데이터 재생성 시작...")
+
+    cache = RawResponseCache()
+    cached_months = cache.list_months()
+    file_index = index_energy_files(OUTPUT_FOLDER)
+    complex_names = load_complex_names()
+
+    total = 0
+    for idx, (kapt_code, months) in enumerate(cached_months.items()):
+        filename = file_index.get(kapt_code) or energy_file_name(
+            kapt_code, complex_names.get(kapt_code, kapt_code))
+        count = rebuild_complex(cache, kapt_code, months, filename)
+        total += count
+        print(f"[{idx+1}/{len(cached_months)}] {filename}: {count}개월")
+
+    cache.close()
+    print(f"총 {len(cached_months)}개 단지, {total}개월 데이터 재생성 완료")
+    print("매니페스트는 다음 수집 실행 시 변경된 파일을 기준으로 갱신됩니다.")
+
+
+if __name__ == "__main__":
+    main()
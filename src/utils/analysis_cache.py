@@ -0,0 +1,101 @@
+import os
+import hashlib
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis_inputs (
+    filename TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    version TEXT NOT NULL,
+    output TEXT,
+    analyzed_at TEXT NOT NULL
+);
+"""
+
+
+def ensure_analysis_cache(conn):
+    """
+    분석 입력 지문 테이블 생성
+
+    Args:
+        conn: 매니페스트 연결
+    """
+    conn.executescript(SCHEMA)
+
+
+def code_version(file_paths, config=''):
+    """
+    분석 코드와 설정의 버전 (내용 해시)
+
+    코드나 설정이 바뀌면 버전이 달라져 모든 단지를 다시 분석합니다.
+
+    Args:
+        file_paths (list): 분석 결과에 영향을 주는 소스 파일 경로 목록
+        config (str): 분석 설정 문자열
+
+    Returns:
+        str: 버전 문자열
+    """
+    digest = hashlib.sha256(config.encode('utf-8'))
+    for file_path in file_paths:
+        with open(file_path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def get_stale_files(conn, csv_files, version, source_folder='energy', output_folder='analysis', force=False,
+                    stored_codes=None):
+    """
+    마지막 분석 이후 입력 파일이나 분석 버전이 바뀐 에너지 데이터 파일 조회
+
+    분석 결과 파일이 지워졌거나 분석 결과 저장소에 단지 결과가 없는 경우에도 다시 분석합니다.
+
+    Args:
+        conn: 매니페스트 연결
+        csv_files (list): 에너지 데이터 파일명 목록
+        version (str): 분석 코드와 설정의 버전
+        source_folder (str): 에너지 데이터 폴더 이름 (기본값: 'energy')
+        output_folder (str): 분석 결과 폴더 이름 (기본값: 'analysis')
+        force (bool): 변경 여부와 관계없이 모든 파일을 반환
+        stored_codes (set): 분석 결과 저장소에 결과가 있는 단지 코드 (기본값: None, 확인하지 않음)
+
+    Returns:
+        dict: {파일명: (mtime, size)} 다시 분석할 파일과 분석 시점의 지문 (csv_files 순서)
+    """
+    analyzed = {filename: (mtime, size, file_version, output) for filename, mtime, size, file_version, output in
+                conn.execute("SELECT filename, mtime, size, version, output FROM analysis_inputs")}
+    source_dir = os.path.join(os.getcwd(), 'data', source_folder)
+    output_dir = os.path.join(os.getcwd(), 'data', output_folder)
+
+    stale = {}
+    for filename in csv_files:
+        stat = os.stat(os.path.join(source_dir, filename))
+        fingerprint = (stat.st_mtime, stat.st_size)
+        record = analyzed.get(filename)
+        if (not force and record is not None and record[:3] == fingerprint + (version,) and
+                (not record[3] or (os.path.exists(os.path.join(output_dir, record[3])) and
+                                   (stored_codes is None or filename.split('_', 1)[0] in stored_codes)))):
+            continue
+        stale[filename] = fingerprint
+
+    return stale
+
+
+def mark_analyzed(conn, filename, fingerprint, version, output=None):
+    """
+    분석한 입력 파일의 지문 기록
+
+    Args:
+        conn: 매니페스트 연결
+        filename (str): 에너지 데이터 파일명
+        fingerprint (tuple): 분석 시점의 (mtime, size)
+        version (str): 분석 코드와 설정의 버전
+        output (str): 분석 결과 파일명 (결과가 없으면 None)
+    """
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO analysis_inputs (filename, mtime, size, version, output, analyzed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (filename, fingerprint[0], fingerprint[1], version, output,
+             datetime.now().isoformat(timespec='seconds')))
@@ -0,0 +1,177 @@
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from utils.schema import ANALYSIS_KEY_DTYPES, apply_dtypes
+
+ANALYSIS_STORE_FOLDER = os.path.join('store', 'analysis')
+
+# 월별 에너지 유형 추세 분석 결과 스키마 (energy_type은 파티션 컬럼)
+ANALYSIS_SCHEMA = pa.schema([
+    ('kaptCode', pa.string()),
+    ('kaptName', pa.string()),
+    ('month', pa.int8()),
+    ('energy_type', pa.string()),
+    ('energy_name', pa.string()),
+    ('correlation', pa.float64()),
+    ('slope', pa.float64()),
+    ('initial_value', pa.float64()),
+    ('annual_growth_rate', pa.float64()),
+    ('trend', pa.string()),
+    ('data_points', pa.int32()),
+])
+
+RESULT_COLUMNS = ANALYSIS_SCHEMA.names[2:]
+
+
+def get_analysis_store_dir(folder=ANALYSIS_STORE_FOLDER):
+    return os.path.join(os.getcwd(), 'data', folder)
+
+
+def analysis_store_exists(folder=ANALYSIS_STORE_FOLDER):
+    """
+    분석 결과 저장소가 생성되어 있는지 확인
+    """
+    directory = get_analysis_store_dir(folder)
+    return os.path.isdir(directory) and any(name.startswith('energy_type=') for name in os.listdir(directory))
+
+
+def open_analysis_dataset(folder=ANALYSIS_STORE_FOLDER):
+    return ds.dataset(get_analysis_store_dir(folder), format='parquet', partitioning='hive',
+                      schema=ANALYSIS_SCHEMA)
+
+
+def to_analysis_frame(results, kapt_name=None):
+    """
+    분석 결과를 저장소 스키마의 DataFrame으로 변환
+
+    Args:
+        results (pandas.DataFrame): kaptCode, month, energy_type과 분석 지표 컬럼을 가진 분석 결과
+        kapt_name: 단지명 (kaptName 컬럼이 없을 때 사용, 문자열 또는 {단지 코드: 단지명})
+
+    Returns:
+        pandas.DataFrame: 저장소 스키마의 DataFrame
+    """
+    kapt_codes = results['kaptCode'].astype(str)
+    if 'kaptName' in results.columns:
+        kapt_names = results['kaptName'].astype(str)
+    elif isinstance(kapt_name, dict):
+        kapt_names = kapt_codes.map(kapt_name).fillna(kapt_codes)
+    else:
+        kapt_names = pd.Series(kapt_name, index=results.index, dtype=str)
+
+    frame = pd.DataFrame({
+        'kaptCode': kapt_codes.to_numpy(),
+        'kaptName': kapt_names.to_numpy(),
+        'month': pd.to_numeric(results['month'].astype(str)).astype('int8').to_numpy(),
+        'energy_type': results['energy_type'].astype(str).to_numpy(),
+    })
+    for column in RESULT_COLUMNS[2:]:
+        frame[column] = results[column].to_numpy()
+    frame['trend'] = frame['trend'].astype(str)
+    frame['data_points'] = frame['data_points'].astype('int32')
+    return frame
+
+
+def upsert_analysis_results(results, kapt_codes, folder=ANALYSIS_STORE_FOLDER):
+    """
+    분석한 단지의 결과를 저장소에 반영 (단지 단위로 기존 결과 교체)
+
+    kapt_codes에 포함된 단지의 기존 결과를 모두 지우고 results로 바꾸므로, 결과가 없어진 단지는
+    저장소에서도 빠집니다. 에너지 유형별로 분할한 Parquet 파일을 임시 폴더에 다시 쓴 뒤 교체하므로
+    중간에 중단되어도 기존 저장소가 손상되지 않습니다.
+
+    Args:
+        results (pandas.DataFrame): 저장소 스키마의 분석 결과 (to_analysis_frame 참고)
+        kapt_codes (list): 분석한 단지 코드 목록
+        folder (str): data 폴더 아래 저장소 경로 (기본값: 'store/analysis')
+
+    Returns:
+        int: 저장소 전체 행 수
+    """
+    directory = get_analysis_store_dir(folder)
+    temp_dir = directory + '.tmp'
+    old_dir = directory + '.old'
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+    frames = []
+    if analysis_store_exists(folder):
+        existing = open_analysis_dataset(folder).to_table(
+            filter=~ds.field('kaptCode').isin(list(kapt_codes)))
+        frames.append(existing.to_pandas())
+    if results is not None and len(results):
+        frames.append(results[ANALYSIS_SCHEMA.names])
+
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=ANALYSIS_SCHEMA.names)
+    df = df.sort_values(['kaptCode', 'month'], kind='stable').reset_index(drop=True)
+    table = pa.Table.from_pandas(df, schema=ANALYSIS_SCHEMA, preserve_index=False)
+
+    ds.write_dataset(table, temp_dir, format='parquet',
+                     partitioning=ds.partitioning(pa.schema([('energy_type', pa.string())]), flavor='hive'),
+                     file_options=ds.ParquetFileFormat().make_write_options(compression='zstd'),
+                     existing_data_behavior='error')
+
+    if os.path.exists(directory):
+        shutil.rmtree(old_dir, ignore_errors=True)
+        os.replace(directory, old_dir)
+    os.replace(temp_dir, directory)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    return len(df)
+
+
+def stored_kapt_codes(folder=ANALYSIS_STORE_FOLDER):
+    """
+    분석 결과 저장소에 결과가 있는 단지 코드 집합
+    """
+    if not analysis_store_exists(folder):
+        return set()
+    table = open_analysis_dataset(folder).to_table(columns=['kaptCode'])
+    return set(table.column('kaptCode').unique().to_pylist())
+
+
+def load_analysis_results(columns=None, kapt_codes=None, energy_types=None, min_data_points=None,
+                          folder=ANALYSIS_STORE_FOLDER):
+    """
+    분석 결과 저장소에서 전체 단지의 결과를 한 번에 읽기
+
+    에너지 유형 조건은 파티션으로 걸러지고, 요청한 컬럼만 디스크에서 읽습니다.
+
+    Args:
+        columns (list): 읽을 결과 컬럼 목록 (기본값: None, 전체 결과 컬럼)
+        kapt_codes (list): 읽을 단지 코드 목록 (기본값: None, 전체 단지)
+        energy_types (list): 읽을 에너지 유형 목록 (기본값: None, 전체 에너지 유형)
+        min_data_points (int): 최소 데이터 포인트 수 (기본값: None, 조건 없음)
+        folder (str): data 폴더 아래 저장소 경로 (기본값: 'store/analysis')
+
+    Returns:
+        pandas.DataFrame: kaptCode, kaptName과 요청한 결과 컬럼 (단지 코드, 월, 에너지 유형 순서).
+            단지 코드, 에너지 유형 등 문자열 컬럼은 범주형입니다.
+
+    Raises:
+        FileNotFoundError: 저장소가 없을 경우
+    """
+    if not analysis_store_exists(folder):
+        raise FileNotFoundError(f"분석 결과 저장소를 찾을 수 없습니다: {get_analysis_store_dir(folder)}")
+
+    expression = None
+    conditions = []
+    if kapt_codes is not None:
+        conditions.append(ds.field('kaptCode').isin(list(kapt_codes)))
+    if energy_types is not None:
+        conditions.append(ds.field('energy_type').isin(list(energy_types)))
+    if min_data_points is not None:
+        conditions.append(ds.field('data_points') >= min_data_points)
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    selected = ['kaptCode', 'kaptName'] + list(columns or RESULT_COLUMNS)
+    table = open_analysis_dataset(folder).to_table(columns=selected, filter=expression)
+
+    # 파티션 순서가 아닌 단지 코드, 월, 에너지 유형(ENERGY_COLUMNS 순서)으로 정렬
+    df = apply_dtypes(table.to_pandas(), ANALYSIS_KEY_DTYPES)
+    sort_keys = [key for key in ('kaptCode', 'month', 'energy_type') if key in df.columns]
+    return df.sort_values(sort_keys, kind='stable').reset_index(drop=True)
@@ -0,0 +1,289 @@
+import os
+import threading
+import zipfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from utils.manifest import STATUS_DONE, STATUS_FAILED
+from utils.schema import month_ordinal, ordinal_month
+
+COVERAGE_FOLDER = os.path.join('store', 'coverage')
+COVERAGE_FILENAME = 'coverage.npz'
+
+# 비트 평면: 수집 완료 월, 실패로 기록된 월
+PLANES = (STATUS_DONE, STATUS_FAILED)
+
+# 바이트 값별 1인 비트 수
+POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+def get_coverage_path(folder=COVERAGE_FOLDER):
+    return os.path.join(os.getcwd(), 'data', folder, COVERAGE_FILENAME)
+
+
+def manifest_fingerprint(conn):
+    """
+    매니페스트 내용의 지문 (기록 수, 완료 수, 마지막 기록 시각)
+
+    월 기록이 추가되거나 실패가 완료로 바뀌면 달라지므로, 지문이 같으면 색인을 다시 만들지 않습니다.
+    """
+    count, done, last = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(status = ?), 0), COALESCE(MAX(fetched_at), '') FROM manifest",
+        (STATUS_DONE,)).fetchone()
+    return f"{count}:{done}:{last}"
+
+
+def current_end_ordinal(today=None):
+    """
+    요청 기간의 종료 월(현재 기준 이전 달) 번호 (calculate_req_date와 같은 기준)
+    """
+    today = today or datetime.now()
+    return today.year * 12 + today.month - 2
+
+
+def request_window_ordinals(approval_dates, today=None):
+    """
+    사용승인일로 단지별 요청 기간(시작 월 번호, 종료 월 번호)을 한 번에 계산
+
+    시작 월은 사용승인월, 종료 월은 현재 기준 이전 달입니다. 사용승인일이 없으면 시작 월은 -1입니다.
+
+    Args:
+        approval_dates (pandas.Series): 날짜 타입 사용승인일 (utils.master_data 로더 결과)
+        today (datetime): 기준 날짜 (기본값: 현재)
+
+    Returns:
+        tuple: (시작 월 번호 배열, 종료 월 번호 배열)
+    """
+    dates = pd.to_datetime(approval_dates)
+    valid = dates.notna().to_numpy()
+    starts = np.full(len(dates), -1, dtype=np.int32)
+    starts[valid] = (dates[valid].dt.year * 12 + dates[valid].dt.month - 1).to_numpy(dtype=np.int32)
+    ends = np.full(len(dates), current_end_ordinal(today), dtype=np.int32)
+    return starts, ends
+
+
+def build_coverage_index(conn, folder=COVERAGE_FOLDER):
+    """
+    매니페스트의 월 기록으로 단지별 월 비트맵 색인을 만들어 저장
+
+    단지마다 첫 기록 월부터 마지막 기록 월까지의 월 번호 축 위에 상태별(완료, 실패) 비트를
+    8개월씩 묶어 저장합니다. 임시 파일에 먼저 쓴 뒤 교체합니다.
+
+    Args:
+        conn: 매니페스트 연결
+        folder (str): data 폴더 아래 색인 경로 (기본값: 'store/coverage')
+
+    Returns:
+        CoverageIndex: 새로 만든 색인
+    """
+    fingerprint = manifest_fingerprint(conn)
+    df = pd.read_sql_query("SELECT kaptCode, month, status FROM manifest", conn)
+
+    complex_pos, kapt_codes = pd.factorize(df['kaptCode'], sort=True)
+    kapt_codes = kapt_codes.to_numpy(dtype=str)
+    ordinals = month_ordinal(df['month']) if len(df) else np.zeros(0, dtype=np.int32)
+    first = int(ordinals.min()) if len(df) else 0
+    width = int(ordinals.max()) - first + 1 if len(df) else 0
+
+    planes = np.zeros((len(PLANES), len(kapt_codes), (width + 7) // 8), dtype=np.uint8)
+    statuses = df['status'].to_numpy()
+    for plane, status in enumerate(PLANES):
+        selected = statuses == status
+        bits = np.zeros((len(kapt_codes), width), dtype=bool)
+        bits[complex_pos[selected], ordinals[selected] - first] = True
+        planes[plane] = np.packbits(bits, axis=1, bitorder='little')
+
+    path = get_coverage_path(folder)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'wb') as f:
+        np.savez(f, planes=planes, kapt_codes=kapt_codes, axis=np.array([first, width], dtype=np.int32),
+                 fingerprint=np.array(fingerprint))
+    os.replace(temp_path, path)
+
+    return CoverageIndex(planes, kapt_codes, first, width, fingerprint)
+
+
+def load_coverage_index(folder=COVERAGE_FOLDER):
+    """
+    저장된 월 비트맵 색인 불러오기
+
+    Raises:
+        FileNotFoundError: 색인이 없을 경우
+    """
+    path = get_coverage_path(folder)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"수집 월 색인을 찾을 수 없습니다: {path}")
+    with np.load(path) as data:
+        first, width = (int(value) for value in data['axis'])
+        return CoverageIndex(data['planes'], data['kapt_codes'], first, width, str(data['fingerprint']))
+
+
+def sync_coverage_index(conn, folder=COVERAGE_FOLDER):
+    """
+    매니페스트가 바뀌었을 때만 색인을 다시 만들고, 아니면 저장된 색인 사용
+
+    Args:
+        conn: 매니페스트 연결
+        folder (str): data 폴더 아래 색인 경로 (기본값: 'store/coverage')
+
+    Returns:
+        CoverageIndex: 매니페스트와 일치하는 색인
+    """
+    try:
+        index = load_coverage_index(folder)
+        if index.fingerprint == manifest_fingerprint(conn):
+            return index
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"수집 월 색인을 읽지 못해 다시 만듭니다: {e}")
+    return build_coverage_index(conn, folder)
+
+
+class CoverageIndex:
+    """
+    단지별 수집 월 비트맵 색인
+
+    월은 연속된 정수 월 번호(utils.schema.month_ordinal)로 다루고, 여러 단지의 요청 기간에 대한
+    누락, 수집률, 마지막 누락 구간 조회를 단지 수 × 월 수 배열 연산 한 번으로 처리합니다.
+    """
+
+    def __init__(self, planes, kapt_codes, first_ordinal, width, fingerprint=''):
+        self.planes = planes
+        self.kapt_codes = kapt_codes
+        self.first_ordinal = first_ordinal
+        self.width = width
+        self.fingerprint = fingerprint
+        self.complex_positions = {code: pos for pos, code in enumerate(kapt_codes.tolist())}
+
+    def __len__(self):
+        return len(self.kapt_codes)
+
+    def positions(self, kapt_codes):
+        """
+        단지 코드의 색인 위치 배열 (색인에 없는 단지는 -1)
+        """
+        return np.array([self.complex_positions.get(code, -1) for code in kapt_codes], dtype=np.int64)
+
+    def bits(self, kapt_codes, start, end, statuses=PLANES):
+        """
+        단지별 [start, end] 월 번호 구간의 기록 여부 (statuses 중 하나로 기록되면 True)
+
+        Args:
+            kapt_codes (list): 단지 코드 목록
+            start (int): 시작 월 번호
+            end (int): 종료 월 번호
+            statuses (tuple): 포함할 상태 (기본값: 완료, 실패)
+
+        Returns:
+            numpy.ndarray: [단지 수 × 월 수] bool 배열
+        """
+        positions = self.positions(kapt_codes)
+        packed = np.zeros((len(positions), self.planes.shape[2]), dtype=np.uint8)
+        found = positions >= 0
+        for status in statuses:
+            packed[found] |= self.planes[PLANES.index(status)][positions[found]]
+
+        unpacked = np.unpackbits(packed, axis=1, count=self.width, bitorder='little').astype(bool)
+
+        # 색인 축 밖의 월은 기록 없음
+        result = np.zeros((len(positions), end - start + 1), dtype=bool)
+        lo, hi = max(start, self.first_ordinal), min(end, self.first_ordinal + self.width - 1)
+        if lo <= hi:
+            result[:, lo - start:hi - start + 1] = unpacked[:, lo - self.first_ordinal:hi - self.first_ordinal + 1]
+        return result
+
+    def window(self, starts, ends):
+        """
+        단지별 요청 기간을 공통 월 축 위의 bool 배열로 변환
+
+        Returns:
+            tuple: (공통 시작 월 번호, [단지 수 × 월 수] bool 배열)
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        lo = int(starts.min())
+        axis = np.arange(lo, int(ends.max()) + 1)
+        return lo, (axis >= starts[:, None]) & (axis <= ends[:, None])
+
+    def missing_months(self, targets):
+        """
+        단지별 요청 기간 중 기록(완료 또는 실패)이 없는 월 조회 (get_missing_months와 같은 결과)
+
+        Args:
+            targets (list): (단지 코드, 시작 년월, 종료 년월) 목록
+
+        Returns:
+            dict: {단지 코드: 누락 월 목록 (YYYYMM 문자열, 오름차순)}
+        """
+        if not targets:
+            return {}
+
+        kapt_codes = [kapt_code for kapt_code, _, _ in targets]
+        starts = month_ordinal(pd.Series([start_date for _, start_date, _ in targets]))
+        ends = month_ordinal(pd.Series([end_date for _, _, end_date in targets]))
+        lo, window = self.window(starts, ends)
+        missing = window & ~self.bits(kapt_codes, lo, lo + window.shape[1] - 1)
+
+        labels = ordinal_month(np.arange(lo, lo + window.shape[1])).astype(str)
+        return {kapt_code: labels[row].tolist() for kapt_code, row in zip(kapt_codes, missing) if row.any()}
+
+    def summary(self, kapt_codes, starts, ends):
+        """
+        단지별 요청 기간의 수집 현황 (수집률, 첫 누락 월, 마지막 누락 구간 시작 월)
+
+        Args:
+            kapt_codes (list): 단지 코드 목록
+            starts (numpy.ndarray): 단지별 시작 월 번호
+            ends (numpy.ndarray): 단지별 종료 월 번호
+
+        Returns:
+            pandas.DataFrame: kaptCode, requested, collected, failed, missing, coverage,
+                first_missing(첫 누락 월), missing_since(종료 월까지 이어지는 누락 구간의 시작 월, 없으면 결측)
+        """
+        if not len(kapt_codes):
+            return pd.DataFrame(columns=['kaptCode', 'requested', 'collected', 'failed', 'missing', 'coverage',
+                                         'first_missing', 'missing_since'])
+
+        lo, window = self.window(starts, ends)
+        hi = lo + window.shape[1] - 1
+        done = self.bits(kapt_codes, lo, hi, statuses=(STATUS_DONE,)) & window
+        failed = self.bits(kapt_codes, lo, hi, statuses=(STATUS_FAILED,)) & window & ~done
+        missing = window & ~done
+
+        requested = window.sum(axis=1)
+        collected = done.sum(axis=1)
+        has_missing = missing.any(axis=1)
+
+        # 첫 누락 월, 마지막 수집 월 다음 달 (요청 기간 안에서)
+        first_missing = lo + missing.argmax(axis=1)
+        last_done = np.where(done.any(axis=1), hi - done[:, ::-1].argmax(axis=1), np.asarray(starts) - 1)
+        trailing = missing[np.arange(len(window)), np.asarray(ends) - lo]
+
+        def months(ordinals, valid):
+            return pd.Series(ordinal_month(ordinals), dtype='Int32').where(valid)
+
+        return pd.DataFrame({
+            'kaptCode': list(kapt_codes),
+            'requested': requested,
+            'collected': collected,
+            'failed': failed.sum(axis=1),
+            'missing': requested - collected,
+            'coverage': np.divide(collected, requested, out=np.zeros(len(requested)), where=requested > 0),
+            'first_missing': months(first_missing, has_missing),
+            'missing_since': months(last_done + 1, trailing),
+        })
+
+    def packed_bytes(self):
+        """
+        색인이 차지하는 비트맵 크기 (바이트)
+        """
+        return self.planes.nbytes
+
+    def count(self, status=STATUS_DONE):
+        """
+        단지별 상태 기록 월 수 (비트맵 바이트별 비트 수 합)
+        """
+        return POPCOUNT[self.planes[PLANES.index(status)]].sum(axis=1, dtype=np.int64)
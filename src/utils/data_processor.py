@@ -1,26 +1,41 @@
 import os
-import pandas as pd
+import sys
+import csv
+import time
 
+from openpyxl import load_workbook
 
-def update_metropolitan_data(file_name, source_folder='raw', target_folder='processed',
-                             output_suffix='_수도권', metropolitan_regions=None):
+# 수도권으로 간주할 기본 지역 목록
+METROPOLITAN_REGIONS = ['서울특별시', '경기도', '인천광역시']
+
+
+def format_cell(value):
     """
-    엑셀 파일에서 수도권(서울, 경기, 인천) 데이터만 추출하여 CSV로 저장하는 함수
+    엑셀 셀 값을 CSV 문자열로 변환 (빈 셀은 빈 문자열)
+    """
+    if value is None:
+        return ''
+    return str(value)
+
+
+def split_master_by_region(file_name, outputs, source_folder='raw', target_folder='processed',
+                           build_cache=True):
+    """
+    엑셀 파일을 한 번만 읽으면서 지역별로 행을 나누어 여러 CSV로 저장하는 함수
+
+    워크북을 읽기 전용 모드로 열어 한 행씩 읽고 바로 해당 지역의 CSV에 쓰므로, 전국 파일이
+    커져도 메모리 사용량이 행 수에 비례해 늘지 않습니다. 각 CSV는 임시 파일에 먼저 쓴 뒤 교체합니다.
 
     Args:
         file_name (str): 처리할 엑셀 파일명 (확장자 포함)
-        source_folder (str): 소스 엑셀 파일이 위치한 폴더 경로. 기본값 'xlsx'
-        target_folder (str): 결과 CSV 파일을 저장할 폴더 경로. 기본값 'csv'
-        output_suffix (str): 출력 파일명에 추가할 접미사. 기본값 '_수도권'
-        metropolitan_regions (list): 수도권으로 간주할 지역 목록. 기본값은 ['서울특별시, '경기도', '인천광역시']
+        outputs (dict): {출력 파일명 접미사: 지역 목록} 예: {'_수도권': ['서울특별시', '경기도', '인천광역시']}
+        source_folder (str): 소스 엑셀 파일이 위치한 폴더 이름 (기본값: 'raw')
+        target_folder (str): 결과 CSV 파일을 저장할 폴더 이름 (기본값: 'processed')
+        build_cache (bool): 저장한 CSV의 단지 기본정보 캐시(utils.master_data)를 미리 생성할지 여부
 
     Returns:
-        str: 생성된 CSV 파일 경로
+        dict: {출력 파일명 접미사: 생성된 CSV 파일 경로}
     """
-    if metropolitan_regions is None:
-        metropolitan_regions = ['서울특별시', '경기도', '인천광역시']
-
-    # 파일 경로 설정
     base_path = os.path.join(os.getcwd(), 'data')
     file_path = os.path.join(base_path, source_folder, file_name)
 
@@ -32,25 +47,121 @@ def update_metropolitan_data(file_name, source_folder='raw', target_folder='proc
     target_path = os.path.join(base_path, target_folder)
     os.makedirs(target_path, exist_ok=True)
 
-    # 엑셀 파일 읽기 (첫 번째 행은 제목)
-    df = pd.read_excel(file_path, skiprows=1)
+    # 지역 → 출력 접미사 목록 (한 지역이 여러 출력에 포함될 수 있음)
+    suffixes_by_region = {}
+    for suffix, regions in outputs.items():
+        for region in regions:
+            suffixes_by_region.setdefault(region, []).append(suffix)
+
+    stem = os.path.splitext(file_name)[0]
+    output_paths = {suffix: os.path.join(target_path, stem + suffix + '.csv') for suffix in outputs}
+    temp_paths = {suffix: path + '.tmp' for suffix, path in output_paths.items()}
+    row_counts = dict.fromkeys(outputs, 0)
+
+    start = time.monotonic()
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    files = {}
+    try:
+        writers = {}
+        for suffix, temp_path in temp_paths.items():
+            files[suffix] = open(temp_path, 'w', encoding='utf-8-sig', newline='')
+            writers[suffix] = csv.writer(files[suffix], lineterminator='\n')
+
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+
+        # 첫 번째 행은 제목, 두 번째 행은 컬럼명
+        next(rows, None)
+        header = list(next(rows, None) or [])
+        while header and header[-1] is None:
+            header.pop()
+        if not header:
+            raise ValueError(f"컬럼명 행을 찾을 수 없습니다: {file_path}")
+        width = len(header)
+
+        for writer in writers.values():
+            writer.writerow(format_cell(name) for name in header)
+
+        # 시도(첫 번째 컬럼)로 행을 걸러 해당 지역의 CSV에만 씀
+        for row in rows:
+            suffixes = suffixes_by_region.get(row[0] if row else None)
+            if not suffixes:
+                continue
+            values = [format_cell(value) for value in row[:width]]
+            values.extend([''] * (width - len(values)))
+            for suffix in suffixes:
+                writers[suffix].writerow(values)
+                row_counts[suffix] += 1
+
+        for f in files.values():
+            f.close()
+        for suffix, temp_path in temp_paths.items():
+            os.replace(temp_path, output_paths[suffix])
+    finally:
+        workbook.close()
+        for suffix, f in files.items():
+            f.close()
+            if os.path.exists(temp_paths[suffix]):
+                os.remove(temp_paths[suffix])
+
+    for suffix, output_path in output_paths.items():
+        print(f"{', '.join(outputs[suffix])} 데이터 {row_counts[suffix]}행이 성공적으로 저장되었습니다: {output_path}")
+    print(f"{file_name} 처리 완료 ({time.monotonic() - start:.1f}초)")
 
-    # 수도권 데이터만 필터링
-    df_metropolitan = df[df.iloc[:, 0].isin(metropolitan_regions)]
+    # 수집기와 분석 스크립트가 바로 캐시에서 읽을 수 있도록 변환 결과 저장
+    if build_cache:
+        from utils.master_data import load_master_data
+        for output_path in output_paths.values():
+            load_master_data(os.path.basename(output_path), source_folder=target_folder)
 
-    # 파일명 생성 (확장자 변경)
-    output_file_name = os.path.splitext(
-        file_name)[0] + output_suffix + '.csv'
-    output_path = os.path.join(target_path, output_file_name)
+    return output_paths
 
-    # CSV로 저장
-    df_metropolitan.to_csv(output_path, index=False, encoding='utf-8-sig')
 
-    print(f"수도권 데이터가 성공적으로 저장되었습니다: {output_path}")
-    return output_path
+def update_master_snapshots(file_names, outputs, source_folder='raw', target_folder='processed',
+                            build_cache=True):
+    """
+    여러 단지 기본정보 스냅샷 엑셀 파일을 지역별 CSV로 변환하는 함수 (파일마다 한 번씩 읽음)
+
+    Args:
+        file_names (list): 처리할 엑셀 파일명 목록
+        outputs (dict): {출력 파일명 접미사: 지역 목록}
+        source_folder (str): 소스 엑셀 파일이 위치한 폴더 이름 (기본값: 'raw')
+        target_folder (str): 결과 CSV 파일을 저장할 폴더 이름 (기본값: 'processed')
+        build_cache (bool): 저장한 CSV의 단지 기본정보 캐시를 미리 생성할지 여부
+
+    Returns:
+        dict: {엑셀 파일명: {출력 파일명 접미사: 생성된 CSV 파일 경로}}
+    """
+    return {file_name: split_master_by_region(file_name, outputs, source_folder, target_folder, build_cache)
+            for file_name in file_names}
+
+
+def update_metropolitan_data(file_name, source_folder='raw', target_folder='processed',
+                             output_suffix='_수도권', metropolitan_regions=None):
+    """
+    엑셀 파일에서 수도권(서울, 경기, 인천) 데이터만 추출하여 CSV로 저장하는 함수
+
+    Args:
+        file_name (str): 처리할 엑셀 파일명 (확장자 포함)
+        source_folder (str): 소스 엑셀 파일이 위치한 폴더 경로. 기본값 'raw'
+        target_folder (str): 결과 CSV 파일을 저장할 폴더 경로. 기본값 'processed'
+        output_suffix (str): 출력 파일명에 추가할 접미사. 기본값 '_수도권'
+        metropolitan_regions (list): 수도권으로 간주할 지역 목록. 기본값은 ['서울특별시, '경기도', '인천광역시']
+
+    Returns:
+        str: 생성된 CSV 파일 경로
+    """
+    if metropolitan_regions is None:
+        metropolitan_regions = METROPOLITAN_REGIONS
+
+    output_paths = split_master_by_region(file_name, {output_suffix: metropolitan_regions},
+                                          source_folder=source_folder, target_folder=target_folder)
+    return output_paths[output_suffix]
 
 
 if __name__ == "__main__":
+    # python src/utils/data_processor.py로 실행해도 utils 패키지를 찾을 수 있도록 src 폴더 추가
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
     file_name = '20250328_단지_기본정보.xlsx'
 
     try:
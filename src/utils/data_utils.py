@@ -3,14 +3,18 @@ import re
 import pandas as pd
 from typing import List
 
+from utils.schema import MONTH_DTYPE, month_ordinal
 
-def load_csv_data(file_name, source_folder='processed'):
+
+def load_csv_data(file_name, source_folder='processed', columns=None, dtype=None):
     """
     CSV 파일을 불러와 DataFrame으로 반환
 
     Args:
         file_name (str): CSV 파일 이름
         source_folder (str): CSV 파일이 위치한 폴더 이름 (기본값: 'processed')
+        columns (list): 불러올 컬럼 목록 (기본값: None, 전체 컬럼)
+        dtype (dict): 컬럼별 타입 (기본값: None, 타입 추론, utils.schema 참고)
 
     Returns:
         pandas.DataFrame: 불러온 CSV 데이터
@@ -25,7 +29,8 @@ def load_csv_data(file_name, source_folder='processed'):
         raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
 
     try:
-        return pd.read_csv(file_path, encoding='utf-8-sig', low_memory=False)
+        return pd.read_csv(file_path, encoding='utf-8-sig', low_memory=False,
+                           usecols=columns, dtype=dtype)
     except Exception as e:
         raise IOError(f"CSV 파일 로드 중 오류 발생: {e}")
 
@@ -55,13 +60,63 @@ def save_energy_data_to_csv(data_list, filename, output_folder='energy'):
     # 출력 디렉토리 확인 및 생성
     os.makedirs(output_dir, exist_ok=True)
 
+    df = pd.DataFrame(data_list)
+    header = not os.path.exists(filepath) or os.path.getsize(filepath) == 0
+
+    # 기존 파일에 이어 쓸 때는 기존 헤더의 컬럼 순서를 따름
+    if not header:
+        columns = pd.read_csv(filepath, encoding='utf-8-sig', nrows=0).columns
+        df = df.reindex(columns=columns)
+
     # DataFrame을 CSV 파일로 저장
-    pd.DataFrame(data_list).to_csv(filepath, mode='a', index=False, encoding='utf-8-sig',
-                                   header=not os.path.exists(filepath))
+    df.to_csv(filepath, mode='a', index=False, encoding='utf-8-sig', header=header)
 
     return filepath
 
 
+def energy_file_name(kapt_code, apt_name):
+    """
+    단지 코드 기준 에너지 데이터 파일명 생성
+
+    수집 기간을 파일명에 넣지 않으므로 달이 바뀌어도 같은 파일에 이어서 저장됩니다.
+
+    Args:
+        kapt_code (str): 단지 코드
+        apt_name (str): 단지명
+
+    Returns:
+        str: "{단지코드}_{단지명}.csv" 형식의 파일명
+    """
+    return f"{kapt_code}_{apt_name}.csv"
+
+
+def index_energy_files(source_folder='energy'):
+    """
+    에너지 데이터 폴더의 파일을 단지 코드별로 색인
+
+    이전 형식("{단지코드}_{단지명}_{시작월}_{종료월}.csv")의 파일도 단지 코드로 찾을 수 있습니다.
+
+    Args:
+        source_folder (str): 에너지 데이터 폴더 이름 (기본값: 'energy')
+
+    Returns:
+        dict: {단지 코드: 파일명}
+    """
+    directory = os.path.join(os.getcwd(), 'data', source_folder)
+    if not os.path.exists(directory):
+        return {}
+
+    file_index = {}
+    for file_name in sorted(get_csv_files(directory)):
+        kapt_code = file_name.split('_', 1)[0]
+        if kapt_code in file_index:
+            print(f"[{kapt_code}] 중복 파일 무시: {file_name} (사용 파일: {file_index[kapt_code]})")
+            continue
+        file_index[kapt_code] = file_name
+
+    return file_index
+
+
 def get_csv_files(directory: str) -> List[str]:
     """
     지정된 디렉토리에서 모든 CSV 파일의 목록을 가져옵니다.
@@ -99,6 +154,23 @@ def decoding_file_name(file_name: str) -> tuple:
     return None, None
 
 
+def drop_duplicate_months(df: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    """
+    같은 요청 월이 여러 번 기록된 경우 처음 행만 남깁니다.
+
+    수집 시 누적 통계(utils.trend_stats)도 단지별로 처음 반영한 요청 월만 사용하므로,
+    어느 경로로 분석해도 같은 데이터 포인트를 사용합니다.
+
+    Args:
+        df: 원본 데이터프레임
+        keys: 중복을 판단할 컬럼 목록 (예: ['kaptCode', 'requestMonth'])
+
+    Returns:
+        중복이 제거된 데이터프레임
+    """
+    return df.drop_duplicates(keys, keep='first')
+
+
 def filter_zero_energy_rows(df: pd.DataFrame, energy_columns: List[str]) -> pd.DataFrame:
     """
     모든 에너지 필드가 0인 행을 제거합니다.
@@ -126,6 +198,9 @@ def preprocess_time_columns(df: pd.DataFrame) -> pd.DataFrame:
     """
     시간 관련 컬럼을 전처리합니다.
 
+    requestMonth를 한 번만 정수 월 번호로 변환해 year(int32), month("01"~"12" 범주형),
+    month_index(int32 월 번호) 열을 만듭니다.
+
     Args:
         df: 원본 데이터프레임
 
@@ -135,14 +210,11 @@ def preprocess_time_columns(df: pd.DataFrame) -> pd.DataFrame:
     # 복사본 생성
     result_df = df.copy()
 
-    # 데이터 타입 안전하게 변환
-    # requestMonth가 이미 문자열인지 확인하고, 그렇지 않으면 문자열로 변환
-    if pd.api.types.is_numeric_dtype(result_df['requestMonth']):
-        result_df['requestMonth'] = result_df['requestMonth'].astype(str)
-
     # year와 month 열 생성
-    result_df['year'] = result_df['requestMonth'].str[:4].astype(int)
-    result_df['month'] = result_df['requestMonth'].str[-2:].astype(str)
+    month_index = month_ordinal(result_df['requestMonth'])
+    result_df['year'] = month_index // 12
+    result_df['month'] = pd.Categorical.from_codes(month_index % 12, dtype=MONTH_DTYPE)
+    result_df['month_index'] = month_index
 
     return result_df
 
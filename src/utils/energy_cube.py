@@ -0,0 +1,250 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.data_utils import drop_duplicate_months
+from utils.schema import ENERGY_COLUMNS, MONTH_LABELS, month_ordinal, ordinal_month
+
+CUBE_FOLDER = os.path.join('store', 'cube')
+
+# 큐브 파일 구성: 값, 관측 여부 마스크, 축 색인
+VALUES_FILE = 'energy.npy'
+MASK_FILE = 'mask.npy'
+CODES_FILE = 'kapt_codes.npy'
+MONTHS_FILE = 'months.npy'
+TYPES_FILE = 'energy_types.npy'
+
+
+def get_cube_dir(folder=CUBE_FOLDER):
+    return os.path.join(os.getcwd(), 'data', folder)
+
+
+def cube_exists(folder=CUBE_FOLDER):
+    """
+    에너지 큐브가 생성되어 있는지 확인
+    """
+    return os.path.exists(os.path.join(get_cube_dir(folder), VALUES_FILE))
+
+
+# 추세 통계를 계산할 때 한 번에 읽는 단지 수
+STATS_CHUNK = 2048
+
+
+def month_range(first, last):
+    """
+    두 월(YYYYMM) 사이의 연속된 월 목록
+
+    Args:
+        first (int): 시작 월(YYYYMM)
+        last (int): 종료 월(YYYYMM)
+
+    Returns:
+        numpy.ndarray: YYYYMM 정수 배열
+    """
+    start, end = month_ordinal(pd.Series([first, last]))
+    return ordinal_month(np.arange(start, end + 1))
+
+
+def build_energy_cube(df, folder=CUBE_FOLDER):
+    """
+    월별 에너지 사용량을 [단지 × 월 × 에너지 유형] float64 배열로 저장 (ENERGY_DATA_DTYPES와 같은 정밀도)
+
+    월 축은 처음부터 마지막 수집 월까지 빠짐없이 이어지므로 같은 달(예: 매년 1월)은
+    12칸 간격의 슬라이스로 선택할 수 있습니다. 값이 없는 칸은 NaN이며 mask가 False입니다.
+    (단지 코드, 요청 월)이 중복되면 처음 행을 사용하고(drop_duplicate_months), 임시 파일에 먼저 쓴 뒤 교체합니다.
+
+    Args:
+        df (pandas.DataFrame): kaptCode, requestMonth와 에너지 컬럼을 가진 DataFrame
+        folder (str): data 폴더 아래 큐브 경로 (기본값: 'store/cube')
+
+    Returns:
+        tuple: (단지 수, 월 수, 에너지 유형 수)
+    """
+    directory = get_cube_dir(folder)
+    os.makedirs(directory, exist_ok=True)
+
+    df = drop_duplicate_months(df, ['kaptCode', 'requestMonth'])
+    kapt_codes = np.array(sorted(df['kaptCode'].unique()), dtype=str)
+    request_months = df['requestMonth'].astype(str).str[:6].astype(np.int32).to_numpy()
+    months = month_range(request_months.min(), request_months.max())
+    energy_types = np.array(ENERGY_COLUMNS, dtype=str)
+
+    complex_pos = np.searchsorted(kapt_codes, df['kaptCode'].to_numpy(dtype=str))
+    month_pos = np.searchsorted(months, request_months)
+    shape = (len(kapt_codes), len(months), len(energy_types))
+
+    temp_paths = {name: os.path.join(directory, name + '.tmp')
+                  for name in (VALUES_FILE, MASK_FILE, CODES_FILE, MONTHS_FILE, TYPES_FILE)}
+
+    values = np.lib.format.open_memmap(temp_paths[VALUES_FILE], mode='w+', dtype=np.float64, shape=shape)
+    mask = np.lib.format.open_memmap(temp_paths[MASK_FILE], mode='w+', dtype=bool, shape=shape)
+    values[:] = np.nan
+    mask[:] = False
+
+    for type_pos, column in enumerate(energy_types):
+        column_values = df[column].to_numpy(dtype=np.float64) if column in df.columns \
+            else np.full(len(df), np.nan)
+        observed = ~np.isnan(column_values)
+        values[complex_pos[observed], month_pos[observed], type_pos] = column_values[observed]
+        mask[complex_pos[observed], month_pos[observed], type_pos] = True
+
+    values.flush()
+    mask.flush()
+    del values, mask
+
+    for name, array in ((CODES_FILE, kapt_codes), (MONTHS_FILE, months), (TYPES_FILE, energy_types)):
+        with open(temp_paths[name], 'wb') as f:
+            np.save(f, array)
+
+    for name, temp_path in temp_paths.items():
+        os.replace(temp_path, os.path.join(directory, name))
+
+    return shape
+
+
+class EnergyCube:
+    """
+    메모리 매핑된 [단지 × 월 × 에너지 유형] 에너지 사용량 배열
+
+    값과 마스크는 필요한 부분만 디스크에서 읽히며, complex/month/energy는
+    복사 없이 배열의 뷰를 반환합니다.
+    """
+
+    def __init__(self, folder=CUBE_FOLDER):
+        """
+        Args:
+            folder (str): data 폴더 아래 큐브 경로 (기본값: 'store/cube')
+
+        Raises:
+            FileNotFoundError: 큐브가 없을 경우
+        """
+        directory = get_cube_dir(folder)
+        if not cube_exists(folder):
+            raise FileNotFoundError(f"에너지 큐브를 찾을 수 없습니다: {directory}")
+
+        self.values = np.load(os.path.join(directory, VALUES_FILE), mmap_mode='r')
+        self.mask = np.load(os.path.join(directory, MASK_FILE), mmap_mode='r')
+        self.kapt_codes = np.load(os.path.join(directory, CODES_FILE))
+        self.months = np.load(os.path.join(directory, MONTHS_FILE))
+        self.energy_types = np.load(os.path.join(directory, TYPES_FILE))
+
+        self.complex_positions = {code: pos for pos, code in enumerate(self.kapt_codes.tolist())}
+        self.type_positions = {name: pos for pos, name in enumerate(self.energy_types.tolist())}
+        self.first_month = int(self.months[0])
+        self.first_ordinal = int(month_ordinal(pd.Series([self.first_month]))[0])
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def complex_index(self, kapt_code):
+        return self.complex_positions[kapt_code]
+
+    def month_index(self, req_month):
+        """
+        월(YYYYMM)의 월 축 위치
+
+        Raises:
+            KeyError: 큐브 범위 밖의 월인 경우
+        """
+        pos = int(month_ordinal(pd.Series([int(req_month)]))[0]) - self.first_ordinal
+        if not 0 <= pos < len(self.months):
+            raise KeyError(int(req_month))
+        return pos
+
+    def energy_index(self, energy_type):
+        return self.type_positions[energy_type]
+
+    def calendar_month_slice(self, month):
+        """
+        매년 같은 달(1~12)의 월 축 슬라이스
+        """
+        offset = (int(month) - self.first_month % 100) % 12
+        return slice(offset, None, 12)
+
+    def complex(self, kapt_code):
+        """
+        단지의 [월 × 에너지 유형] 뷰
+        """
+        return self.values[self.complex_index(kapt_code)]
+
+    def month(self, req_month):
+        """
+        월(YYYYMM)의 [단지 × 에너지 유형] 뷰
+        """
+        return self.values[:, self.month_index(req_month)]
+
+    def energy(self, energy_type):
+        """
+        에너지 유형의 [단지 × 월] 뷰
+        """
+        return self.values[:, :, self.energy_index(energy_type)]
+
+    def years(self, month=None):
+        """
+        월 축(또는 같은 달 슬라이스)의 연도 배열
+        """
+        months = self.months if month is None else self.months[self.calendar_month_slice(month)]
+        return months // 100
+
+    def trend_stats(self, kapt_codes=None, columns=None):
+        """
+        (단지, 월, 에너지 유형)별 연도-사용량 합계 통계 (utils.trend_stats.load_trend_stats와 같은 형식)
+
+        같은 달(매년 1월 등)의 12칸 간격 슬라이스마다 [단지 × 연도 × 에너지 유형] 배열로
+        평균과 평균을 뺀 제곱합/곱의 합을 계산합니다. 결측값과 0은 제외하며,
+        단지는 STATS_CHUNK개씩 읽으므로 큐브 전체를 메모리에 올리지 않습니다.
+
+        Args:
+            kapt_codes (list): 단지 코드 목록 (기본값: None, 전체 단지, 큐브에 없는 단지는 제외)
+            columns (list): 에너지 컬럼 목록 (기본값: None, 전체 에너지 유형)
+
+        Returns:
+            pandas.DataFrame: kaptCode, month, energy_type, n, mean_x, mean_y, sxx, syy, sxy, x0
+        """
+        codes = self.kapt_codes.tolist() if kapt_codes is None else \
+            [code for code in kapt_codes if code in self.complex_positions]
+        columns = list(columns or self.energy_types.tolist())
+        type_pos = [self.energy_index(column) for column in columns]
+
+        frames = []
+        for chunk_start in range(0, len(codes), STATS_CHUNK):
+            chunk = codes[chunk_start:chunk_start + STATS_CHUNK]
+            positions = np.sort([self.complex_index(code) for code in chunk])
+            values = self.values[positions][:, :, type_pos]
+            observed = self.mask[positions][:, :, type_pos]
+            chunk_codes = self.kapt_codes[positions]
+
+            for month in range(1, 13):
+                month_slice = self.calendar_month_slice(month)
+                years = self.years(month).astype(np.float64)[None, :, None]
+                y = values[:, month_slice]
+                valid = observed[:, month_slice] & (y != 0)
+
+                n = valid.sum(axis=1)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    mean_x = np.where(valid, years, 0).sum(axis=1) / n
+                    mean_y = np.where(valid, y, 0).sum(axis=1) / n
+                dx = np.where(valid, years - mean_x[:, None], 0)
+                dy = np.where(valid, y - mean_y[:, None], 0)
+                x0 = self.years(month)[valid.argmax(axis=1)]
+
+                complex_idx, type_idx = np.nonzero(n > 0)
+                frames.append(pd.DataFrame({
+                    'kaptCode': chunk_codes[complex_idx],
+                    'month': MONTH_LABELS[month - 1],
+                    'energy_type': np.asarray(columns)[type_idx],
+                    'n': n[complex_idx, type_idx],
+                    'mean_x': mean_x[complex_idx, type_idx],
+                    'mean_y': mean_y[complex_idx, type_idx],
+                    'sxx': (dx * dx).sum(axis=1)[complex_idx, type_idx],
+                    'syy': (dy * dy).sum(axis=1)[complex_idx, type_idx],
+                    'sxy': (dx * dy).sum(axis=1)[complex_idx, type_idx],
+                    'x0': x0[complex_idx, type_idx],
+                }))
+
+        if not frames:
+            return pd.DataFrame(columns=['kaptCode', 'month', 'energy_type', 'n', 'mean_x', 'mean_y',
+                                         'sxx', 'syy', 'sxy', 'x0'])
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,162 @@
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from utils.data_utils import drop_duplicate_months
+from utils.schema import ENERGY_COLUMNS, apply_dtypes
+
+STORE_FOLDER = os.path.join('store', 'energy')
+
+# 월별 에너지 사용량 스키마 (year는 파티션 컬럼)
+ENERGY_SCHEMA = pa.schema(
+    [('kaptCode', pa.string()),
+     ('kaptName', pa.string()),
+     ('requestMonth', pa.string()),
+     ('year', pa.int16())] +
+    [(column, pa.float64()) for column in ENERGY_COLUMNS]
+)
+
+# 파일 안에서 단지 코드로 행 그룹을 건너뛸 수 있도록 작게 나눔
+ROW_GROUP_SIZE = 16384
+
+
+def get_store_dir(folder=STORE_FOLDER):
+    return os.path.join(os.getcwd(), 'data', folder)
+
+
+def store_exists(folder=STORE_FOLDER):
+    """
+    에너지 데이터 저장소가 생성되어 있는지 확인
+    """
+    directory = get_store_dir(folder)
+    return os.path.isdir(directory) and any(name.startswith('year=') for name in os.listdir(directory))
+
+
+def to_store_frame(df, kapt_code, kapt_name):
+    """
+    단지 에너지 데이터 CSV를 저장소 스키마의 DataFrame으로 변환
+
+    Args:
+        df (pandas.DataFrame): 단지 에너지 데이터
+        kapt_code (str): 단지 코드 (파일명 기준)
+        kapt_name (str): 단지명 (파일명 기준)
+
+    Returns:
+        pandas.DataFrame: 저장소 스키마의 DataFrame
+    """
+    frame = pd.DataFrame({
+        'kaptCode': kapt_code,
+        'kaptName': kapt_name,
+        'requestMonth': df['requestMonth'].astype(str).str[:6].to_numpy(),
+    })
+    frame['year'] = frame['requestMonth'].str[:4].astype('int16')
+    for column in ENERGY_COLUMNS:
+        if column in df.columns:
+            frame[column] = pd.to_numeric(df[column], errors='coerce').astype('float64').to_numpy()
+        else:
+            frame[column] = float('nan')
+    return frame
+
+
+def write_energy_store(df, folder=STORE_FOLDER):
+    """
+    에너지 데이터 전체를 연도별로 분할한 Parquet 데이터셋으로 저장 (기존 저장소 교체)
+
+    (단지 코드, 요청 월)이 중복되면 처음 행을 사용합니다(drop_duplicate_months). 각 파일은 단지 코드와 월 순서로
+    정렬되어 있어 단지 코드 조건도 행 그룹 통계로 걸러집니다. 임시 폴더에 먼저 쓴 뒤 교체하므로
+    중간에 중단되어도 기존 저장소가 손상되지 않습니다.
+
+    Args:
+        df (pandas.DataFrame): 저장소 스키마의 DataFrame
+        folder (str): data 폴더 아래 저장소 경로 (기본값: 'store/energy')
+
+    Returns:
+        int: 저장한 행 수
+    """
+    directory = get_store_dir(folder)
+    temp_dir = directory + '.tmp'
+    old_dir = directory + '.old'
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+    df = (drop_duplicate_months(df, ['kaptCode', 'requestMonth'])
+            .sort_values(['kaptCode', 'requestMonth'], kind='stable')
+            .reset_index(drop=True))
+    table = pa.Table.from_pandas(df, schema=ENERGY_SCHEMA, preserve_index=False)
+
+    ds.write_dataset(table, temp_dir, format='parquet',
+                     partitioning=ds.partitioning(pa.schema([('year', pa.int16())]), flavor='hive'),
+                     max_rows_per_group=ROW_GROUP_SIZE, min_rows_per_group=ROW_GROUP_SIZE,
+                     file_options=ds.ParquetFileFormat().make_write_options(compression='zstd'),
+                     existing_data_behavior='error')
+
+    if os.path.exists(directory):
+        shutil.rmtree(old_dir, ignore_errors=True)
+        os.replace(directory, old_dir)
+    os.replace(temp_dir, directory)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    return len(df)
+
+
+def load_energy_store(columns=None, kapt_codes=None, years=None, months=None, folder=STORE_FOLDER):
+    """
+    에너지 데이터 저장소에서 필요한 컬럼과 행만 읽기
+
+    연도 조건은 파티션으로, 단지 코드 조건은 Parquet 행 그룹 통계로 걸러지고
+    요청한 컬럼만 디스크에서 읽습니다. 월 조건은 읽는 중에 적용됩니다.
+
+    Args:
+        columns (list): 읽을 에너지 컬럼 목록 (기본값: None, 전체 에너지 컬럼)
+        kapt_codes (list): 읽을 단지 코드 목록 (기본값: None, 전체 단지)
+        years (list): 읽을 연도 목록 (기본값: None, 전체 연도)
+        months (list): 읽을 월("01"~"12") 목록 (기본값: None, 전체 월)
+        folder (str): data 폴더 아래 저장소 경로 (기본값: 'store/energy')
+
+    Returns:
+        pandas.DataFrame: kaptCode, kaptName(범주형), requestMonth와 요청한 에너지 컬럼
+
+    Raises:
+        FileNotFoundError: 저장소가 없을 경우
+    """
+    directory = get_store_dir(folder)
+    if not store_exists(folder):
+        raise FileNotFoundError(f"에너지 데이터 저장소를 찾을 수 없습니다: {directory}")
+
+    dataset = ds.dataset(directory, format='parquet', partitioning='hive',
+                         schema=ENERGY_SCHEMA)
+
+    expression = None
+    conditions = []
+    if kapt_codes is not None:
+        conditions.append(ds.field('kaptCode').isin(list(kapt_codes)))
+    if years is not None:
+        conditions.append(ds.field('year').isin([int(year) for year in years]))
+    if months is not None:
+        conditions.append(pc.utf8_slice_codeunits(ds.field('requestMonth'), 4, 6)
+                          .isin([str(month).zfill(2) for month in months]))
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    selected = ['kaptCode', 'kaptName', 'requestMonth'] + list(columns or ENERGY_COLUMNS)
+    table = dataset.to_table(columns=selected, filter=expression)
+
+    df = apply_dtypes(table.to_pandas(), {'kaptCode': 'category', 'kaptName': 'category'})
+    return df.sort_values(['kaptCode', 'requestMonth'], kind='stable').reset_index(drop=True)
+
+
+def store_file_sizes(folder=STORE_FOLDER):
+    """
+    저장소 파일 수와 전체 크기(바이트)
+    """
+    directory = get_store_dir(folder)
+    count = size = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith('.parquet'):
+                count += 1
+                size += os.path.getsize(os.path.join(root, name))
+    return count, size
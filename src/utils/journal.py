@@ -0,0 +1,158 @@
+import os
+import json
+
+JOURNAL_FOLDER = os.path.join('state', 'journal')
+JOURNAL_SUFFIX = '.jsonl'
+
+
+def get_journal_dir():
+    return os.path.join(os.getcwd(), 'data', JOURNAL_FOLDER)
+
+
+def journal_path(filename):
+    """
+    에너지 데이터 파일에 대응하는 저널 파일 경로
+
+    Args:
+        filename (str): 에너지 데이터 파일명
+
+    Returns:
+        str: 저널 파일 경로
+    """
+    return os.path.join(get_journal_dir(), filename + JOURNAL_SUFFIX)
+
+
+def fsync_file(file_path):
+    """
+    파일 내용을 디스크에 기록
+
+    Args:
+        file_path (str): 파일 경로
+    """
+    with open(file_path, 'rb') as f:
+        os.fsync(f.fileno())
+
+
+class JournalWriter:
+    """
+    수집 결과를 단지별 저널 파일에 한 줄씩 추가하는 기록기
+
+    write는 운영체제 버퍼까지 기록하므로 프로세스가 종료되어도 남으며,
+    sync는 열려 있는 저널을 디스크에 기록합니다.
+    """
+
+    def __init__(self):
+        self.files = {}
+        os.makedirs(get_journal_dir(), exist_ok=True)
+
+    def write(self, filename, item):
+        f = self.files.get(filename)
+        if f is None:
+            f = open(journal_path(filename), 'a', encoding='utf-8')
+            self.files[filename] = f
+        f.write(json.dumps(item, ensure_ascii=False) + '\n')
+        f.flush()
+
+    def sync(self):
+        for f in self.files.values():
+            os.fsync(f.fileno())
+
+    def remove(self, filename):
+        """
+        CSV와 매니페스트에 반영된 저널 삭제
+        """
+        f = self.files.pop(filename, None)
+        if f is not None:
+            f.close()
+        remove_journal(filename)
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        self.files = {}
+
+
+def read_journal(filename):
+    """
+    저널에 기록된 수집 결과 읽기 (중간에 끊긴 마지막 줄은 무시)
+
+    Args:
+        filename (str): 에너지 데이터 파일명
+
+    Returns:
+        list: 수집된 월 데이터 목록
+    """
+    items = []
+    path = journal_path(filename)
+    if not os.path.exists(path):
+        return items
+
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                break
+
+    return items
+
+
+def list_journals():
+    """
+    남아 있는 저널의 에너지 데이터 파일명 목록
+
+    Returns:
+        list: 에너지 데이터 파일명 목록
+    """
+    directory = get_journal_dir()
+    if not os.path.exists(directory):
+        return []
+
+    return sorted(name[:-len(JOURNAL_SUFFIX)] for name in os.listdir(directory)
+                  if name.endswith(JOURNAL_SUFFIX))
+
+
+def repair_csv_tail(file_path):
+    """
+    쓰기 도중 중단되어 끊긴 CSV 마지막 줄 제거
+
+    Args:
+        file_path (str): CSV 파일 경로
+
+    Returns:
+        bool: 끊긴 줄을 제거했는지 여부
+    """
+    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        return False
+
+    with open(file_path, 'rb+') as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) == b'\n':
+            return False
+
+        # 마지막 줄바꿈 위치를 찾아 그 뒤를 잘라냄
+        size = f.tell()
+        position = size
+        while position > 0:
+            step = min(4096, position)
+            position -= step
+            f.seek(position)
+            chunk = f.read(step)
+            index = chunk.rfind(b'\n')
+            if index != -1:
+                f.truncate(position + index + 1)
+                return True
+        f.truncate(0)
+        return True
+
+
+def remove_journal(filename):
+    """
+    저널 파일 삭제
+
+    Args:
+        filename (str): 에너지 데이터 파일명
+    """
+    path = journal_path(filename)
+    if os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,259 @@
+import os
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from utils.date_utils import get_monthly_dates
+
+MANIFEST_FOLDER = 'state'
+MANIFEST_FILENAME = 'manifest.sqlite'
+
+# 수집 상태
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS manifest (
+    kaptCode TEXT NOT NULL,
+    month TEXT NOT NULL,
+    status TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    result_code TEXT,
+    PRIMARY KEY (kaptCode, month)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_manifest_status ON manifest (status, kaptCode);
+
+CREATE TABLE IF NOT EXISTS quota_usage (
+    day TEXT NOT NULL,
+    key_id TEXT NOT NULL,
+    requests INTEGER NOT NULL,
+    PRIMARY KEY (day, key_id)
+);
+
+CREATE TABLE IF NOT EXISTS synced_files (
+    filename TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+"""
+
+
+def open_manifest(folder=MANIFEST_FOLDER, filename=MANIFEST_FILENAME):
+    """
+    수집 매니페스트 데이터베이스 연결 (없으면 생성)
+
+    Args:
+        folder (str): data 폴더 아래 매니페스트 폴더 이름 (기본값: 'state')
+        filename (str): 매니페스트 파일명 (기본값: 'manifest.sqlite')
+
+    Returns:
+        sqlite3.Connection: 매니페스트 연결
+    """
+    directory = os.path.join(os.getcwd(), 'data', folder)
+    os.makedirs(directory, exist_ok=True)
+
+    # 여러 작업자가 같은 매니페스트를 사용하므로 잠금 대기 시간 설정
+    conn = sqlite3.connect(os.path.join(directory, filename), timeout=60)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def record_months(conn, kapt_code, months, status, result_code=None):
+    """
+    단지의 월별 수집 결과를 매니페스트에 기록 (기존 기록은 덮어씀)
+
+    Args:
+        conn: 매니페스트 연결
+        kapt_code (str): 단지 코드
+        months (list): 기록할 월 목록 (YYYYMM)
+        status (str): 수집 상태 (STATUS_DONE, STATUS_FAILED)
+        result_code (str): API 응답 코드 또는 실패 분류
+    """
+    fetched_at = datetime.now().isoformat(timespec='seconds')
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO manifest (kaptCode, month, status, fetched_at, result_code) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(kapt_code, str(month), status, fetched_at, result_code) for month in months])
+
+
+def mark_file_synced(conn, filename, source_folder='energy'):
+    """
+    에너지 데이터 파일의 현재 상태가 매니페스트에 반영되었음을 기록
+
+    Args:
+        conn: 매니페스트 연결
+        filename (str): 에너지 데이터 파일명
+        source_folder (str): 에너지 데이터 폴더 이름 (기본값: 'energy')
+    """
+    stat = os.stat(os.path.join(os.getcwd(), 'data', source_folder, filename))
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO synced_files (filename, mtime, size) VALUES (?, ?, ?)",
+                     (filename, stat.st_mtime, stat.st_size))
+
+
+def sync_energy_files(conn, file_index, source_folder='energy'):
+    """
+    매니페스트에 반영되지 않은(새로 생기거나 변경된) 에너지 데이터 파일의 월을 기록
+
+    처음 실행할 때 한 번 기존 CSV를 읽어 매니페스트를 만들고, 이후에는
+    변경된 파일만 다시 읽습니다.
+
+    Args:
+        conn: 매니페스트 연결
+        file_index (dict): {단지 코드: 파일명}
+        source_folder (str): 에너지 데이터 폴더 이름 (기본값: 'energy')
+
+    Returns:
+        int: 새로 반영한 파일 수
+    """
+    synced = {filename: (mtime, size) for filename, mtime, size in
+              conn.execute("SELECT filename, mtime, size FROM synced_files")}
+    directory = os.path.join(os.getcwd(), 'data', source_folder)
+
+    count = 0
+    for kapt_code, filename in file_index.items():
+        stat = os.stat(os.path.join(directory, filename))
+        if synced.get(filename) == (stat.st_mtime, stat.st_size):
+            continue
+
+        try:
+            months = pd.read_csv(os.path.join(directory, filename), encoding='utf-8-sig',
+                                 usecols=['requestMonth'])['requestMonth'].astype(str)
+        except Exception as e:
+            print(f"[{filename}] 매니페스트 반영 실패: {e}")
+            continue
+        fetched_at = datetime.fromtimestamp(
+            stat.st_mtime).isoformat(timespec='seconds')
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO manifest (kaptCode, month, status, fetched_at, result_code) "
+                "VALUES (?, ?, ?, ?, NULL)",
+                [(kapt_code, month, STATUS_DONE, fetched_at) for month in months])
+            conn.execute("INSERT OR REPLACE INTO synced_files (filename, mtime, size) VALUES (?, ?, ?)",
+                         (filename, stat.st_mtime, stat.st_size))
+        count += 1
+
+    return count
+
+
+def get_missing_months(conn, targets, include_failed=False):
+    """
+    단지별 요청 기간 중 매니페스트에 기록이 없는 월 조회
+
+    요청 기간과 월 목록을 임시 테이블로 만든 뒤, (kaptCode, month) 기본 키를 사용하는
+    한 번의 조인 쿼리로 전체 단지의 누락 월을 구합니다. 실패로 기록된 월은 누락으로 보지 않습니다.
+
+    Args:
+        conn: 매니페스트 연결
+        targets (list): (단지 코드, 시작 년월, 종료 년월) 목록
+        include_failed (bool): 실패로 기록된 월도 누락으로 포함 (기본값: False)
+
+    Returns:
+        dict: {단지 코드: 누락 월 목록 (오름차순)}
+    """
+    if not targets:
+        return {}
+
+    start = min(start_date for _, start_date, _ in targets)
+    end = max(end_date for _, _, end_date in targets)
+
+    with conn:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS plan_targets "
+                     "(kaptCode TEXT PRIMARY KEY, start_month TEXT, end_month TEXT)")
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS plan_months (month TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM plan_targets")
+        conn.execute("DELETE FROM plan_months")
+        conn.executemany("INSERT OR REPLACE INTO plan_targets VALUES (?, ?, ?)", targets)
+        conn.executemany("INSERT INTO plan_months VALUES (?)",
+                         [(month,) for month in get_monthly_dates(start, end)])
+
+    rows = conn.execute("""
+        SELECT t.kaptCode, m.month
+        FROM plan_targets t
+        JOIN plan_months m ON m.month BETWEEN t.start_month AND t.end_month
+        LEFT JOIN manifest f ON f.kaptCode = t.kaptCode AND f.month = m.month
+        WHERE f.kaptCode IS NULL OR (? AND f.status = ?)
+        ORDER BY t.kaptCode, m.month
+    """, (include_failed, STATUS_FAILED))
+
+    missing = {}
+    for kapt_code, month in rows:
+        missing.setdefault(kapt_code, []).append(month)
+
+    return missing
+
+
+def add_quota_usage(conn, count=1, key_id='default', day=None):
+    """
+    서비스 키의 일일 요청 수 누적
+
+    Args:
+        conn: 매니페스트 연결
+        count (int): 추가할 요청 수
+        key_id (str): 서비스 키 식별자 (기본값: 'default')
+        day (str): 날짜 (YYYY-MM-DD, 기본값: 오늘)
+    """
+    day = day or datetime.now().strftime('%Y-%m-%d')
+    with conn:
+        conn.execute(
+            "INSERT INTO quota_usage (day, key_id, requests) VALUES (?, ?, MAX(?, 0)) "
+            "ON CONFLICT (day, key_id) DO UPDATE SET requests = MAX(requests + ?, 0)",
+            (day, key_id, count, count))
+
+
+def reserve_quota(conn, key_id, count, daily_limit, day=None):
+    """
+    서비스 키의 일일 요청 수를 한도 안에서 미리 확보
+
+    사용량을 읽고 늘리는 동안 쓰기 잠금을 유지하므로, 같은 키를 쓰는 여러 작업자가
+    동시에 확보해도 합계가 일일 한도를 넘지 않습니다.
+
+    Args:
+        conn: 매니페스트 연결
+        key_id (str): 서비스 키 식별자
+        count (int): 확보할 요청 수
+        daily_limit (int): 키별 일일 요청 한도
+        day (str): 날짜 (YYYY-MM-DD, 기본값: 오늘)
+
+    Returns:
+        tuple: (확보한 요청 수, 확보 후 오늘 사용량)
+    """
+    day = day or datetime.now().strftime('%Y-%m-%d')
+    with conn:
+        # 먼저 쓰기를 시작해 쓰기 잠금을 잡은 뒤 사용량을 읽음
+        conn.execute("INSERT OR IGNORE INTO quota_usage (day, key_id, requests) VALUES (?, ?, 0)",
+                     (day, key_id))
+        used = conn.execute("SELECT requests FROM quota_usage WHERE day = ? AND key_id = ?",
+                            (day, key_id)).fetchone()[0]
+        granted = max(min(count, daily_limit - used), 0)
+        if granted:
+            conn.execute("UPDATE quota_usage SET requests = requests + ? WHERE day = ? AND key_id = ?",
+                         (granted, day, key_id))
+    return granted, used + granted
+
+
+def get_quota_usage(conn, key_id=None, day=None):
+    """
+    서비스 키의 일일 요청 수 조회
+
+    Args:
+        conn: 매니페스트 연결
+        key_id (str): 서비스 키 식별자 (기본값: None, 전체 키 합계)
+        day (str): 날짜 (YYYY-MM-DD, 기본값: 오늘)
+
+    Returns:
+        int: 해당 날짜의 요청 수
+    """
+    day = day or datetime.now().strftime('%Y-%m-%d')
+    if key_id is None:
+        row = conn.execute(
+            "SELECT COALESCE(SUM(requests), 0) FROM quota_usage WHERE day = ?", (day,)).fetchone()
+    else:
+        row = conn.execute("SELECT COALESCE(SUM(requests), 0) FROM quota_usage WHERE day = ? AND key_id = ?",
+                           (day, key_id)).fetchone()
+    return row[0]
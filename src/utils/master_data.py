@@ -0,0 +1,146 @@
+import os
+import threading
+import unicodedata
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.schema import MASTER_DATE_COLUMNS, MASTER_DTYPES
+
+MASTER_FOLDER = 'processed'
+CACHE_FOLDER = os.path.join('store', 'master')
+
+# 캐시 파일 메타데이터 키 (원본 파일 지문과 스키마가 같을 때만 캐시 사용)
+CACHE_METADATA_KEY = b'master_source'
+
+
+def resolve_data_file(file_name, source_folder=MASTER_FOLDER):
+    """
+    data 폴더의 파일 경로 찾기
+
+    macOS에서 만든 파일은 한글 파일명이 NFD로 저장되어 있어 같은 이름이라도 NFC 문자열로는
+    찾을 수 없으므로, 정확히 일치하는 파일이 없으면 정규화한 이름으로 비교합니다.
+
+    Args:
+        file_name (str): 파일 이름
+        source_folder (str): data 폴더 아래 폴더 이름 (기본값: 'processed')
+
+    Returns:
+        str: 파일 경로
+
+    Raises:
+        FileNotFoundError: 파일이 존재하지 않을 경우
+    """
+    directory = os.path.join(os.getcwd(), 'data', source_folder)
+    file_path = os.path.join(directory, file_name)
+    if os.path.exists(file_path):
+        return file_path
+
+    normalized = unicodedata.normalize('NFC', file_name)
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            if unicodedata.normalize('NFC', name) == normalized:
+                return os.path.join(directory, name)
+
+    raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
+
+
+def parse_date_column(values):
+    """
+    YYYYMMDD 형식(문자열 또는 실수) 날짜 컬럼을 날짜 타입으로 변환 (형식이 다르면 NaT)
+    """
+    text = values.astype('str').str.split('.', n=1).str[0]
+    return pd.to_datetime(text, format='%Y%m%d', errors='coerce')
+
+
+def read_master_csv(file_path, columns):
+    """
+    단지 기본정보 CSV에서 지정한 컬럼만 스키마 타입으로 읽기
+    """
+    wanted = set(columns)
+    dtypes = {column: dtype for column, dtype in MASTER_DTYPES.items() if column in wanted}
+    dtypes.update({column: 'str' for column in MASTER_DATE_COLUMNS if column in wanted})
+
+    df = pd.read_csv(file_path, encoding='utf-8-sig', usecols=lambda column: column in wanted, dtype=dtypes)
+    for column in MASTER_DATE_COLUMNS:
+        if column in df.columns:
+            df[column] = parse_date_column(df[column])
+
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        raise ValueError(f"지정한 컬럼이 파일에 존재하지 않습니다: {missing}")
+    return df[list(columns)]
+
+
+def source_fingerprint(file_path, columns):
+    stat = os.stat(file_path)
+    return f"{stat.st_mtime}:{stat.st_size}:{','.join(columns)}".encode('utf-8')
+
+
+def get_cache_path(file_name, folder=CACHE_FOLDER):
+    stem = os.path.splitext(unicodedata.normalize('NFC', file_name))[0]
+    return os.path.join(os.getcwd(), 'data', folder, stem + '.parquet')
+
+
+def load_master_data(file_name, columns=None, source_folder=MASTER_FOLDER, use_cache=True):
+    """
+    단지 기본정보를 스키마 타입으로 불러오기
+
+    스키마(utils.schema.MASTER_DTYPES)에 있는 컬럼은 필요한 것만 정해진 타입으로 읽고, 사용승인일은
+    날짜 타입(결측값은 NaT)으로 변환합니다. 변환한 결과는 data/store/master에 Parquet으로 저장해 두고,
+    원본 파일이 바뀌지 않았으면 CSV를 다시 읽지 않고 캐시에서 필요한 컬럼만 읽습니다.
+
+    Args:
+        file_name (str): 단지 기본정보 CSV 파일 이름
+        columns (list): 불러올 컬럼 목록 (기본값: None, 스키마에 있는 모든 컬럼)
+        source_folder (str): CSV 파일이 위치한 폴더 이름 (기본값: 'processed')
+        use_cache (bool): 변환 결과 캐시 사용 여부 (기본값: True)
+
+    Returns:
+        pandas.DataFrame: 요청한 컬럼의 단지 기본정보
+
+    Raises:
+        FileNotFoundError: 파일이 존재하지 않을 경우
+        ValueError: 지정한 컬럼이 파일에 없을 경우
+    """
+    file_path = resolve_data_file(file_name, source_folder)
+    schema_columns = list(MASTER_DTYPES) + MASTER_DATE_COLUMNS
+    columns = list(columns or schema_columns)
+
+    # 스키마에 없는 컬럼은 캐시하지 않고 원본에서 읽음
+    if not use_cache or not set(columns) <= set(schema_columns):
+        return read_master_csv(file_path, columns)
+
+    # 캐시에는 원본에 있는 스키마 컬럼을 모두 저장
+    fingerprint = source_fingerprint(file_path, schema_columns)
+    cache_path = get_cache_path(file_name)
+
+    if os.path.exists(cache_path):
+        try:
+            schema = pq.read_schema(cache_path)
+            if (schema.metadata or {}).get(CACHE_METADATA_KEY) == fingerprint:
+                missing = [column for column in columns if column not in schema.names]
+                if missing:
+                    raise ValueError(f"지정한 컬럼이 파일에 존재하지 않습니다: {missing}")
+                df = pq.read_table(cache_path, columns=columns).to_pandas()
+                return df.astype({column: MASTER_DTYPES[column] for column in columns
+                                  if MASTER_DTYPES.get(column) == 'category'})
+        except (OSError, pa.ArrowException) as e:
+            print(f"단지 기본정보 캐시를 읽지 못해 원본을 다시 읽습니다: {e}")
+
+    header = pd.read_csv(file_path, encoding='utf-8-sig', nrows=0).columns
+    df = read_master_csv(file_path, [column for column in schema_columns if column in header])
+
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), CACHE_METADATA_KEY: fingerprint})
+    # 여러 프로세스가 동시에 캐시를 만들 수 있으므로 임시 파일 이름을 구분
+    temp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    pq.write_table(table, temp_path, compression='zstd')
+    os.replace(temp_path, cache_path)
+
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        raise ValueError(f"지정한 컬럼이 파일에 존재하지 않습니다: {missing}")
+    return df[columns]
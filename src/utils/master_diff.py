@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+from utils.master_data import MASTER_FOLDER, load_master_data
+
+KEY_COLUMN = '단지코드'
+
+# 단지 변경 유형
+CHANGE_ADDED = 'added'
+CHANGE_REMOVED = 'removed'
+CHANGE_CHANGED = 'changed'
+
+CHANGE_LABELS = {
+    CHANGE_ADDED: '추가',
+    CHANGE_REMOVED: '삭제',
+    CHANGE_CHANGED: '변경',
+}
+
+
+def values_differ(old_values, new_values):
+    """
+    같은 단지의 이전 값과 새 값이 다른지 비교 (둘 다 결측값이면 같은 값)
+
+    범주형 컬럼은 스냅샷마다 범주 목록이 달라 그대로 비교할 수 없으므로 값으로 비교합니다.
+    """
+    old_values = old_values.astype(object)
+    new_values = new_values.astype(object)
+    both_missing = old_values.isna().to_numpy() & new_values.isna().to_numpy()
+    one_missing = old_values.isna().to_numpy() ^ new_values.isna().to_numpy()
+    equal = (old_values == new_values).to_numpy(dtype=bool, na_value=False)
+    return one_missing | ~(equal | both_missing)
+
+
+def diff_master_snapshots(old_df, new_df, columns=None):
+    """
+    두 단지 기본정보 스냅샷을 단지코드 기준으로 비교
+
+    단지코드로 맞춘 뒤 컬럼 단위로 한 번에 비교하므로 단지 수가 많아도 행마다 반복하지 않습니다.
+
+    Args:
+        old_df (pandas.DataFrame): 이전 스냅샷 (단지코드 컬럼 포함)
+        new_df (pandas.DataFrame): 새 스냅샷 (단지코드 컬럼 포함)
+        columns (list): 비교할 컬럼 목록 (기본값: None, 두 스냅샷에 모두 있는 컬럼)
+
+    Returns:
+        pandas.DataFrame: 바뀐 단지만 담은 단지코드, 단지명, change(added/removed/changed),
+            changed_columns(쉼표로 구분한 바뀐 컬럼, 변경일 때만) (단지코드 순서)
+    """
+    if columns is None:
+        columns = [column for column in new_df.columns if column in old_df.columns]
+    columns = [column for column in columns if column != KEY_COLUMN]
+
+    old = old_df.drop_duplicates(KEY_COLUMN).set_index(KEY_COLUMN)
+    new = new_df.drop_duplicates(KEY_COLUMN).set_index(KEY_COLUMN)
+
+    added = new.index.difference(old.index)
+    removed = old.index.difference(new.index)
+    common = new.index.intersection(old.index)
+
+    # 컬럼별로 바뀐 단지 표시 (단지 수 x 컬럼 수)
+    changed_mask = pd.DataFrame({column: values_differ(old.loc[common, column], new.loc[common, column])
+                                 for column in columns}, index=common)
+    changed = changed_mask.index[changed_mask.any(axis=1)] if columns else common[:0]
+    changed_columns = [','.join(changed_mask.columns[flags])
+                       for flags in changed_mask.loc[changed].to_numpy()]
+
+    def names(frame, codes):
+        if '단지명' in frame.columns:
+            return frame.loc[codes, '단지명'].astype(object).to_numpy()
+        return [None] * len(codes)
+
+    diff = pd.concat([
+        pd.DataFrame({KEY_COLUMN: added, '단지명': names(new, added), 'change': CHANGE_ADDED, 'changed_columns': ''}),
+        pd.DataFrame({KEY_COLUMN: removed, '단지명': names(old, removed), 'change': CHANGE_REMOVED,
+                      'changed_columns': ''}),
+        pd.DataFrame({KEY_COLUMN: changed, '단지명': names(new, changed), 'change': CHANGE_CHANGED,
+                      'changed_columns': changed_columns}),
+    ], ignore_index=True)
+    return diff.sort_values(KEY_COLUMN, kind='stable').reset_index(drop=True)
+
+
+def load_snapshot_diff(old_file, new_file, columns=None, source_folder=MASTER_FOLDER):
+    """
+    두 단지 기본정보 스냅샷 파일을 스키마 타입으로 불러와 비교 (변환 결과 캐시 사용)
+
+    Args:
+        old_file (str): 이전 스냅샷 CSV 파일 이름
+        new_file (str): 새 스냅샷 CSV 파일 이름
+        columns (list): 비교할 스키마 컬럼 목록 (기본값: None, 두 스냅샷에 모두 있는 스키마 컬럼)
+        source_folder (str): CSV 파일이 위치한 폴더 이름 (기본값: 'processed')
+
+    Returns:
+        pandas.DataFrame: diff_master_snapshots 결과
+    """
+    load_columns = None if columns is None else [KEY_COLUMN] + [column for column in columns
+                                                                if column != KEY_COLUMN]
+    old_df = load_master_data(old_file, columns=load_columns, source_folder=source_folder)
+    new_df = load_master_data(new_file, columns=load_columns, source_folder=source_folder)
+    return diff_master_snapshots(old_df, new_df, columns)
+
+
+def affected_codes(diff, changes=(CHANGE_ADDED, CHANGE_CHANGED), columns=None):
+    """
+    스냅샷 비교 결과에서 다시 처리해야 할 단지코드 조회
+
+    Args:
+        diff (pandas.DataFrame): diff_master_snapshots 결과
+        changes (tuple): 포함할 변경 유형 (기본값: 추가, 변경)
+        columns (list): 변경된 단지는 이 컬럼 중 하나가 바뀐 경우만 포함 (기본값: None, 모든 컬럼)
+
+    Returns:
+        set: 단지코드 집합
+    """
+    selected = diff[diff['change'].isin(list(changes))]
+    if columns is not None:
+        wanted = set(columns)
+        relevant = [selected_change != CHANGE_CHANGED or bool(wanted & set(changed.split(',')))
+                    for selected_change, changed in zip(selected['change'], selected['changed_columns'])]
+        selected = selected[np.array(relevant, dtype=bool)]
+    return set(selected[KEY_COLUMN])
+
+
+def print_diff_summary(diff, old_file=None, new_file=None):
+    """
+    스냅샷 비교 결과 요약 출력 (변경 유형별 단지 수, 컬럼별 변경 단지 수)
+    """
+    if old_file and new_file:
+        print(f"단지 기본정보 비교: {old_file} -> {new_file}")
+    counts = diff['change'].value_counts()
+    print(", ".join(f"{label} {counts.get(change, 0)}개 단지" for change, label in CHANGE_LABELS.items()))
+
+    changed_columns = diff.loc[diff['change'] == CHANGE_CHANGED, 'changed_columns'].str.split(',').explode()
+    for column, count in changed_columns.value_counts().items():
+        print(f"  - {column}: {count}개 단지")
+
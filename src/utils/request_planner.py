@@ -0,0 +1,120 @@
+import math
+
+# 요청 우선순위 전략
+STRATEGY_NEWEST_FIRST = 'newest_first'      # 전체 단지의 최신 월부터 요청한 뒤 과거 월을 채움
+STRATEGY_COMPLEX_ORDER = 'complex_order'    # 단지 순서대로 각 단지의 전체 기간을 요청 (기존 방식)
+
+STRATEGIES = (STRATEGY_NEWEST_FIRST, STRATEGY_COMPLEX_ORDER)
+
+
+def order_requests(missing, strategy=STRATEGY_NEWEST_FIRST):
+    """
+    누락 월을 우선순위에 따라 (단지 코드, 월) 요청 목록으로 정렬
+
+    Args:
+        missing (dict): {단지 코드: 누락 월 목록}
+        strategy (str): 우선순위 전략 (STRATEGY_NEWEST_FIRST, STRATEGY_COMPLEX_ORDER)
+
+    Returns:
+        list: (단지 코드, 월) 요청 목록
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"지원하지 않는 우선순위 전략입니다: {strategy}")
+
+    requests = [(kapt_code, month)
+                for kapt_code, months in missing.items() for month in months]
+
+    if strategy == STRATEGY_NEWEST_FIRST:
+        # 월 내림차순, 같은 월은 단지 코드 순
+        requests.sort(key=lambda request: request[0])
+        requests.sort(key=lambda request: request[1], reverse=True)
+
+    return requests
+
+
+def build_request_schedule(missing, daily_budget, strategy=STRATEGY_NEWEST_FIRST,
+                           first_day_budget=None):
+    """
+    일일 요청 한도에 맞춰 날짜별 요청 일정 생성
+
+    Args:
+        missing (dict): {단지 코드: 누락 월 목록}
+        daily_budget (int): 하루 요청 한도
+        strategy (str): 우선순위 전략
+        first_day_budget (int): 오늘 남은 요청 수 (기본값: None, daily_budget과 동일)
+
+    Returns:
+        list: 날짜별 (단지 코드, 월) 요청 목록. 첫 번째 항목이 오늘 처리할 요청
+    """
+    if daily_budget <= 0:
+        raise ValueError("일일 요청 한도는 1 이상이어야 합니다")
+
+    requests = order_requests(missing, strategy)
+    if first_day_budget is None:
+        first_day_budget = daily_budget
+    first_day_budget = max(first_day_budget, 0)
+
+    schedule = [requests[:first_day_budget]]
+    for start in range(first_day_budget, len(requests), daily_budget):
+        schedule.append(requests[start:start + daily_budget])
+
+    # 오늘 남은 요청이 없고 다음 날로 넘어가는 요청도 없는 경우 빈 일정
+    if not schedule[0] and len(schedule) == 1:
+        return []
+
+    return schedule
+
+
+def estimate_backfill_days(total_requests, daily_budget, first_day_budget=None):
+    """
+    전체 누락 월을 수집하는 데 필요한 일수 계산
+
+    Args:
+        total_requests (int): 전체 요청 수
+        daily_budget (int): 하루 요청 한도
+        first_day_budget (int): 오늘 남은 요청 수 (기본값: None, daily_budget과 동일)
+
+    Returns:
+        int: 필요한 일수 (오늘 포함)
+    """
+    if total_requests <= 0:
+        return 0
+    if first_day_budget is None:
+        first_day_budget = daily_budget
+    first_day_budget = max(first_day_budget, 0)
+
+    if total_requests <= first_day_budget:
+        return 1
+    return 1 + math.ceil((total_requests - first_day_budget) / daily_budget)
+
+
+def print_schedule_summary(schedule, daily_budget, first_day_budget=None):
+    """
+    요청 일정 요약 출력
+
+    Args:
+        schedule (list): build_request_schedule이 반환한 일정
+        daily_budget (int): 하루 요청 한도
+        first_day_budget (int): 오늘 남은 요청 수 (기본값: None, daily_budget과 동일)
+    """
+    total = sum(len(day) for day in schedule)
+    days = estimate_backfill_days(total, daily_budget, first_day_budget)
+
+    print("\n" + "="*50)
+    print("요청 일정 요약")
+    print("-"*50)
+    print(f"- 전체 요청 수: {total}")
+    print(f"- 일일 요청 한도: {daily_budget}")
+    print(f"- 예상 소요 일수: {days}일")
+
+    for day, requests in enumerate(schedule[:7]):
+        if not requests:
+            print(f"  {day+1}일차: 요청 없음 (오늘 한도 소진)")
+            continue
+        months = [month for _, month in requests]
+        complexes = len({kapt_code for kapt_code, _ in requests})
+        print(f"  {day+1}일차: {len(requests)}건, {complexes}개 단지, "
+              f"{min(months)}~{max(months)}")
+    if len(schedule) > 7:
+        print(f"  ... 외 {len(schedule) - 7}일")
+    print("="*50 + "\n")
@@ -0,0 +1,174 @@
+import time
+from datetime import datetime, timedelta
+
+# 실패 분류
+TRANSIENT = 'transient'    # 연결 실패, 5xx, 서버 일시 오류 응답 코드 - 짧은 간격으로 재시도
+EMPTY = 'empty'            # 데이터 없음 응답 (resultCode 03) - 데이터가 나중에 올라올 수 있어 긴 간격으로 재시도
+QUOTA = 'quota'            # 일일 요청 한도 초과 - 다음 날 재시도
+MALFORMED = 'malformed'    # 잘못된 요청 또는 응답 형식 오류 - 몇 번만 재시도
+
+# 분류별 재시도 정책: (첫 재시도 대기 초, 최대 대기 초, 최대 시도 횟수)
+# 대기 시간은 시도할 때마다 두 배로 늘고, 최대 시도 횟수를 넘으면 더 이상 재시도하지 않음
+RETRY_POLICIES = {
+    TRANSIENT: (10 * 60, 24 * 3600, 8),
+    EMPTY: (24 * 3600, 30 * 24 * 3600, 6),
+    QUOTA: (0, 0, 30),
+    MALFORMED: (24 * 3600, 7 * 24 * 3600, 3),
+}
+
+# 공공데이터포털 응답 코드별 분류 (나머지 오류 코드는 잘못된 요청으로 분류)
+RESULT_CODE_CATEGORIES = {
+    '01': TRANSIENT,  # APPLICATION_ERROR
+    '02': TRANSIENT,  # DB_ERROR
+    '03': EMPTY,      # NODATA_ERROR
+    '04': TRANSIENT,  # HTTP_ERROR
+    '05': TRANSIENT,  # SERVICETIME_OUT
+    '22': QUOTA,      # LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR
+    '99': TRANSIENT,  # UNKNOWN_ERROR
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS retry_queue (
+    kaptCode TEXT NOT NULL,
+    month TEXT NOT NULL,
+    category TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    next_attempt_at REAL,
+    last_error TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (kaptCode, month)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_retry_queue_due ON retry_queue (next_attempt_at);
+"""
+
+
+def ensure_retry_queue(conn):
+    """
+    재시도 대기열 테이블 생성
+
+    Args:
+        conn: 매니페스트 연결
+    """
+    conn.executescript(SCHEMA)
+
+
+def classify_result_code(result_code):
+    """
+    정상이 아닌 API 응답 코드를 실패 분류로 변환
+    """
+    return RESULT_CODE_CATEGORIES.get(str(result_code), MALFORMED)
+
+
+def next_attempt_time(category, attempts, now=None):
+    """
+    실패 분류와 시도 횟수로 다음 재시도 시각 계산
+
+    Args:
+        category (str): 실패 분류
+        attempts (int): 지금까지 실패한 횟수 (1부터)
+        now (float): 기준 시각 (기본값: 현재, time.time())
+
+    Returns:
+        float: 다음 재시도 시각 (더 이상 재시도하지 않으면 None)
+    """
+    now = time.time() if now is None else now
+    base, cap, max_attempts = RETRY_POLICIES[category]
+    if attempts >= max_attempts:
+        return None
+
+    # 한도 초과는 요청 수가 초기화되는 다음 날 0시
+    if category == QUOTA:
+        tomorrow = datetime.fromtimestamp(now).date() + timedelta(days=1)
+        return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+
+    return now + min(base * 2 ** (attempts - 1), cap)
+
+
+def enqueue_failure(conn, kapt_code, month, category, error=None, now=None):
+    """
+    실패한 (단지, 월) 요청을 재시도 대기열에 기록 (이미 있으면 시도 횟수를 늘리고 다시 예약)
+
+    Args:
+        conn: 매니페스트 연결
+        kapt_code (str): 단지 코드
+        month (str): 요청 월 (YYYYMM)
+        category (str): 실패 분류 (TRANSIENT, EMPTY, QUOTA, MALFORMED)
+        error (str): 오류 내용
+        now (float): 기준 시각 (기본값: 현재)
+
+    Returns:
+        float: 다음 재시도 시각 (최대 시도 횟수를 넘었으면 None)
+    """
+    now = time.time() if now is None else now
+    with conn:
+        row = conn.execute("SELECT attempts FROM retry_queue WHERE kaptCode = ? AND month = ?",
+                           (kapt_code, str(month))).fetchone()
+        attempts = (row[0] if row else 0) + 1
+        next_attempt_at = next_attempt_time(category, attempts, now)
+        conn.execute(
+            "INSERT OR REPLACE INTO retry_queue "
+            "(kaptCode, month, category, attempts, next_attempt_at, last_error, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (kapt_code, str(month), category, attempts, next_attempt_at, error,
+             datetime.fromtimestamp(now).isoformat(timespec='seconds')))
+    return next_attempt_at
+
+
+def resolve_retries(conn, kapt_code, months):
+    """
+    수집에 성공한 월을 재시도 대기열에서 삭제
+
+    Args:
+        conn: 매니페스트 연결
+        kapt_code (str): 단지 코드
+        months (list): 수집한 월 목록
+    """
+    with conn:
+        conn.executemany("DELETE FROM retry_queue WHERE kaptCode = ? AND month = ?",
+                         [(kapt_code, str(month)) for month in months])
+
+
+def get_due_retries(conn, now=None, limit=None):
+    """
+    재시도 시각이 된 요청 조회 (재시도 시각 순서)
+
+    Args:
+        conn: 매니페스트 연결
+        now (float): 기준 시각 (기본값: 현재)
+        limit (int): 최대 요청 수 (기본값: None, 전체)
+
+    Returns:
+        list: (단지 코드, 월) 목록
+    """
+    now = time.time() if now is None else now
+    query = ("SELECT kaptCode, month FROM retry_queue "
+             "WHERE next_attempt_at IS NOT NULL AND next_attempt_at <= ? "
+             "ORDER BY next_attempt_at, kaptCode, month")
+    params = (now,)
+    if limit is not None:
+        query += " LIMIT ?"
+        params += (limit,)
+    return [(kapt_code, month) for kapt_code, month in conn.execute(query, params)]
+
+
+def print_retry_summary(conn, now=None):
+    """
+    재시도 대기열 현황 출력 (분류별 대기, 재시도 가능, 재시도 중단 요청 수)
+    """
+    now = time.time() if now is None else now
+    rows = conn.execute("""
+        SELECT category,
+               COUNT(*),
+               SUM(next_attempt_at IS NOT NULL AND next_attempt_at <= ?),
+               SUM(next_attempt_at IS NULL)
+        FROM retry_queue
+        GROUP BY category
+        ORDER BY category
+    """, (now,)).fetchall()
+    if not rows:
+        return
+
+    print("재시도 대기열:")
+    for category, total, due, exhausted in rows:
+        print(f"  - {category}: {total}건 (재시도 가능 {due}건, 재시도 중단 {exhausted}건)")
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+ENERGY_COLUMNS = [
+    'heat', 'hheat', 'waterHot', 'hwaterHot', 'gas',
+    'hgas', 'elect', 'helect', 'waterCool', 'hwaterCool'
+]
+
+# 월 라벨 ("01"~"12"), 분석 결과 파일의 month 표기와 같음
+MONTH_LABELS = [f"{month:02d}" for month in range(1, 13)]
+
+MONTH_DTYPE = pd.CategoricalDtype(MONTH_LABELS, ordered=True)
+ENERGY_TYPE_DTYPE = pd.CategoricalDtype(ENERGY_COLUMNS)
+
+# 단지별 에너지 데이터 CSV
+# 사용량은 2^24를 넘는 값이 있어 float32로 읽으면 추세 분석 결과가 달라지므로 float64 유지
+ENERGY_DATA_DTYPES = {
+    'requestMonth': 'int32',
+    'kaptCode': 'category',
+    **{column: 'float64' for column in ENERGY_COLUMNS},
+}
+
+# 분석 결과의 키와 문자열 컬럼 (값이 바뀌지 않는 변환, 단지 코드와 단지명은 두 가지 컬럼 이름 모두 지원)
+ANALYSIS_KEY_DTYPES = {
+    'kaptCode': 'category',
+    'kaptName': 'category',
+    'kapt_code': 'category',
+    'complex_name': 'category',
+    'month': 'int8',
+    'energy_type': ENERGY_TYPE_DTYPE,
+    'energy_name': 'category',
+    'trend': 'category',
+    'data_points': 'int16',
+}
+
+# 시각화와 회귀 분석용 병합 데이터 (지표는 float32)
+ANALYSIS_RESULT_DTYPES = {
+    **ANALYSIS_KEY_DTYPES,
+    'correlation': 'float32',
+    'slope': 'float32',
+    'initial_value': 'float32',
+    'annual_growth_rate': 'float32',
+}
+
+
+def apply_dtypes(df, dtypes):
+    """
+    DataFrame에 있는 컬럼만 지정한 타입으로 변환
+
+    Args:
+        df (pandas.DataFrame): 원본 DataFrame
+        dtypes (dict): {컬럼명: 타입}
+
+    Returns:
+        pandas.DataFrame: 타입이 변환된 DataFrame
+    """
+    return df.astype({column: dtype for column, dtype in dtypes.items() if column in df.columns})
+
+
+def month_ordinal(request_month):
+    """
+    요청 월(YYYYMM)을 연속된 정수 월 번호(연도 * 12 + 월 - 1)로 변환
+
+    월 번호의 차이가 곧 개월 수이므로 문자열 비교나 날짜 변환 없이 정렬과 구간 계산을 할 수 있습니다.
+
+    Args:
+        request_month (pandas.Series): 숫자 또는 문자열 요청 월
+
+    Returns:
+        numpy.ndarray: int32 월 번호 배열
+    """
+    if pd.api.types.is_numeric_dtype(request_month):
+        values = request_month.to_numpy(dtype=np.int64)
+    else:
+        values = request_month.astype(str).str[:6].to_numpy(dtype=np.int64)
+    return (values // 100 * 12 + values % 100 - 1).astype(np.int32)
+
+
+def ordinal_month(ordinals):
+    """
+    월 번호를 요청 월(YYYYMM) 정수로 변환 (month_ordinal의 역변환)
+
+    Args:
+        ordinals (numpy.ndarray): 월 번호 배열
+
+    Returns:
+        numpy.ndarray: YYYYMM 정수 배열
+    """
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    return (ordinals // 12 * 100 + ordinals % 12 + 1).astype(np.int32)
+
+
+def memory_mb(df):
+    """
+    DataFrame이 차지하는 메모리 (MB)
+    """
+    return df.memory_usage(deep=True).sum() / 1024 / 1024
+
+
+# 단지 기본정보 (KAPT 단지 목록) 컬럼 타입
+MASTER_DTYPES = {
+    '시도': 'category',
+    '시군구': 'category',
+    '단지코드': 'str',
+    '단지명': 'str',
+    '단지분류': 'category',
+    '분양형태': 'category',
+    '세대수': 'Int32',
+    '동수': 'Int16',
+    '관리방식': 'category',
+    '난방방식': 'category',
+    '복도유형': 'category',
+    '건물구조': 'category',
+    '급수방식': 'category',
+}
+
+# 단지 기본정보의 날짜 컬럼 (YYYYMMDD, 원본에서 결측값 때문에 실수로 저장된 경우 포함)
+MASTER_DATE_COLUMNS = ['사용승인일']
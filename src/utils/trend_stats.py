@@ -0,0 +1,262 @@
+import os
+
+import pandas as pd
+
+from utils.schema import ENERGY_COLUMNS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trend_stats (
+    kaptCode TEXT NOT NULL,
+    month TEXT NOT NULL,
+    energy_type TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    mean_x REAL NOT NULL,
+    mean_y REAL NOT NULL,
+    m2_x REAL NOT NULL,
+    m2_y REAL NOT NULL,
+    c_xy REAL NOT NULL,
+    min_x INTEGER NOT NULL,
+    PRIMARY KEY (kaptCode, month, energy_type)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS trend_months (
+    kaptCode TEXT NOT NULL,
+    requestMonth TEXT NOT NULL,
+    PRIMARY KEY (kaptCode, requestMonth)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS trend_files (
+    filename TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+"""
+
+
+def ensure_trend_stats(conn):
+    """
+    추세 통계 테이블 생성
+
+    Args:
+        conn: 매니페스트 연결
+    """
+    conn.executescript(SCHEMA)
+
+
+def welford_update(state, x, y):
+    """
+    (연도, 사용량) 한 쌍을 누적 통계에 반영 (Welford 방식)
+
+    Args:
+        state (list): [n, mean_x, mean_y, m2_x, m2_y, c_xy, min_x]
+        x (int): 연도
+        y (float): 사용량
+    """
+    n = state[0] + 1
+    dx = x - state[1]
+    mean_x = state[1] + dx / n
+    dy = y - state[2]
+    mean_y = state[2] + dy / n
+
+    state[0] = n
+    state[1] = mean_x
+    state[2] = mean_y
+    state[3] += dx * (x - mean_x)
+    state[4] += dy * (y - mean_y)
+    state[5] += dx * (y - mean_y)
+    state[6] = x if n == 1 else min(state[6], x)
+
+
+def update_trend_stats(conn, kapt_code, items):
+    """
+    새로 수집된 월 데이터를 (단지, 월, 에너지 유형)별 누적 통계에 반영
+
+    이미 반영된 요청 월은 건너뛰므로 같은 데이터를 여러 번 넣어도 결과가 같습니다.
+    분석과 같이 결측값과 0은 제외합니다. 갱신 비용은 새 행 수에 비례합니다.
+
+    Args:
+        conn: 매니페스트 연결
+        kapt_code (str): 단지 코드
+        items (list): requestMonth와 에너지 컬럼을 가진 월 데이터 목록
+
+    Returns:
+        int: 새로 반영한 월 수
+    """
+    with conn:
+        new_items = []
+        for item in items:
+            req_month = str(item['requestMonth'])[:6]
+            cursor = conn.execute("INSERT OR IGNORE INTO trend_months (kaptCode, requestMonth) VALUES (?, ?)",
+                                  (kapt_code, req_month))
+            if cursor.rowcount:
+                new_items.append((req_month, item))
+
+        if not new_items:
+            return 0
+
+        states = {(month, energy_type): list(values) for month, energy_type, *values in conn.execute(
+            "SELECT month, energy_type, n, mean_x, mean_y, m2_x, m2_y, c_xy, min_x "
+            "FROM trend_stats WHERE kaptCode = ?", (kapt_code,))}
+
+        changed = set()
+        for req_month, item in new_items:
+            year, month = int(req_month[:4]), req_month[4:6]
+            for column in ENERGY_COLUMNS:
+                value = pd.to_numeric(item.get(column), errors='coerce')
+                if pd.isna(value) or value == 0:
+                    continue
+                key = (month, column)
+                state = states.setdefault(key, [0, 0.0, 0.0, 0.0, 0.0, 0.0, year])
+                welford_update(state, year, float(value))
+                changed.add(key)
+
+        conn.executemany(
+            "INSERT OR REPLACE INTO trend_stats "
+            "(kaptCode, month, energy_type, n, mean_x, mean_y, m2_x, m2_y, c_xy, min_x) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(kapt_code, month, column, *states[(month, column)]) for month, column in changed])
+
+    return len(new_items)
+
+
+def rebuild_trend_stats(conn, kapt_code, items):
+    """
+    단지의 누적 통계를 지우고 월 데이터로 다시 계산
+
+    Args:
+        conn: 매니페스트 연결
+        kapt_code (str): 단지 코드
+        items (list): requestMonth와 에너지 컬럼을 가진 월 데이터 목록
+
+    Returns:
+        int: 반영한 월 수
+    """
+    with conn:
+        conn.execute("DELETE FROM trend_stats WHERE kaptCode = ?", (kapt_code,))
+        conn.execute("DELETE FROM trend_months WHERE kaptCode = ?", (kapt_code,))
+        return update_trend_stats(conn, kapt_code, items)
+
+
+def is_trend_synced(conn, filename, source_folder='energy'):
+    """
+    누적 통계가 에너지 데이터 파일의 현재 내용을 반영하고 있는지 확인
+
+    파일이 아직 없으면 반영된 기록도 없는 경우에만 최신으로 봅니다.
+
+    Args:
+        conn: 매니페스트 연결
+        filename (str): 에너지 데이터 파일명
+        source_folder (str): 에너지 데이터 폴더 이름 (기본값: 'energy')
+
+    Returns:
+        bool: 최신 여부
+    """
+    row = conn.execute("SELECT mtime, size FROM trend_files WHERE filename = ?", (filename,)).fetchone()
+    path = os.path.join(os.getcwd(), 'data', source_folder, filename)
+    if not os.path.exists(path):
+        return row is None
+    stat = os.stat(path)
+    return row == (stat.st_mtime, stat.st_size)
+
+
+def mark_trend_synced(conn, filename, source_folder='energy'):
+    """
+    에너지 데이터 파일의 현재 내용이 누적 통계에 반영되었음을 기록
+
+    Args:
+        conn: 매니페스트 연결
+        filename (str): 에너지 데이터 파일명
+        source_folder (str): 에너지 데이터 폴더 이름 (기본값: 'energy')
+    """
+    stat = os.stat(os.path.join(os.getcwd(), 'data', source_folder, filename))
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO trend_files (filename, mtime, size) VALUES (?, ?, ?)",
+                     (filename, stat.st_mtime, stat.st_size))
+
+
+def get_complete_files(conn, csv_files, source_folder='energy'):
+    """
+    누적 통계가 파일 내용을 모두 반영한 에너지 데이터 파일 조회
+
+    누적 통계에 기록된 파일 지문이 현재 파일과 같은 경우에만 파일을 읽지 않고
+    통계로 분석할 수 있습니다.
+
+    Args:
+        conn: 매니페스트 연결
+        csv_files (list): 에너지 데이터 파일명 목록
+        source_folder (str): 에너지 데이터 폴더 이름 (기본값: 'energy')
+
+    Returns:
+        set: 파일명 집합
+    """
+    synced = {filename: (mtime, size) for filename, mtime, size in
+              conn.execute("SELECT filename, mtime, size FROM trend_files")}
+    directory = os.path.join(os.getcwd(), 'data', source_folder)
+
+    complete = set()
+    for filename in csv_files:
+        if filename not in synced:
+            continue
+        stat = os.stat(os.path.join(directory, filename))
+        if synced[filename] == (stat.st_mtime, stat.st_size):
+            complete.add(filename)
+
+    return complete
+
+
+def sync_trend_stats(conn, file_index, source_folder='energy'):
+    """
+    누적 통계가 반영한 뒤 새로 생기거나 변경된 에너지 데이터 파일을 읽어 통계를 다시 계산
+
+    처음 실행할 때 한 번 기존 CSV를 모두 읽고, 이후에는 수집기가 저장할 때 갱신하므로
+    복구, 재구성(rebuild_energy_from_cache.py), 수동 수정 등으로 파일 지문이 바뀐 단지만
+    다시 읽습니다. 바뀐 단지는 기존 통계를 지우고 파일 전체로 다시 계산합니다.
+
+    Args:
+        conn: 매니페스트 연결
+        file_index (dict): {단지 코드: 파일명}
+        source_folder (str): 에너지 데이터 폴더 이름 (기본값: 'energy')
+
+    Returns:
+        int: 다시 반영한 월 수
+    """
+    synced = {filename: (mtime, size) for filename, mtime, size in
+              conn.execute("SELECT filename, mtime, size FROM trend_files")}
+    directory = os.path.join(os.getcwd(), 'data', source_folder)
+
+    count = 0
+    for kapt_code, filename in file_index.items():
+        path = os.path.join(directory, filename)
+        stat = os.stat(path)
+        if synced.get(filename) == (stat.st_mtime, stat.st_size):
+            continue
+        try:
+            df = pd.read_csv(path, encoding='utf-8-sig')
+        except Exception as e:
+            print(f"[{filename}] 추세 통계 반영 실패: {e}")
+            continue
+        count += rebuild_trend_stats(conn, kapt_code, df.to_dict('records'))
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO trend_files (filename, mtime, size) VALUES (?, ?, ?)",
+                         (filename, stat.st_mtime, stat.st_size))
+
+    return count
+
+
+def load_trend_stats(conn, kapt_codes=None):
+    """
+    (단지, 월, 에너지 유형)별 누적 통계 조회
+
+    Args:
+        conn: 매니페스트 연결
+        kapt_codes (list): 조회할 단지 코드 목록 (기본값: None, 전체 단지)
+
+    Returns:
+        pandas.DataFrame: kaptCode, month, energy_type, n, mean_x, mean_y, sxx, syy, sxy, x0
+    """
+    query = ("SELECT kaptCode, month, energy_type, n, mean_x, mean_y, "
+             "m2_x AS sxx, m2_y AS syy, c_xy AS sxy, min_x AS x0 FROM trend_stats")
+    df = pd.read_sql_query(query, conn)
+    if kapt_codes is not None:
+        df = df[df['kaptCode'].isin(set(kapt_codes))]
+    return df.reset_index(drop=True)
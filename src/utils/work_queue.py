@@ -0,0 +1,144 @@
+import os
+import socket
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS work_leases (
+    kaptCode TEXT PRIMARY KEY,
+    worker_id TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+def default_worker_id():
+    """
+    기본 작업자 식별자 생성
+
+    Returns:
+        str: "{호스트명}-{프로세스 ID}" 형식의 식별자
+    """
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def ensure_work_queue(conn):
+    """
+    작업 임대(lease) 테이블 생성
+
+    Args:
+        conn: 매니페스트 연결
+    """
+    conn.executescript(SCHEMA)
+
+
+def claim_complexes(conn, worker_id, candidates, limit, lease_seconds):
+    """
+    다른 작업자가 임대하지 않은 단지를 우선순위 순서대로 임대
+
+    임대가 없거나 만료된 단지, 또는 이미 자신이 임대한 단지만 가져옵니다.
+    여러 프로세스가 동시에 호출해도 같은 단지를 두 작업자가 임대하지 않도록
+    쓰기 트랜잭션 안에서 조회와 임대를 함께 처리합니다.
+
+    Args:
+        conn: 매니페스트 연결
+        worker_id (str): 작업자 식별자
+        candidates (list): 우선순위 순서의 단지 코드 목록
+        limit (int): 한 번에 임대할 최대 단지 수
+        lease_seconds (float): 임대 유지 시간(초)
+
+    Returns:
+        list: 임대한 단지 코드 목록
+    """
+    now = time.time()
+    claimed = []
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        leased = {kapt_code for kapt_code, in conn.execute(
+            "SELECT kaptCode FROM work_leases WHERE worker_id != ? AND expires_at > ?",
+            (worker_id, now))}
+
+        for kapt_code in candidates:
+            if kapt_code in leased:
+                continue
+            claimed.append(kapt_code)
+            if len(claimed) >= limit:
+                break
+
+        conn.executemany(
+            "INSERT OR REPLACE INTO work_leases (kaptCode, worker_id, expires_at) VALUES (?, ?, ?)",
+            [(kapt_code, worker_id, now + lease_seconds) for kapt_code in claimed])
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    return claimed
+
+
+def renew_leases(conn, worker_id, kapt_codes, lease_seconds):
+    """
+    작업 중인 단지의 임대 기간 연장
+
+    Args:
+        conn: 매니페스트 연결
+        worker_id (str): 작업자 식별자
+        kapt_codes (list): 연장할 단지 코드 목록
+        lease_seconds (float): 연장할 임대 유지 시간(초)
+    """
+    expires_at = time.time() + lease_seconds
+    with conn:
+        conn.executemany(
+            "UPDATE work_leases SET expires_at = ? WHERE kaptCode = ? AND worker_id = ?",
+            [(expires_at, kapt_code, worker_id) for kapt_code in kapt_codes])
+
+
+def release_leases(conn, worker_id, kapt_codes=None):
+    """
+    단지 임대 해제
+
+    Args:
+        conn: 매니페스트 연결
+        worker_id (str): 작업자 식별자
+        kapt_codes (list): 해제할 단지 코드 목록 (기본값: None, 작업자의 모든 임대)
+    """
+    with conn:
+        if kapt_codes is None:
+            conn.execute("DELETE FROM work_leases WHERE worker_id = ?", (worker_id,))
+        else:
+            conn.executemany("DELETE FROM work_leases WHERE kaptCode = ? AND worker_id = ?",
+                             [(kapt_code, worker_id) for kapt_code in kapt_codes])
+
+
+def get_leased_complexes(conn, worker_id):
+    """
+    다른 작업자가 현재 임대 중인 단지 조회
+
+    Args:
+        conn: 매니페스트 연결
+        worker_id (str): 자신의 작업자 식별자
+
+    Returns:
+        set: 다른 작업자가 임대 중인 단지 코드
+    """
+    return {kapt_code for kapt_code, in conn.execute(
+        "SELECT kaptCode FROM work_leases WHERE worker_id != ? AND expires_at > ?",
+        (worker_id, time.time()))}
+
+
+def get_own_leases(conn, worker_id, kapt_codes):
+    """
+    작업자가 지금 임대하고 있는(만료되지 않은) 단지 조회
+
+    Args:
+        conn: 매니페스트 연결
+        worker_id (str): 작업자 식별자
+        kapt_codes (list): 확인할 단지 코드 목록
+
+    Returns:
+        set: 임대 중인 단지 코드
+    """
+    now = time.time()
+    return {kapt_code for kapt_code in kapt_codes if conn.execute(
+        "SELECT 1 FROM work_leases WHERE kaptCode = ? AND worker_id = ? AND expires_at > ?",
+        (kapt_code, worker_id, now)).fetchone()}